@@ -1,34 +1,66 @@
-# Synchro_site.py version 0.4
+# Synchro_site.py version 0.11
 """
 Synchronisation automatisée d'un site GitHub Pages collaboratif.
 
 Fonctionnalités :
 - Mode --dry-run (simulation sans modification)
-- Sauvegarde ZIP avant nettoyage
-- Copie d'une base commune
-- Copie d'ajouts spécifiques au collaborateur
+- Sauvegarde dédupliquée avant synchronisation (magasin adressé par
+  contenu : un instantané = un petit manifeste, fichiers inchangés gratuits)
+- Restauration (--restore) et purge par ancienneté (--prune-days)
+- Synchronisation incrémentale (manifeste d'empreintes persistant) :
+  seuls les fichiers ajoutés/modifiés sont copiés, seuls les fichiers
+  retirés sont supprimés, seuls ces chemins sont indexés par git
+- Base commune + ajouts spécifiques au collaborateur (superposés)
+- Plusieurs collaborateurs (sections [cible:NOM]) : la base est analysée
+  une seule fois, les cibles sont synchronisées en parallèle
 - Commit & push vers GitHub
+- Mode --plumbing : commit construit directement depuis les chemins
+  réellement modifiés (update-index/write-tree/commit-tree), taille du
+  commit annoncée et contrôlée avant le push
 """
 
 import argparse
 import configparser
+import hashlib
+import json
 import logging
+import os
 import shutil
 import subprocess
 import sys
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from zipfile import ZipFile
+import time
+import zlib
+
+from lib1.config import CONFIG as CONFIG_SITE
 
 # ============================================================
 # VERSION & CONFIG
 # ============================================================
 
-SCRIPT_VERSION = "0.4"
+SCRIPT_VERSION = "0.11"
 CONFIG_FILE_NAME = "config_Synchro_site.ini"
 CONFIG_VERSION = "01"
 
+# Manifeste rangé dans .git du dépôt ami : jamais copié ni commité
+MANIFEST_NAME = "synchro_manifest.json"
+MANIFEST_VERSION = 1
+HASH_BLOCK = 1024 * 1024
+# Jamais synchronisés : dépôt git, préparation, sauvegarde et cache de genere_site
+EXCLUDED_DIRS = {".git", "html.staging", "html.precedent", "html.transit", "html.cache"}
+# État local de genere_site (empreinte de la dernière construction)
+EXCLUDED_FILES = {"html.empreinte"}
+
+# Sauvegardes : morceaux de taille fixe, stockés sous leur sha256
+CHUNK_SIZE = 4 * 1024 * 1024
+# Formats déjà compressés : stockés tels quels (pas de zlib)
+NO_COMPRESS = {".pdf", ".png", ".jpg", ".jpeg", ".gif", ".zip", ".docx", ".gz", ".br"}
+
 # ============================================================
 # OUTILS
 # ============================================================
@@ -42,45 +74,729 @@ def run_cmd(command: str, cwd: Path | None = None, dry_run: bool = False) -> Non
     subprocess.run(command, cwd=cwd, shell=True, check=True)
 
 
-def create_backup(project_path: Path, backup_dir: Path) -> None:
-    """Crée une archive ZIP du projet ami (hors .git)."""
-    backup_dir.mkdir(exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    zip_path = backup_dir / f"backup_ami_{timestamp}.zip"
-
-    with ZipFile(zip_path, "w") as zipf:
-        for item in project_path.rglob("*"):
-            if ".git" in item.parts:
-                continue
-            zipf.write(item, item.relative_to(project_path))
-
-
-def analyse_content(src: Path) -> tuple[set[str], Counter]:
-    """Analyse dossiers racines et types de fichiers."""
+def summarize(entries: dict[str, dict]) -> tuple[set[str], Counter]:
+    """Résume un inventaire : dossiers racines et types de fichiers."""
     folders = set()
     extensions = Counter()
 
-    for item in src.rglob("*"):
-        if item.is_dir():
-            folders.add(item.parts[0])
-        else:
-            extensions[item.suffix or "sans_extension"] += 1
+    for rel in entries:
+        head, sep, _ = rel.partition("/")
+        if sep:
+            folders.add(head)
+        extensions[Path(rel).suffix or "sans_extension"] += 1
 
     return folders, extensions
 
 
-def copy_content(src: Path, dst: Path, dry_run: bool) -> None:
-    """Copie le contenu d'un dossier vers un autre (hors .git)."""
-    for item in src.iterdir():
-        if item.name == ".git":
+# ============================================================
+# SYNCHRONISATION INCRÉMENTALE
+# ============================================================
+
+
+def hash_file(path: Path) -> str:
+    """Empreinte du contenu, identique à l'identifiant de blob git."""
+    digest = hashlib.sha1(b"blob %d\0" % path.stat().st_size)
+    with open(path, "rb") as f:
+        while bloc := f.read(HASH_BLOCK):
+            digest.update(bloc)
+    return digest.hexdigest()
+
+
+def scan_stats(root: Path) -> dict[str, dict]:
+    """Inventorie un arbre (hors EXCLUDED_DIRS) sans lire les fichiers : {chemin: {size, mtime_ns}}."""
+    entries: dict[str, dict] = {}
+    if not root.exists():
+        return entries
+
+    pending = [(root, "")]
+    while pending:
+        folder, prefix = pending.pop()
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name == ".git" or entry.name in EXCLUDED_FILES:
+                    continue
+                rel = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIRS:
+                        pending.append((Path(entry.path), rel + "/"))
+                    continue
+                st = entry.stat()
+                entries[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return entries
+
+
+def scan_tree(root: Path, previous: dict[str, dict] | None = None) -> dict[str, dict]:
+    """Inventorie un arbre (hors .git) : {chemin posix: {size, mtime_ns, hash}}.
+
+    Le hash d'une entrée du manifeste précédent est réutilisé tant que
+    taille et mtime sont inchangés : seuls les fichiers touchés sont relus.
+    """
+    previous = previous or {}
+    entries = scan_stats(root)
+    for rel, info in entries.items():
+        old = previous.get(rel)
+        if old and old["size"] == info["size"] and old["mtime_ns"] == info["mtime_ns"]:
+            info["hash"] = old["hash"]
+        else:
+            info["hash"] = hash_file(root / rel)
+    return entries
+
+
+def load_manifest(repo: Path) -> dict:
+    """Charge le manifeste persistant du dépôt ami (vide si absent ou invalide)."""
+    path = repo / ".git" / MANIFEST_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "trees": {}}
+    if data.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "trees": {}}
+    return data
+
+
+def save_manifest(repo: Path, manifest: dict) -> None:
+    """Écrit le manifeste de façon atomique."""
+    path = repo / ".git" / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def merge_sources(layers: list[tuple[Path, dict[str, dict]]]) -> dict[str, dict]:
+    """Superpose les inventaires (le dernier l'emporte) en notant la source."""
+    merged: dict[str, dict] = {}
+    for root, entries in layers:
+        for rel, info in entries.items():
+            merged[rel] = {**info, "src": root}
+    return merged
+
+
+def diff_trees(source: dict[str, dict], dest: dict[str, dict]) -> tuple[list[str], list[str], list[str]]:
+    """Compare source et destination : (ajoutés, modifiés, supprimés)."""
+    added = sorted(rel for rel in source if rel not in dest)
+    changed = sorted(
+        rel for rel in source
+        if rel in dest and source[rel]["hash"] != dest[rel]["hash"]
+    )
+    removed = sorted(rel for rel in dest if rel not in source)
+    return added, changed, removed
+
+
+def _copy_one(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def apply_diff(
+    source: dict[str, dict],
+    dest_root: Path,
+    to_copy: list[str],
+    to_remove: list[str],
+    workers: int,
+) -> None:
+    """Copie (en parallèle) les fichiers ajoutés/modifiés, supprime les retirés."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_copy_one, source[rel]["src"] / rel, dest_root / rel)
+            for rel in to_copy
+        ]
+        for future in futures:
+            future.result()
+
+    remove_paths(dest_root, to_remove)
+
+
+def remove_paths(root: Path, paths: list[str]) -> None:
+    """Supprime des fichiers de root puis les dossiers devenus vides."""
+    parents = set()
+    for rel in paths:
+        target = root / rel
+        target.unlink(missing_ok=True)
+        parents.update(target.parents)
+
+    # Dossiers devenus vides (du plus profond au moins profond)
+    for folder in sorted(parents, key=lambda p: len(p.parts), reverse=True):
+        if folder == root or root not in folder.parents:
             continue
-        dest = dst / item.name
+        try:
+            folder.rmdir()
+        except OSError:
+            pass
+
+
+def not_ignored(repo: Path, paths: list[str]) -> list[str]:
+    """Retire les chemins non suivis que .gitignore exclut (git add les refuserait)."""
+    if not paths:
+        return []
+    result = subprocess.run(
+        ["git", "check-ignore", "-z", "--stdin"],
+        cwd=repo,
+        input="\0".join(paths).encode("utf-8"),
+        capture_output=True,
+    )
+    # Code 1 : aucun chemin ignoré ; au-delà : vraie erreur
+    if result.returncode > 1:
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+    ignored = set(result.stdout.decode("utf-8").split("\0"))
+    return [rel for rel in paths if rel not in ignored]
+
+
+def _git_pathspec(repo: Path, args: list[str], paths: list[str]) -> None:
+    if not paths:
+        return
+    # Noms de fichiers pris littéralement (pas de *, ?, [ interprétés)
+    subprocess.run(
+        ["git", "--literal-pathspecs", *args, "--pathspec-from-file=-", "--pathspec-file-nul"],
+        cwd=repo,
+        input="\0".join(paths).encode("utf-8"),
+        check=True,
+    )
+
+
+def stage_paths(repo: Path, copied: list[str], removed: list[str], dry_run: bool) -> None:
+    """Indexe exactement les chemins copiés (hors ignorés) et retire de l'index les supprimés."""
+    if dry_run:
+        logging.info(
+            "[DRY-RUN] git add (%d chemins), git rm (%d chemins)",
+            len(copied), len(removed),
+        )
+        return
+    _git_pathspec(repo, ["add"], not_ignored(repo, copied))
+    _git_pathspec(repo, ["rm", "--cached", "--quiet", "--ignore-unmatch"], removed)
+
+
+def scan_base(root: Path, dry_run: bool) -> dict[str, dict]:
+    """Inventorie la base commune une seule fois pour toutes les cibles.
+
+    Le cache d'empreintes est rangé dans le .git de la base s'il existe.
+    """
+    cache_repo = root if (root / ".git").is_dir() else None
+    manifest = load_manifest(cache_repo) if cache_repo else {"trees": {}}
+    entries = scan_tree(root, manifest["trees"].get(str(root)))
+    if cache_repo and not dry_run:
+        manifest["trees"] = {str(root): entries}
+        save_manifest(cache_repo, manifest)
+    return entries
+
+
+def synchronize(
+    base: tuple[Path, dict[str, dict]],
+    overlays: list[Path],
+    dest_root: Path,
+    workers: int,
+    dry_run: bool,
+    log: logging.LoggerAdapter,
+) -> tuple[list[str], list[str], list[str], dict]:
+    """Synchronise dest_root sur la base (déjà inventoriée) + ses ajouts.
+
+    Les ajouts sont superposés virtuellement à la base : rien n'est copié
+    deux fois, seul le résultat de la superposition est comparé à dest_root.
+
+    Le manifeste n'est pas enregistré ici : l'appelant l'enregistre une
+    fois le commit poussé. Son arbre destination décrit donc le dernier
+    état publié ; les fichiers copiés ou supprimés depuis (commit ou push
+    d'un run précédent en échec) sont repris dans les modifiés/supprimés.
+
+    Returns:
+        (chemins ajoutés, chemins modifiés, chemins supprimés), triés,
+        et manifeste à enregistrer (save_manifest) après le push.
+    """
+    manifest = load_manifest(dest_root)
+    trees = manifest.get("trees", {})
+
+    scanned = [base]
+    for root in overlays:
+        key = str(root)
+        trees[key] = scan_tree(root, trees.get(key))
+        scanned.append((root, trees[key]))
+    source = merge_sources(scanned)
+
+    dest_key = str(dest_root)
+    published = trees.get(dest_key, {})
+    dest = scan_tree(dest_root, published)
+
+    added, changed, removed = diff_trees(source, dest)
+    log.info(
+        "Différences : %d ajouté(s), %d modifié(s), %d supprimé(s)",
+        len(added), len(changed), len(removed),
+    )
+
+    # Déjà copiés/supprimés mais jamais publiés (le manifeste n'a pas suivi)
+    pending_copied = sorted(
+        rel for rel, info in dest.items()
+        if rel in source and rel not in changed
+        and published.get(rel, {}).get("hash") != info["hash"]
+    )
+    pending_removed = sorted(rel for rel in published if rel not in dest and rel not in source)
+    if pending_copied or pending_removed:
+        log.info(
+            "À reprendre (commit ou push précédent non abouti) : %d copié(s), %d supprimé(s)",
+            len(pending_copied), len(pending_removed),
+        )
+    for rel in added:
+        log.debug("  + %s", rel)
+    for rel in changed:
+        log.debug("  ~ %s", rel)
+    for rel in removed:
+        log.debug("  - %s", rel)
+
+    if not dry_run:
+        apply_diff(source, dest_root, added + changed, removed, workers)
+
+    # L'état destination est connu sans relecture : hash de la source,
+    # taille/mtime du fichier copié (copy2 conserve la mtime)
+    for rel in removed:
+        dest.pop(rel, None)
+    for rel in added + changed:
         if dry_run:
+            dest[rel] = dict(source[rel])
+            continue
+        st = (dest_root / rel).stat()
+        dest[rel] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "hash": source[rel]["hash"],
+        }
+    # Le manifeste d'une cible ne garde que ses propres arbres
+    trees = {str(root): trees[str(root)] for root in overlays}
+    trees[dest_key] = dest
+    manifest["trees"] = trees
+
+    return (
+        added,
+        sorted(set(changed) | set(pending_copied)),
+        sorted(set(removed) | set(pending_removed)),
+        manifest,
+    )
+
+
+# ============================================================
+# COMMIT PAR PLOMBERIE GIT
+# ============================================================
+
+
+def git_output(repo: Path, args: list[str], data: bytes | None = None, check: bool = True) -> str:
+    """Exécute une commande git (sans shell) et retourne sa sortie texte."""
+    result = subprocess.run(
+        ["git", *args], cwd=repo, input=data, capture_output=True, check=check,
+    )
+    return result.stdout.decode("utf-8").strip()
+
+
+def read_index(repo: Path) -> dict[str, str]:
+    """Index git : {chemin: identifiant de blob}."""
+    entries = {}
+    for line in git_output(repo, ["ls-files", "-s", "-z"]).split("\0"):
+        if not line:
             continue
-        if item.is_dir():
-            shutil.copytree(item, dest, dirs_exist_ok=True)
+        meta, path = line.split("\t", 1)
+        entries[path] = meta.split()[1]
+    return entries
+
+
+def has_staged(repo: Path) -> bool:
+    """Vrai si l'index diffère de HEAD (il y a de quoi commiter)."""
+    return subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=repo).returncode == 1
+
+
+def unpushed(repo: Path) -> bool:
+    """Vrai si HEAD a des commits absents de la branche amont (ou amont inconnu)."""
+    return git_output(repo, ["rev-list", "--count", "@{upstream}..HEAD"], check=False) != "0"
+
+
+def changed_against_index(
+    repo: Path,
+    copied: list[str],
+    removed: list[str],
+    tree: dict[str, dict],
+) -> tuple[list[str], list[str], int]:
+    """Filtre les chemins touchés par la copie sur ce qui diffère de l'index.
+
+    Les identifiants de blob viennent de l'inventaire (tree, {chemin:
+    {size, hash}}) : un fichier identique à l'index n'est pas relu. Ces
+    empreintes portent sur les octets bruts ; un fichier qui en diffère
+    est réévalué par git hash-object, qui applique les filtres
+    (core.autocrlf, text=auto...) : un fichier CRLF inchangé ne compte
+    pas comme modifié. Les chemins ignorés par .gitignore et non suivis
+    sont écartés, comme pour git add.
+
+    Returns:
+        (chemins à mettre à jour, chemins à retirer, octets à ajouter)
+    """
+    index = read_index(repo)
+    candidates = [rel for rel in not_ignored(repo, copied) if index.get(rel) != tree[rel]["hash"]]
+    tracked = [rel for rel in candidates if rel in index]
+    if tracked:
+        blobs = git_output(repo, ["hash-object", "--stdin-paths"], "\n".join(tracked).encode("utf-8"))
+        same = {rel for rel, blob in zip(tracked, blobs.split("\n")) if index[rel] == blob}
+        candidates = [rel for rel in candidates if rel not in same]
+    size = sum(tree[rel]["size"] for rel in candidates)
+    dropped = [rel for rel in removed if rel in index]
+    return candidates, dropped, size
+
+
+def plumbing_commit(
+    repo: Path,
+    copied: list[str],
+    removed: list[str],
+    message: str,
+    dry_run: bool,
+    log: logging.LoggerAdapter,
+    tree: dict[str, dict],
+) -> tuple[str | None, int]:
+    """Construit le commit sans balayer l'arbre de travail.
+
+    Seuls les chemins modifiés passent par update-index ; l'arbre et le
+    commit sont écrits par write-tree/commit-tree puis HEAD est avancé.
+
+    Args:
+        tree: Inventaire de la destination après synchronisation
+
+    Returns:
+        (identifiant du commit ou None si rien à commiter, octets ajoutés)
+    """
+    updated, dropped, size = changed_against_index(repo, copied, removed, tree)
+    log.info(
+        "Commit : %d fichier(s) mis à jour (%.1f Mo), %d retiré(s)",
+        len(updated), size / 1_048_576, len(dropped),
+    )
+    for rel in sorted(updated, key=lambda r: tree[r]["size"], reverse=True)[:10]:
+        log.info("  %8.1f Mo  %s", tree[rel]["size"] / 1_048_576, rel)
+
+    if not updated and not dropped:
+        return None, 0
+    if dry_run:
+        log.info("[DRY-RUN] update-index / write-tree / commit-tree")
+        return None, size
+
+    paths = "\0".join(updated + dropped).encode("utf-8")
+    git_output(repo, ["update-index", "--add", "--remove", "-z", "--stdin"], paths)
+
+    tree = git_output(repo, ["write-tree"])
+    parent = git_output(repo, ["rev-parse", "--verify", "-q", "HEAD"], check=False)
+    # Arbre identique à HEAD (fichiers normalisés par les filtres) : pas de commit vide
+    if parent and tree == git_output(repo, ["rev-parse", "HEAD^{tree}"]):
+        log.info("Arbre identique à HEAD : aucun commit")
+        return None, 0
+    args = ["commit-tree", tree, "-m", message]
+    if parent:
+        args += ["-p", parent]
+    commit = git_output(repo, args)
+    git_output(repo, ["update-ref", "-m", message, "HEAD", commit, parent or ""])
+    log.info("Commit %s créé", commit[:10])
+    return commit, size
+
+
+# ============================================================
+# SAUVEGARDES DÉDUPLIQUÉES
+# ============================================================
+
+
+def _object_path(backup_dir: Path, digest: str) -> Path:
+    return backup_dir / "objects" / digest[:2] / digest
+
+
+def _store_chunk(backup_dir: Path, data: bytes, compress: bool) -> str:
+    """Range un morceau dans le magasin (no-op s'il y est déjà)."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(backup_dir, digest)
+    if path.exists():
+        return digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 1 octet d'en-tête : Z = zlib, R = brut
+    payload = b"Z" + zlib.compress(data, 6) if compress else b"R" + data
+    # pid + thread : deux threads peuvent ranger le même morceau en même temps
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return digest
+
+
+def _load_chunk(backup_dir: Path, digest: str) -> bytes:
+    payload = _object_path(backup_dir, digest).read_bytes()
+    data = zlib.decompress(payload[1:]) if payload[:1] == b"Z" else payload[1:]
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f"Morceau corrompu : {digest}")
+    return data
+
+
+def _store_file(backup_dir: Path, path: Path) -> list[str]:
+    compress = path.suffix.lower() not in NO_COMPRESS
+    chunks = []
+    with open(path, "rb") as f:
+        while data := f.read(CHUNK_SIZE):
+            chunks.append(_store_chunk(backup_dir, data, compress))
+    return chunks
+
+
+def list_snapshots(backup_dir: Path) -> list[Path]:
+    """Instantanés du plus ancien au plus récent."""
+    folder = backup_dir / "snapshots"
+    if not folder.exists():
+        return []
+    return sorted(folder.glob("*.json"))
+
+
+def create_backup(
+    project_path: Path,
+    backup_dir: Path,
+    workers: int = 4,
+    log: logging.LoggerAdapter | logging.Logger = logging.getLogger(),
+) -> Path:
+    """Crée un instantané du projet ami (hors .git) dans le magasin dédupliqué.
+
+    Les fichiers dont taille et mtime n'ont pas changé depuis l'instantané
+    précédent ne sont pas relus : seul leur manifeste est recopié.
+    """
+    (backup_dir / "snapshots").mkdir(parents=True, exist_ok=True)
+
+    previous: dict[str, dict] = {}
+    snapshots = list_snapshots(backup_dir)
+    if snapshots:
+        previous = json.loads(snapshots[-1].read_text(encoding="utf-8"))["files"]
+
+    files: dict[str, dict] = {}
+    to_store: list[tuple[str, Path]] = []
+    for rel, info in scan_stats(project_path).items():
+        old = previous.get(rel)
+        if old and old["size"] == info["size"] and old["mtime_ns"] == info["mtime_ns"]:
+            files[rel] = old
         else:
-            shutil.copy2(item, dest)
+            files[rel] = info
+            to_store.append((rel, project_path / rel))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda item: _store_file(backup_dir, item[1]), to_store)
+        for (rel, _), chunks in zip(to_store, results):
+            files[rel]["chunks"] = chunks
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    snapshot = backup_dir / "snapshots" / f"backup_ami_{timestamp}.json"
+    snapshot.write_text(
+        json.dumps(
+            {"source": str(project_path), "created": timestamp, "files": files},
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    log.info(
+        "Sauvegarde %s : %d fichier(s), %d nouveau(x) ou modifié(s)",
+        snapshot.stem, len(files), len(to_store),
+    )
+    return snapshot
+
+
+def restore_backup(backup_dir: Path, name: str, target: Path) -> int:
+    """Restaure un instantané (nom ou préfixe) dans target ; retourne le nombre de fichiers.
+
+    target redevient l'état sauvegardé : les fichiers apparus depuis
+    l'instantané sont supprimés (hors .git et dossiers exclus, jamais
+    sauvegardés).
+    """
+    matches = [p for p in list_snapshots(backup_dir) if p.stem.startswith(name)]
+    if not matches:
+        raise FileNotFoundError(f"Instantané introuvable : {name}")
+    snapshot = json.loads(matches[-1].read_text(encoding="utf-8"))
+
+    remove_paths(target, [rel for rel in scan_stats(target) if rel not in snapshot["files"]])
+    for rel, info in snapshot["files"].items():
+        dest = target / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(dest, "wb") as f:
+            for digest in info["chunks"]:
+                f.write(_load_chunk(backup_dir, digest))
+        os.utime(dest, ns=(info["mtime_ns"], info["mtime_ns"]))
+    return len(snapshot["files"])
+
+
+def prune_backups(backup_dir: Path, max_age_days: float) -> tuple[int, int]:
+    """Supprime les instantanés trop anciens (le plus récent est toujours gardé)
+    puis les morceaux qui ne sont plus référencés.
+
+    Returns:
+        (instantanés supprimés, morceaux supprimés)
+    """
+    snapshots = list_snapshots(backup_dir)
+    limit = time.time() - max_age_days * 86400
+    removed_snapshots = 0
+    for snapshot in snapshots[:-1]:
+        if snapshot.stat().st_mtime < limit:
+            snapshot.unlink()
+            removed_snapshots += 1
+
+    referenced = set()
+    for snapshot in list_snapshots(backup_dir):
+        for info in json.loads(snapshot.read_text(encoding="utf-8"))["files"].values():
+            referenced.update(info["chunks"])
+
+    removed_chunks = 0
+    objects = backup_dir / "objects"
+    if objects.exists():
+        for path in objects.glob("*/*"):
+            if path.name not in referenced:
+                path.unlink()
+                removed_chunks += 1
+    return removed_snapshots, removed_chunks
+
+
+# ============================================================
+# CIBLES (COLLABORATEURS)
+# ============================================================
+
+
+@dataclass
+class Target:
+    """Un dépôt collaborateur à synchroniser sur la base commune."""
+
+    name: str
+    repo: Path
+    overlay: Path
+    remote: str
+    branch: str
+    backup_dir: Path
+
+
+class TargetLog(logging.LoggerAdapter):
+    """Préfixe les messages par le nom de la cible (logs entrelacés)."""
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['name']}] {msg}", kwargs
+
+
+def load_targets(config: configparser.ConfigParser, script_dir: Path) -> list[Target]:
+    """Cibles décrites par les sections [cible:NOM], sinon par [paths]/[github]."""
+    backup_root = script_dir / config["backup"]["backup_dir"]
+    targets = []
+
+    for section in config.sections():
+        if not section.startswith("cible:"):
+            continue
+        name = section.split(":", 1)[1].strip()
+        sect = config[section]
+        nom_ami = sect.get("nom_ami", "")
+        projet_ami = sect.get("projet_ami", "")
+        targets.append(Target(
+            name=name,
+            repo=Path(sect["ami_projet"]),
+            overlay=Path(sect.get("dossier_specifique_ami", "")),
+            remote=sect.get("remote_url", f"https://github.com/{nom_ami}/{projet_ami}.git"),
+            branch=sect.get("branch", "main"),
+            backup_dir=backup_root / name,
+        ))
+
+    if targets:
+        return targets
+
+    # Configuration historique : un seul ami
+    nom_ami = config["github"]["nom_ami"]
+    projet_ami = config["github"]["projet_ami"]
+    return [Target(
+        name=nom_ami,
+        repo=Path(config["paths"]["ami_projet"]),
+        overlay=Path(config["paths"]["dossier_specifique_ami"]),
+        remote=config.get(
+            "github",
+            "remote_url",
+            fallback=f"https://github.com/{nom_ami}/{projet_ami}.git",
+        ),
+        branch=config["github"]["branch"],
+        backup_dir=backup_root,
+    )]
+
+
+def sync_target(
+    target: Target,
+    base: tuple[Path, dict[str, dict]],
+    settings: dict,
+    dry_run: bool,
+) -> dict:
+    """Sauvegarde, synchronise, commite et pousse une cible.
+
+    Returns:
+        Résumé : {name, added, changed, removed, commit, status}
+    """
+    log = TargetLog(logging.getLogger(), {"name": target.name})
+    summary = {"name": target.name, "added": 0, "changed": 0, "removed": 0,
+               "commit": "", "status": "ok"}
+
+    run_cmd(f"git ls-remote {target.remote}", dry_run=dry_run)
+
+    if not (target.repo / ".git").exists():
+        run_cmd(
+            f"git clone -b {target.branch} {target.remote} \"{target.repo}\"",
+            dry_run=dry_run,
+        )
+
+    if settings["backup_enabled"]:
+        log.info("Sauvegarde avant synchronisation")
+        if not dry_run:
+            create_backup(target.repo, target.backup_dir, settings["workers"], log)
+            if settings["backup_keep_days"]:
+                prune_backups(target.backup_dir, settings["backup_keep_days"])
+
+    overlays = [target.overlay] if target.overlay.name and target.overlay.exists() else []
+    if overlays:
+        ajout_dirs, ajout_ext = summarize(scan_stats(target.overlay))
+        log.info("Ajouts - dossiers : %s", sorted(ajout_dirs))
+        log.info("Ajouts - types    : %s", dict(ajout_ext))
+
+    log.info("Synchronisation incrémentale")
+    added, changed, removed, manifest = synchronize(
+        base, overlays, target.repo, settings["workers"], dry_run, log
+    )
+    summary.update(added=len(added), changed=len(changed), removed=len(removed))
+    copied = sorted(added + changed)
+
+    def publie(status: str) -> dict:
+        # Le manifeste ne suit la destination qu'une fois l'état publié :
+        # un commit ou un push en échec sera repris au run suivant
+        if not dry_run:
+            save_manifest(target.repo, manifest)
+        summary["status"] = status
+        return summary
+
+    if not copied and not removed:
+        log.info("Aucun changement : ni commit ni push")
+        return publie("inchangé")
+
+    message = f"Synchronisation automatique v{SCRIPT_VERSION}"
+
+    if settings["plumbing"]:
+        commit, size = plumbing_commit(
+            target.repo, copied, removed, message, dry_run, log,
+            manifest["trees"][str(target.repo)],
+        )
+        if commit is None and not dry_run:
+            if not unpushed(target.repo):
+                log.info("Index déjà à jour : ni commit ni push")
+                return publie("inchangé")
+            log.info("Index déjà à jour : push des commits en attente")
+        summary["commit"] = (commit or "")[:10]
+        max_push_mb = settings["max_push_mb"]
+        if max_push_mb and size > max_push_mb * 1_048_576:
+            log.warning(
+                "Commit de %.1f Mo > max_push_mb (%.0f Mo) : push non effectué, "
+                "vérifier puis lancer 'git push' à la main",
+                size / 1_048_576, max_push_mb,
+            )
+            summary["status"] = "push suspendu"
+            return summary
+        run_cmd("git push", cwd=target.repo, dry_run=dry_run)
+        return publie("ok")
+
+    # Commit & push
+    stage_paths(target.repo, copied, removed, dry_run)
+    if dry_run or has_staged(target.repo):
+        run_cmd(
+            f'git commit -m "{message}"',
+            cwd=target.repo,
+            dry_run=dry_run,
+        )
+    elif not unpushed(target.repo):
+        log.info("Index déjà à jour : ni commit ni push")
+        return publie("inchangé")
+    run_cmd("git push", cwd=target.repo, dry_run=dry_run)
+    return publie("ok")
 
 
 # ============================================================
@@ -95,6 +811,38 @@ def main() -> None:
         action="store_true",
         help="Simulation sans aucune modification",
     )
+    parser.add_argument(
+        "--plumbing",
+        action="store_true",
+        help="Commit construit par plomberie git depuis les seuls chemins modifiés",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        metavar="NOM",
+        help="Limite la synchronisation (ou la commande de sauvegarde) à ces cibles",
+    )
+    parser.add_argument(
+        "--list-backups",
+        action="store_true",
+        help="Liste les instantanés de sauvegarde puis quitte",
+    )
+    parser.add_argument(
+        "--restore",
+        metavar="INSTANTANE",
+        help="Restaure un instantané (nom ou préfixe), fichiers ajoutés depuis supprimés, puis quitte",
+    )
+    parser.add_argument(
+        "--restore-to",
+        metavar="DOSSIER",
+        help="Dossier cible de --restore (défaut : dépôt ami)",
+    )
+    parser.add_argument(
+        "--prune-days",
+        type=float,
+        metavar="JOURS",
+        help="Supprime les instantanés plus anciens que JOURS puis quitte",
+    )
     args = parser.parse_args()
 
     script_path = Path(__file__).resolve()
@@ -129,17 +877,20 @@ def main() -> None:
     # --------------------------------------------------------
 
     mon_projet = Path(config["paths"]["mon_projet"])
-    ami_projet = Path(config["paths"]["ami_projet"])
-    ajouts_ami = Path(config["paths"]["dossier_specifique_ami"])
-
-    nom_ami = config["github"]["nom_ami"]
-    projet_ami = config["github"]["projet_ami"]
-    branch = config["github"]["branch"]
+    targets = load_targets(config, script_dir)
 
-    ami_repo = f"https://github.com/{nom_ami}/{projet_ami}.git"
+    # Cache de genere_site déplacé (CONFIG "dossier_cache") : exclu lui aussi
+    cache_site = config.get("sync", "dossier_cache", fallback=None) or CONFIG_SITE.get("dossier_cache")
+    if cache_site:
+        EXCLUDED_DIRS.add(Path(cache_site).name)
 
-    backup_enabled = config.getboolean("backup", "enabled")
-    backup_dir = script_dir / config["backup"]["backup_dir"]
+    settings = {
+        "backup_enabled": config.getboolean("backup", "enabled"),
+        "backup_keep_days": config.getfloat("backup", "keep_days", fallback=0),
+        "workers": config.getint("sync", "workers", fallback=8),
+        "plumbing": args.plumbing or config.getboolean("sync", "plumbing", fallback=False),
+        "max_push_mb": config.getfloat("sync", "max_push_mb", fallback=0),
+    }
 
     # --------------------------------------------------------
     # Logging
@@ -161,68 +912,83 @@ def main() -> None:
         "Mode DRY-RUN activé" if args.dry_run else "Mode EXECUTION"
     )
 
-    # --------------------------------------------------------
-    # Analyse préalable (résumé)
-    # --------------------------------------------------------
-
-    base_dirs, base_ext = analyse_content(mon_projet)
-    logging.info("Base commune - dossiers : %s", sorted(base_dirs))
-    logging.info("Base commune - types    : %s", dict(base_ext))
-
-    if ajouts_ami.exists():
-        ajout_dirs, ajout_ext = analyse_content(ajouts_ami)
-        logging.info("Ajouts ami  - dossiers : %s", sorted(ajout_dirs))
-        logging.info("Ajouts ami  - types    : %s", dict(ajout_ext))
+    if args.target:
+        targets = [t for t in targets if t.name in args.target]
+        if not targets:
+            logging.error("Aucune cible ne correspond à %s", args.target)
+            sys.exit(1)
 
     # --------------------------------------------------------
-    # Git
+    # Commandes de sauvegarde (sans synchronisation)
     # --------------------------------------------------------
 
-    run_cmd(f"git ls-remote {ami_repo}", dry_run=args.dry_run)
+    if args.list_backups:
+        for target in targets:
+            for snapshot in list_snapshots(target.backup_dir):
+                nb = len(json.loads(snapshot.read_text(encoding="utf-8"))["files"])
+                logging.info("[%s] %s : %d fichier(s)", target.name, snapshot.stem, nb)
+        return
 
-    if not (ami_projet / ".git").exists():
-        run_cmd(
-            f"git clone -b {branch} {ami_repo} \"{ami_projet}\"",
-            dry_run=args.dry_run,
-        )
+    if args.restore:
+        if len(targets) > 1:
+            logging.error("--restore : préciser la cible avec --target")
+            sys.exit(1)
+        target = targets[0]
+        dest = Path(args.restore_to) if args.restore_to else target.repo
+        nb = restore_backup(target.backup_dir, args.restore, dest)
+        logging.info("Restauration de %s : %d fichier(s) dans %s", args.restore, nb, dest)
+        return
 
-    if backup_enabled:
-        logging.info("Sauvegarde avant nettoyage")
-        if not args.dry_run:
-            create_backup(ami_projet, backup_dir)
+    if args.prune_days is not None:
+        for target in targets:
+            nb_snap, nb_chunks = prune_backups(target.backup_dir, args.prune_days)
+            logging.info(
+                "[%s] Purge : %d instantané(s), %d morceau(x) supprimé(s)",
+                target.name, nb_snap, nb_chunks,
+            )
+        return
 
-    # Nettoyage dépôt ami
-    logging.info("Nettoyage du dépôt ami")
-    for item in ami_projet.iterdir():
-        if item.name == ".git":
-            continue
-        if args.dry_run:
-            continue
-        if item.is_dir():
-            shutil.rmtree(item)
-        else:
-            item.unlink()
+    # --------------------------------------------------------
+    # Analyse de la base commune (une seule fois pour toutes les cibles)
+    # --------------------------------------------------------
 
-    # Copies
-    logging.info("Copie base commune")
-    copy_content(mon_projet, ami_projet, args.dry_run)
+    base_entries = scan_base(mon_projet, args.dry_run)
+    base_dirs, base_ext = summarize(base_entries)
+    logging.info("Base commune - dossiers : %s", sorted(base_dirs))
+    logging.info("Base commune - types    : %s", dict(base_ext))
 
-    if ajouts_ami.exists():
-        logging.info("Copie ajouts spécifiques ami")
-        copy_content(ajouts_ami, ami_projet, args.dry_run)
+    # --------------------------------------------------------
+    # Synchronisation des cibles en parallèle
+    # --------------------------------------------------------
 
-    # Commit & push
-    run_cmd("git add .", cwd=ami_projet, dry_run=args.dry_run)
-    run_cmd(
-        f'git commit -m "Synchronisation automatique v{SCRIPT_VERSION}"',
-        cwd=ami_projet,
-        dry_run=args.dry_run,
-    )
-    run_cmd("git push", cwd=ami_projet, dry_run=args.dry_run)
-# Synchro_site.py version 0.4
+    base = (mon_projet, base_entries)
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        futures = {
+            target.name: pool.submit(sync_target, target, base, settings, args.dry_run)
+            for target in targets
+        }
+
+    summaries = []
+    for name, future in futures.items():
+        try:
+            summaries.append(future.result())
+        except Exception as e:
+            logging.error("[%s] Échec : %s", name, e)
+            summaries.append({"name": name, "added": 0, "changed": 0, "removed": 0,
+                              "commit": "", "status": f"erreur ({e})"})
+
+    logging.info("Résumé par cible :")
+    for summary in summaries:
+        logging.info(
+            "  %-15s +%d ~%d -%d %s %s",
+            summary["name"], summary["added"], summary["changed"],
+            summary["removed"], summary["commit"], summary["status"],
+        )
+# Synchro_site.py version 0.11
 
     logging.info("Fin de synchronisation")
-
+    if any(s["status"].startswith("erreur") for s in summaries):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
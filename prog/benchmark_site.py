@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# benchmark_site.py — Version 1.3
+"""
+Mesures de performance du générateur sur un arbre synthétique.
+
+Usage:
+    python benchmark_site.py rendu [--dossiers 10000] [--jobs 8] [--memoire]
+    python benchmark_site.py memoire [--elements 100000]
+    python benchmark_site.py demarrage [--dossiers 500] [--repetitions 5]
+
+rendu   : génère les index.html d'un arbre de N dossiers en séquentiel
+          puis avec --jobs processus, vérifie que la sortie est identique
+          et affiche l'accélération. --memoire : pages écrites en
+          mémoire (lib1/fs_utils.py), sans E/S disque en sortie.
+memoire : mémoire occupée par N éléments chargés puis résolus pour le
+          rendu, dicts (v23.12) contre modèle lib1/modele.py.
+demarrage : temps d'import de genere_site (python -X importtime, modules
+            les plus coûteux) et durée d'une construction sans objet
+            (rien n'a changé depuis la précédente).
+"""
+
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import os
+import re
+import json
+import tracemalloc
+import subprocess
+from pathlib import Path
+
+version = ("benchmark_site.py", "1.3")
+
+# ============================================================================
+# ARBRE SYNTHÉTIQUE
+# ============================================================================
+
+def creer_arbre_synthetique(racine: Path, nb_dossiers: int, fichiers_par_dossier: int = 3) -> int:
+    """Crée un arbre DOCUMENTS de nb_dossiers dossiers avec STRUCTURE.py.
+
+    Arborescence à 3 niveaux (largeur ≈ racine cubique de nb_dossiers),
+    fichiers PDF vides, STRUCTURE.py complets (rien à réconcilier).
+
+    Returns:
+        Nombre de dossiers créés (racine comprise)
+    """
+    from lib1 import structure_utils as struct
+
+    largeur = max(2, round(nb_dossiers ** (1 / 3)))
+    crees = 0
+
+    def remplir(dossier: Path, profondeur: int) -> None:
+        nonlocal crees
+        dossier.mkdir(parents=True, exist_ok=True)
+        crees += 1
+
+        structure = {"titre_dossier": dossier.name, "dossiers": [], "fichiers": []}
+        position = 1
+
+        if profondeur < 3:
+            for i in range(largeur):
+                if crees >= nb_dossiers:
+                    break
+                nom = f"Dossier {profondeur}.{i} – étude"
+                remplir(dossier / nom, profondeur + 1)
+                structure["dossiers"].append({
+                    "nom_document": nom,
+                    "nom_html": nom.lower().replace(" ", "_"),
+                    "nom_affiché": "{{nom_document_sans_ext}}",
+                    "nom_TDM": "{{nom_document_sans_ext}}",
+                    "nom_navigation": "{{nom_document}}",
+                    "position": position,
+                })
+                position += 1
+
+        for j in range(fichiers_par_dossier):
+            nom = f"Leçon {j} – texte hébreu.pdf"
+            (dossier / nom).write_bytes(b"%PDF-1.4\n")
+            structure["fichiers"].append({
+                "nom_document": nom,
+                "nom_html": nom.lower().replace(" ", "_"),
+                "nom_affiché": "{{nom_document_sans_ext}}",
+                "nom_TDM": "{{nom_document_sans_ext}}",
+                "position": position,
+            })
+            position += 1
+
+        struct.sauvegarder_structure(dossier, structure)
+
+    remplir(racine, 0)
+    return crees
+
+def empreinte_sortie(dossier_html: Path, memoire=None) -> str:
+    """Empreinte de toutes les pages (horodatage de génération exclu).
+
+    Args:
+        memoire: fs_utils.Memoire où les pages ont été écrites (défaut : disque)
+    """
+    digest = hashlib.sha256()
+    if memoire is None:
+        pages = sorted(dossier_html.rglob("index.html"))
+    else:
+        pages = [p for p in memoire.fichiers(dossier_html) if p.name == "index.html"]
+    for page in pages:
+        digest.update(str(page.relative_to(dossier_html)).encode("utf-8"))
+        contenu = (memoire.lire_texte(page) if memoire else page.read_text(encoding="utf-8"))
+        digest.update(re.sub(r"<!-- Généré le .*? -->", "", contenu).encode("utf-8"))
+    return digest.hexdigest()
+
+def structures_synthetiques(nb_elements: int, par_dossier: int = 50):
+    """STRUCTURE de dossiers synthétiques (nouveaux objets à chaque appel,
+    comme un chargement de STRUCTURE.py).
+
+    Yields:
+        (chemin du dossier, structure)
+    """
+    for d in range(0, nb_elements, par_dossier):
+        elements = []
+        for i in range(min(par_dossier, nb_elements - d)):
+            nom = f"Leçon {d + i} – texte hébreu.pdf"
+            elements.append({
+                "nom_document": nom,
+                "nom_html": nom.lower().replace(" ", "_"),
+                "nom_affiché": "{{nom_document_sans_ext}}",
+                "nom_TDM": "{{nom_document_sans_ext}}",
+                "ajout_affichage": True,
+                "affiché_index": True,
+                "affiché_TDM": True,
+                "position": par_dossier - i,
+            })
+        structure = {"titre_dossier": f"Dossier {d}", "dossiers": [], "fichiers": elements}
+        # Aller-retour JSON : objets distincts par dossier, comme exec(STRUCTURE.py)
+        yield Path(f"Dossier {d}"), json.loads(json.dumps(structure))
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_rendu(nb_dossiers: int, jobs: int, en_memoire: bool = False) -> None:
+    """Rendu des index.html : séquentiel vs pool de processus."""
+    import genere_site as gs
+    from lib1 import fs_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = Path(tmp) / "documents"
+        t0 = time.perf_counter()
+        n = creer_arbre_synthetique(documents, nb_dossiers)
+        print(f"Arbre synthétique : {n} dossiers ({time.perf_counter() - t0:.1f} s)")
+
+        resultats = {}
+        for nb_jobs in (1, jobs):
+            sortie = Path(tmp) / f"html_{nb_jobs}"
+            gs.configurer_chemins(str(documents), str(sortie))
+            dossiers = gs.lister_dossiers()
+            # Le rendu (processus du pool) lit le disque ; seul le principal écrit
+            memoire = fs_utils.Memoire() if en_memoire else None
+            precedent = fs_utils.utiliser(memoire) if memoire else None
+            t0 = time.perf_counter()
+            try:
+                gs.generer_pages_index(dossiers, nb_jobs)
+            finally:
+                if memoire:
+                    fs_utils.utiliser(precedent)
+            duree = time.perf_counter() - t0
+            resultats[nb_jobs] = (duree, empreinte_sortie(sortie, memoire))
+            print(f"  jobs={nb_jobs:<3} {duree:8.2f} s  ({len(dossiers) / duree:,.0f} pages/s)")
+
+        (d1, e1), (dn, en) = resultats[1], resultats[jobs]
+        print(f"Accélération : x{d1 / dn:.2f}")
+        print("✓ Sortie identique" if e1 == en else "✗ Sortie DIFFÉRENTE")
+
+def mesurer(construire) -> tuple:
+    """(octets retenus par le résultat de construire(), durée)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    resultat = construire()
+    duree = time.perf_counter() - t0
+    taille, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultat
+    return taille, duree
+
+def bench_memoire(nb_elements: int) -> None:
+    """Arbre de nb_elements éléments chargé puis résolu pour le rendu."""
+    from lib1 import structure_utils as struct
+    from lib1.modele import Dossier
+
+    def avec_dicts():
+        # Pipeline v23.12 : structure chargée + copie résolue de chaque élément
+        arbre = []
+        for chemin, structure in structures_synthetiques(nb_elements):
+            elements = []
+            for item in structure["fichiers"]:
+                variables = {"nom_document": item["nom_document"],
+                             "titre_dossier": structure.get("titre_dossier", "")}
+                resolu = struct.resoudre_templates_runtime(item, variables)
+                resolu["genre"] = "fichier"
+                elements.append(resolu)
+            elements.sort(key=lambda x: x.get("position", 9999))
+            arbre.append((structure, elements))
+        return arbre
+
+    def avec_modele():
+        arbre = []
+        for chemin, structure in structures_synthetiques(nb_elements):
+            dossier = Dossier(chemin, structure)
+            for e in dossier.elements:
+                e.nom_affiche  # Résolution (paresseuse) faite au rendu
+            arbre.append(dossier)
+        return arbre
+
+    print(f"{nb_elements:,} éléments")
+    resultats = {}
+    for nom, construire in (("dicts", avec_dicts), ("modèle", avec_modele)):
+        taille, duree = mesurer(construire)
+        resultats[nom] = taille
+        print(f"  {nom:<7} {taille / 2**20:8.1f} Mo  {taille / nb_elements:6.0f} o/élément  {duree:6.2f} s")
+    print(f"Gain mémoire : x{resultats['dicts'] / resultats['modèle']:.2f}")
+
+def temps_import(module: str) -> tuple:
+    """Import de module dans un interpréteur neuf.
+
+    Returns:
+        (durée totale en s, [(durée propre en s, module)] par coût décroissant)
+    """
+    resultat = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    modules = []
+    total = 0.0
+    for ligne in resultat.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", ligne)
+        if not m:
+            continue
+        modules.append((int(m.group(1)) / 1e6, m.group(4)))
+        if m.group(4) == module and len(m.group(3)) <= 1:  # Niveau 0 : cumul total
+            total = int(m.group(2)) / 1e6
+    modules.sort(reverse=True)
+    return total, modules
+
+def bench_demarrage(nb_dossiers: int, repetitions: int) -> None:
+    """Import de genere_site et construction sans objet."""
+    durees = []
+    modules = []
+    for _ in range(repetitions):
+        total, modules = temps_import("genere_site")
+        durees.append(total)
+    print(f"Import genere_site : {min(durees) * 1000:.0f} ms (meilleur de {repetitions})")
+    for duree, nom in modules[:8]:
+        print(f"    {duree * 1000:7.1f} ms  {nom}")
+
+    script = Path(__file__).parent / "genere_site.py"
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = Path(tmp) / "documents"
+        sortie = Path(tmp) / "html"
+        creer_arbre_synthetique(documents, nb_dossiers)
+        commande = [sys.executable, str(script), "--documents", str(documents), "--html", str(sortie)]
+
+        t0 = time.perf_counter()
+        premiere = subprocess.run(commande, cwd=tmp, capture_output=True, text=True)
+        print(f"Construction complète ({nb_dossiers} dossiers) : {time.perf_counter() - t0:.2f} s")
+        if premiere.returncode != 0:
+            print("✗ Échec de la construction :")
+            print(premiere.stderr[-2000:])
+            return
+
+        durees = []
+        for _ in range(repetitions):
+            t0 = time.perf_counter()
+            subprocess.run(commande, cwd=tmp, capture_output=True, text=True, check=True)
+            durees.append(time.perf_counter() - t0)
+        print(f"Construction sans objet : {min(durees) * 1000:.0f} ms (meilleur de {repetitions})")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks du générateur de site")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_rendu = sous.add_parser("rendu", help="Rendu parallèle des index.html")
+    p_rendu.add_argument("--dossiers", type=int, default=10000)
+    p_rendu.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    p_rendu.add_argument("--memoire", action="store_true", help="Pages écrites en mémoire")
+
+    p_memoire = sous.add_parser("memoire", help="Mémoire par élément : dicts contre modèle typé")
+    p_memoire.add_argument("--elements", type=int, default=100000)
+
+    p_demarrage = sous.add_parser("demarrage", help="Temps d'import et construction sans objet")
+    p_demarrage.add_argument("--dossiers", type=int, default=500)
+    p_demarrage.add_argument("--repetitions", type=int, default=5)
+
+    args = parser.parse_args()
+    print(f"[Version] {version[0]} — {version[1]}")
+
+    if args.commande == "rendu":
+        bench_rendu(args.dossiers, args.jobs, args.memoire)
+    elif args.commande == "memoire":
+        bench_memoire(args.elements)
+    elif args.commande == "demarrage":
+        bench_demarrage(args.dossiers, args.repetitions)
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent))
+    main()
+
+# Fin benchmark_site.py v1.3
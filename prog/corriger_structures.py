@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# corriger_structures.py — Version 2.0
+# corriger_structures.py — Version 2.2
 """
 Utilitaire de correction STRUCTURE.py.
 
@@ -9,34 +9,42 @@ Corrections appliquées:
 3. Corrige logique nom_document/nom_html
 
 Usage:
-    python corriger_structures.py <dossier> [--dry-run]
+    python corriger_structures.py <dossier> [--dry-run] [--jobs N]
+
+v2.2:
+- Éléments manipulés via le modèle typé lib1/modele.py
+
+v2.1:
+- Arbre parcouru une fois (lib1/scan_utils.Scanner), doublons PDF
+  détectés par l'index des noms du dossier (lib1/noms_utils.IndexNoms)
+- Dossiers corrigés en parallèle (--jobs), sortie affichée dans l'ordre
 """
 
+import os
 import sys
 import json
-import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Tuple
+
+from lib1.modele import Dossier, Element
+from lib1.noms_utils import IndexNoms
+from lib1.scan_utils import Scanner
 
-def normaliser_nom(nom: str) -> str:
-    """Normalise nom pour URL."""
-    nom = unicodedata.normalize('NFD', nom)
-    nom = ''.join(c for c in nom if unicodedata.category(c) != 'Mn')
-    nom = nom.replace("'", "_").replace("'", "_").replace(" ", "_")
-    return nom.lower()
+IGNORER = {"__pycache__", ".git", "nppBackup"}
 
-def charger_structure(dossier: Path) -> Dict[str, Any]:
-    """Charge STRUCTURE.py."""
+def charger_structure(dossier: Path, log_func: Callable[[str], None] = print) -> Dict[str, Any]:
+    """Charge STRUCTURE.py (espace de noms privé : sûr entre threads)."""
     fichier = dossier / "STRUCTURE.py"
     if not fichier.exists():
         return None
     
     try:
-        from importlib.machinery import SourceFileLoader
-        module = SourceFileLoader("STRUCTURE", str(fichier)).load_module()
-        return module.STRUCTURE
+        espace = {}
+        exec(compile(fichier.read_text(encoding="utf-8"), str(fichier), "exec"), espace)
+        return espace["STRUCTURE"]
     except Exception as e:
-        print(f"  ✗ Erreur lecture {fichier}: {e}")
+        log_func(f"  ✗ Erreur lecture {fichier}: {e}")
         return None
 
 def sauvegarder_structure(dossier: Path, structure: Dict[str, Any]) -> None:
@@ -46,7 +54,7 @@ def sauvegarder_structure(dossier: Path, structure: Dict[str, Any]) -> None:
     if "fichiers" in structure:
         structure["fichiers"].sort(key=lambda x: x.get("position", 9999))
     
-    contenu = "# STRUCTURE.py – Corrigé automatiquement v2.0\n"
+    contenu = "# STRUCTURE.py – Corrigé automatiquement v2.2\n"
     contenu += "# Templates {{variable}} pour flexibilité\n\n"
     
     json_str = json.dumps(structure, ensure_ascii=False, indent=4)
@@ -57,28 +65,17 @@ def sauvegarder_structure(dossier: Path, structure: Dict[str, Any]) -> None:
     fichier = dossier / "STRUCTURE.py"
     fichier.write_text(contenu, encoding="utf-8")
 
-def fichier_docx_existe_pour_pdf(nom_pdf: str, dossier: Path) -> bool:
+def fichier_docx_existe_pour_pdf(nom_pdf: str, index: IndexNoms) -> bool:
     """Vérifie si un DOCX source existe pour un PDF.
     
     Args:
         nom_pdf: Nom du fichier PDF (normalisé ou non)
-        dossier: Dossier où chercher
+        index: Index des noms du dossier
         
     Returns:
         True si DOCX correspondant existe
     """
-    # Stem du PDF
-    pdf_stem = Path(nom_pdf).stem
-    pdf_stem_norm = normaliser_nom(pdf_stem)
-    
-    # Chercher DOCX correspondant
-    for f in dossier.iterdir():
-        if f.suffix.lower() in ['.doc', '.docx']:
-            docx_stem_norm = normaliser_nom(f.stem)
-            if docx_stem_norm == pdf_stem_norm:
-                return True
-    
-    return False
+    return index.a_source_docx(nom_pdf)
 
 def remplacer_idem_par_template(valeur: Any) -> str:
     """Remplace 'idem' par template approprié.
@@ -93,7 +90,7 @@ def remplacer_idem_par_template(valeur: Any) -> str:
         return "{{nom_document_sans_ext}}"
     return valeur
 
-def corriger_element_fichier(item: Dict[str, Any], dossier: Path) -> Tuple[bool, str]:
+def corriger_element_fichier(item: Element, dossier: Path) -> Tuple[bool, str]:
     """Corrige un élément fichier.
     
     Returns:
@@ -104,10 +101,11 @@ def corriger_element_fichier(item: Dict[str, Any], dossier: Path) -> Tuple[bool,
     
     # 1. Remplacer "idem" par templates
     for champ in ["nom_affiché", "nom_TDM", "nom_navigation"]:
-        if champ in item:
-            nouvelle_valeur = remplacer_idem_par_template(item[champ])
-            if nouvelle_valeur != item[champ]:
-                item[champ] = nouvelle_valeur
+        valeur = item.brut(champ)
+        if valeur is not None:
+            nouvelle_valeur = remplacer_idem_par_template(valeur)
+            if nouvelle_valeur != valeur:
+                item.definir(champ, nouvelle_valeur)
                 modif = True
                 raisons.append(f"{champ}:idem→template")
     
@@ -116,97 +114,100 @@ def corriger_element_fichier(item: Dict[str, Any], dossier: Path) -> Tuple[bool,
     
     return (modif, ", ".join(raisons) if raisons else "")
 
-def supprimer_doublons_pdf(structure: Dict[str, Any], dossier: Path) -> Tuple[int, List[str]]:
+def supprimer_doublons_pdf(modele: Dossier, index: IndexNoms) -> Tuple[int, List[str]]:
     """Supprime les doublons PDF (si DOCX existe).
     
     Returns:
         (nb_supprimes: int, noms_supprimes: List[str])
     """
-    if "fichiers" not in structure:
-        return (0, [])
-    
-    fichiers_a_garder = []
     nb_supprimes = 0
     noms_supprimes = []
     
-    for item in structure["fichiers"]:
-        nom_doc = item.get("nom_document", "")
+    for item in modele.fichiers():
+        nom_doc = item.nom_document
         
         # Si c'est un PDF
         if nom_doc.lower().endswith('.pdf'):
             # Vérifier si DOCX correspondant existe
-            if fichier_docx_existe_pour_pdf(nom_doc, dossier):
+            if fichier_docx_existe_pour_pdf(nom_doc, index):
                 # DOCX existe → supprimer ce PDF (c'est un doublon)
+                modele.retirer(item)
                 nb_supprimes += 1
                 noms_supprimes.append(nom_doc)
-                continue  # Ne pas ajouter à fichiers_a_garder
-        
-        # Garder cet élément
-        fichiers_a_garder.append(item)
     
-    structure["fichiers"] = fichiers_a_garder
     return (nb_supprimes, noms_supprimes)
 
-def corriger_dossier_structure(dossier: Path, dry_run: bool = False) -> Dict[str, Any]:
+def corriger_dossier_structure(dossier: Path, index: IndexNoms, dry_run: bool = False,
+                               log_func: Callable[[str], None] = print) -> Dict[str, Any]:
     """Corrige STRUCTURE.py d'un dossier.
     
+    Args:
+        index: Index des noms de fichiers du dossier
+        log_func: Sortie (tampon par dossier en parallèle)
+    
     Returns:
         Statistiques: {doublons, idem_remplaces, total_modifs}
     """
-    print(f"\n📁 {dossier}")
+    log_func(f"\n📁 {dossier}")
     
-    structure = charger_structure(dossier)
+    structure = charger_structure(dossier, log_func)
     if structure is None:
-        print("  ⊘ Pas de STRUCTURE.py")
+        log_func("  ⊘ Pas de STRUCTURE.py")
         return {"doublons": 0, "idem": 0, "total": 0}
     
+    modele = Dossier(dossier, structure)
     stats = {"doublons": 0, "idem": 0, "total": 0}
     
+    for radical, sources in index.doublons().items():
+        log_func(f"  ⚠ Même PDF {radical}.pdf produit par : {', '.join(sources)}")
+    
     # 1. Supprimer doublons PDF
-    nb_doublons, noms_doublons = supprimer_doublons_pdf(structure, dossier)
+    nb_doublons, noms_doublons = supprimer_doublons_pdf(modele, index)
     if nb_doublons > 0:
         stats["doublons"] = nb_doublons
         stats["total"] += nb_doublons
         for nom in noms_doublons:
-            print(f"  ✗ Doublon PDF supprimé : {nom}")
+            log_func(f"  ✗ Doublon PDF supprimé : {nom}")
     
     # 2. Corriger fichiers (remplacer "idem")
-    if "fichiers" in structure:
-        for i, item in enumerate(structure["fichiers"]):
-            modif, raison = corriger_element_fichier(item, dossier)
-            if modif:
-                structure["fichiers"][i] = item
-                stats["idem"] += 1
-                stats["total"] += 1
-                print(f"  ✓ Corrigé : {item.get('nom_document', '?')} ({raison})")
+    for item in modele.fichiers():
+        modif, raison = corriger_element_fichier(item, dossier)
+        if modif:
+            stats["idem"] += 1
+            stats["total"] += 1
+            log_func(f"  ✓ Corrigé : {item.nom_document} ({raison})")
     
     # 3. Corriger dossiers (remplacer "idem")
-    if "dossiers" in structure:
-        for i, item in enumerate(structure["dossiers"]):
-            modif, raison = corriger_element_fichier(item, dossier)
-            if modif:
-                structure["dossiers"][i] = item
-                stats["idem"] += 1
-                stats["total"] += 1
-                print(f"  ✓ Corrigé dossier : {item.get('nom_document', '?')} ({raison})")
+    for item in modele.dossiers():
+        modif, raison = corriger_element_fichier(item, dossier)
+        if modif:
+            stats["idem"] += 1
+            stats["total"] += 1
+            log_func(f"  ✓ Corrigé dossier : {item.nom_document} ({raison})")
     
     # Sauvegarder si modifié
     if stats["total"] > 0 and not dry_run:
-        sauvegarder_structure(dossier, structure)
-        print(f"  💾 STRUCTURE.py sauvegardé")
-        print(f"     - Doublons PDF : {stats['doublons']}")
-        print(f"     - 'idem' remplacés : {stats['idem']}")
+        sauvegarder_structure(dossier, modele.vers_structure())
+        log_func(f"  💾 STRUCTURE.py sauvegardé")
+        log_func(f"     - Doublons PDF : {stats['doublons']}")
+        log_func(f"     - 'idem' remplacés : {stats['idem']}")
     elif stats["total"] > 0:
-        print(f"  🔍 [DRY RUN] {stats['total']} modification(s)")
+        log_func(f"  🔍 [DRY RUN] {stats['total']} modification(s)")
     else:
-        print("  ✓ Aucune correction nécessaire")
+        log_func("  ✓ Aucune correction nécessaire")
     
     return stats
 
-def parcourir_et_corriger(racine: Path, dry_run: bool = False) -> None:
-    """Parcourt et corrige tous STRUCTURE.py."""
+def corriger_avec_sortie(dossier: Path, index: IndexNoms, dry_run: bool) -> Tuple[Dict[str, Any], List[str]]:
+    """corriger_dossier_structure avec sortie mise en tampon."""
+    lignes = []
+    stats = corriger_dossier_structure(dossier, index, dry_run, lignes.append)
+    return stats, lignes
+
+def parcourir_et_corriger(racine: Path, dry_run: bool = False, jobs: int = 8) -> None:
+    """Parcourt et corrige tous STRUCTURE.py (dossiers en parallèle)."""
     print("="*60)
-    print("CORRECTION STRUCTURE.py v2.0")
+    print("CORRECTION STRUCTURE.py v2.2")
     print("="*60)
     print("\nCorrections appliquées:")
     print("1. Suppression doublons PDF (si DOCX existe)")
@@ -218,12 +219,22 @@ def parcourir_et_corriger(racine: Path, dry_run: bool = False) -> None:
     
     stats_totaux = {"doublons": 0, "idem": 0, "total": 0, "dossiers": 0}
     
-    for racine_dir, dirs, files in racine.walk():
-        dirs[:] = [d for d in dirs if d not in {"__pycache__", ".git", "nppBackup"}]
-        
-        if "STRUCTURE.py" in files:
+    scan = Scanner(racine, IGNORER, largeur=jobs).scanner()
+    a_traiter = [
+        dossier for dossier in scan.dossiers()
+        if any(e.nom == "STRUCTURE.py" and e.est_fichier for e in scan.lister(dossier))
+    ]
+    
+    # Un dossier = une tâche indépendante ; affichage dans l'ordre du parcours
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        resultats = pool.map(
+            lambda d: corriger_avec_sortie(d, scan.index_noms(d), dry_run),
+            a_traiter
+        )
+        for stats, lignes in resultats:
+            for ligne in lignes:
+                print(ligne)
             stats_totaux["dossiers"] += 1
-            stats = corriger_dossier_structure(racine_dir, dry_run)
             stats_totaux["doublons"] += stats["doublons"]
             stats_totaux["idem"] += stats["idem"]
             stats_totaux["total"] += stats["total"]
@@ -244,7 +255,7 @@ def main():
     """Point d'entrée."""
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python corriger_structures.py <dossier> [--dry-run]")
+        print("  python corriger_structures.py <dossier> [--dry-run] [--jobs N]")
         print("\nExemple:")
         print("  python corriger_structures.py C:\\SiteGITHUB\\Hebreu4.0\\documents")
         print("  python corriger_structures.py C:\\SiteGITHUB\\Hebreu4.0\\documents --dry-run")
@@ -252,14 +263,17 @@ def main():
     
     racine = Path(sys.argv[1])
     dry_run = "--dry-run" in sys.argv
+    jobs = os.cpu_count() or 1
+    if "--jobs" in sys.argv:
+        jobs = int(sys.argv[sys.argv.index("--jobs") + 1])
     
     if not racine.exists():
         print(f"✗ Dossier inexistant : {racine}")
         return
     
-    parcourir_et_corriger(racine, dry_run)
+    parcourir_et_corriger(racine, dry_run, jobs)
 
 if __name__ == "__main__":
     main()
 
-# Fin corriger_structures.py v2.0
+# Fin corriger_structures.py v2.2
@@ -1,16 +1,22 @@
-# cree_table_des_matieres.py — Version 6.29
+# cree_table_des_matieres.py — Version 6.36
 
-version = ("cree_table_des_matieres.py", "6.29")
+version = ("cree_table_des_matieres.py", "6.36")
 print(f"[Version] {version[0]} — {version[1]}")
 
 import json
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
 
 from lib1.options import DOSSIER_DOCUMENTS, DOSSIER_HTML, BASE_PATH
 from lib1.config import CONFIG
 from lib1 import html_utils as html  # v6.29: Import html_utils pour templates
+from lib1 import publication  # v6.30: Écriture seulement si la page change
+from lib1 import ressources  # v6.34: style.css sous nom empreinté
+from lib1 import images  # v6.35: <img> en srcset à chargement différé
+from lib1.cache_utils import Cache, dossier_cache  # v6.36: Variantes produites
+from lib1 import structure_utils as struct
+from lib1.modele import Dossier, Element  # v6.31: Modèle typé, noms résolus
+from lib1.noms_utils import normaliser_nom  # v6.35: Noms publiés des images
 
 def lire(variable: dict, element: str, defaut) -> object:
     """Lit une valeur dans un dictionnaire, retourne la valeur par défaut sinon.
@@ -27,6 +33,13 @@ def lire(variable: dict, element: str, defaut) -> object:
 
 voir_structure = lire(CONFIG, "voir_structure", False)
 
+# v6.33: Préfixe des liens depuis TDM/index.html (un niveau sous la racine) :
+# "..", ou BASE_PATH si liens_relatifs est désactivé
+BASE_TDM = html.chemin_base(1, BASE_PATH, lire(CONFIG, "liens_relatifs", False))
+
+# v6.34: {nom logique: nom publié} de style.css (et favicon), cf. genere_site
+RESSOURCES_TDM = ressources.manifeste(lire(CONFIG, "ressources_empreintees", True))
+
 def log(msg: str) -> None:
     """Affiche un message de debug préfixé.
 
@@ -80,7 +93,7 @@ def deb_html(titre: str) -> str:
 <head>
     <meta charset="utf-8"/>
     <title>{titre}</title>
-    <link href="{BASE_PATH}/style.css" rel="stylesheet"/>
+    {html.liens_ressources(BASE_TDM, RESSOURCES_TDM)}
 </head>
 <body>"""
 
@@ -93,6 +106,38 @@ def fin_html() -> str:
     return """</body>
 </html>"""
 
+# v6.36: Cache des variantes d'images du site publié (fixé par generer_tdm)
+_cache_images = None
+
+def variantes_produites(source: Path) -> list[str]:
+    """Suffixes des variantes de source effectivement produites.
+
+    Args:
+        source (Path): Image de DOSSIER_DOCUMENTS.
+
+    Returns:
+        list[str]: ["-320w.png", ".webp"...], vide si aucune.
+    """
+    return images.produites(_cache_images, source) if _cache_images else []
+
+def trouver_image(chemin_site: str):
+    """Image source d'un chemin relatif à la racine du site (None si absente).
+
+    Args:
+        chemin_site (str): Chemin publié, ex. "ig/potier.png".
+
+    Returns:
+        Path | None: Fichier correspondant dans DOSSIER_DOCUMENTS.
+    """
+    source = Path(DOSSIER_DOCUMENTS) / chemin_site
+    if source.exists():
+        return source
+    if source.parent.is_dir():
+        for candidat in source.parent.iterdir():
+            if normaliser_nom(candidat.name) == source.name:
+                return candidat
+    return None
+
 def plage_html_avec_fallback(dossier: Path, fichier: str, position: str, commun: str) -> str:
     """Lit un fichier HTML avec fallback à la racine et interprétation templates.
     
@@ -123,13 +168,17 @@ def plage_html_avec_fallback(dossier: Path, fichier: str, position: str, commun:
     # v6.29: Utiliser charger_template_html pour interpréter {{BASE_PATH}}
     contenu = html.charger_template_html(
         modele,
-        {"BASE_PATH": BASE_PATH},
+        {"BASE_PATH": BASE_TDM},
         voir_structure,
         position,
         commun
     )
     
-    return contenu
+    # v6.33: Liens écrits en dur avec BASE_PATH rendus relatifs
+    contenu = html.relativiser_liens(contenu, BASE_PATH, BASE_TDM)
+    if lire(CONFIG, "images_responsives", True):
+        contenu = images.enrichir_images(contenu, BASE_TDM, trouver_image, variantes_produites)
+    return ressources.reecrire_references(contenu, RESSOURCES_TDM, BASE_TDM)  # v6.36: liens du site seulement
 
 def _generer_navigation(chemin_relatif: list[str]) -> str:
     """Génère la barre de navigation pour la page TDM.
@@ -140,7 +189,7 @@ def _generer_navigation(chemin_relatif: list[str]) -> str:
     Returns:
         str: HTML de la barre de navigation.
     """
-    nav = f'<nav class="navigation"><div class="gauche"><a href="{BASE_PATH}/index.html" class="monbouton">Accueil</a>'
+    nav = f'<nav class="navigation"><div class="gauche"><a href="{BASE_TDM}/index.html" class="monbouton">Accueil</a>'
     nav += f'</div><div class="droite"></div></nav>'  # Droite vide : pas de bouton Sommaire
     if voir_structure:
         nav = f"<div><!-- début navigation -->{nav}<!-- fin navigation --></div>"
@@ -149,60 +198,55 @@ def _generer_navigation(chemin_relatif: list[str]) -> str:
 def charger_structure(dossier: Path) -> dict:
     """Charge le fichier STRUCTURE.py d'un dossier s'il existe.
 
+    v6.31: Lecture commune lib1/structure_utils (sans module partagé
+    dans sys.modules, sûre pendant la construction parallèle).
+
     Args:
         dossier (Path): Chemin du dossier contenant éventuellement STRUCTURE.py.
 
     Returns:
         dict: Contenu de STRUCTURE (dossiers et fichiers) ou dictionnaire vide.
     """
-    chemin = dossier / "STRUCTURE.py"
-    if chemin.exists():
-        try:
-            from importlib.machinery import SourceFileLoader
-            module = SourceFileLoader("STRUCTURE", str(chemin)).load_module()
-            return module.STRUCTURE
-        except Exception as e:
-            log(f"Erreur lecture STRUCTURE.py dans {dossier} : {e}")
-    return {"dossiers": [], "fichiers": []}
-
-def est_visible_tdm(item: dict) -> bool:
+    return struct.charger_structure(dossier)
+
+def est_visible_tdm(item: Element) -> bool:
     """Vérifie si un élément doit apparaître dans la TDM.
 
     Args:
-        item (dict): Élément de structure (dossier ou fichier).
+        item (Element): Élément de structure (dossier ou fichier).
 
     Returns:
         bool: True si affiché_TDM est True ou absent.
     """
-    return item.get("affiché_TDM", True)
+    return item.affiche_tdm
 
-def generer_ligne_dossier(item: dict, lien: str, sous_arbo: str) -> str:
+def generer_ligne_dossier(item: Element, lien: str, sous_arbo: str) -> str:
     """Génère le HTML pour un dossier dans l'arbre TDM.
 
     Args:
-        item (dict): Élément dossier.
+        item (Element): Élément dossier.
         lien (str): URL complète du dossier.
         sous_arbo (str): HTML des enfants (peut être vide).
 
     Returns:
         str: Ligne HTML <li>...</li>.
     """
-    nom_affiché = appliquer_style(item.get("nom_affiché", item["nom_document"]))
+    nom_affiché = appliquer_style(item.nom_affiche)
     if sous_arbo:
         return f'<li><details><summary><a href="{lien}" class="folder-link">{nom_affiché}</a></summary><ul>{sous_arbo}</ul></details></li>\n'
     return f'<li><a href="{lien}" class="folder-link">{nom_affiché}</a></li>\n'
 
-def generer_ligne_fichier(item: dict, lien: str) -> str:
+def generer_ligne_fichier(item: Element, lien: str) -> str:
     """Génère le HTML pour un fichier dans l'arbre TDM.
 
     Args:
-        item (dict): Élément fichier.
+        item (Element): Élément fichier.
         lien (str): URL complète du fichier.
 
     Returns:
         str: Ligne HTML <li>...</li>.
     """
-    nom_affiché = appliquer_style(item.get("nom_affiché", item["nom_document"]))
+    nom_affiché = appliquer_style(item.nom_affiche)
     return f'<li><a href="{lien}">{nom_affiché}</a></li>\n'
 
 def construire_arbo_recursif(dossier_sources: Path, prefixe_html: str = "") -> str:
@@ -215,24 +259,21 @@ def construire_arbo_recursif(dossier_sources: Path, prefixe_html: str = "") -> s
     Returns:
         str: HTML de l'arbre (<li>...</li>).
     """
-    struc = charger_structure(dossier_sources)
+    # v6.31: Éléments déjà triés par position, templates {{...}} résolus
+    struc = Dossier.charger(dossier_sources)
     html_arbre = ""
 
-    # Tri des dossiers et fichiers
-    struc["dossiers"].sort(key=lambda x: x.get("position", 9999))
-    struc["fichiers"].sort(key=lambda x: x.get("position", 9999))
-
-    for item in struc["dossiers"]:
+    for item in struc.dossiers():
         if est_visible_tdm(item):
-            nom_html = item["nom_html"]
-            lien = f"{BASE_PATH}{prefixe_html}/{nom_html}/index.html"
-            sous_arbo = construire_arbo_recursif(dossier_sources / item["nom_document"], f"{prefixe_html}/{nom_html}")
+            nom_html = item.nom_html
+            lien = f"{BASE_TDM}{prefixe_html}/{nom_html}/index.html"
+            sous_arbo = construire_arbo_recursif(dossier_sources / item.nom_document, f"{prefixe_html}/{nom_html}")
             html_arbre += generer_ligne_dossier(item, lien, sous_arbo)
 
-    for item in struc["fichiers"]:
+    for item in struc.fichiers():
         if est_visible_tdm(item):
-            nom_html = item["nom_html"]
-            lien = f"{BASE_PATH}{prefixe_html}/{nom_html}"
+            nom_html = item.nom_html
+            lien = f"{BASE_TDM}{prefixe_html}/{nom_html}"
             html_arbre += generer_ligne_fichier(item, lien)
 
     return html_arbre
@@ -297,9 +338,17 @@ def ajouter_pied(html_parts: list, config_tdm: dict, tdm_sources: Path) -> None:
     if config_tdm.get("pied_general", False):
         html_parts.append(plage_html_avec_fallback(tdm_sources, "pied_general.html", "fin", "_général"))
 
-def generer_tdm() -> None:
-    """Fonction principale : génère TDM/index.html avec structure modulaire."""
+def generer_tdm(dossier_publie: Path = None) -> None:
+    """Fonction principale : génère TDM/index.html avec structure modulaire.
+
+    Args:
+        dossier_publie (Path): Site en ligne à comparer (défaut DOSSIER_HTML) ;
+            la page n'est réécrite que si elle a changé.
+    """
+    global _cache_images
     log("=== DÉBUT GÉNÉRATION TDM ===")
+    _cache_images = Cache(dossier_cache(Path(dossier_publie or DOSSIER_HTML), lire(CONFIG, "dossier_cache", None)),
+                          images.ESPACE)
     racine_sources = Path(DOSSIER_DOCUMENTS)
     if not racine_sources.exists():
         log("ERREUR : dossier sources n'existe pas !")
@@ -321,15 +370,17 @@ def generer_tdm() -> None:
     html_parts.append(fin_html())
 
     html_brut = "".join(html_parts)
-    html_prettify = BeautifulSoup(html_brut, 'html.parser').prettify()
+    html_prettify = html.embellir(html_brut)  # v6.32: bs4 importé à la demande
 
     tdm_path = Path(DOSSIER_HTML) / "TDM"
-    tdm_path.mkdir(parents=True, exist_ok=True)
-    (tdm_path / "index.html").write_text(html_prettify, encoding="utf-8")
-    log("TDM/index.html généré avec succès")
+    ancien = Path(dossier_publie or DOSSIER_HTML) / "TDM" / "index.html"
+    if publication.ecrire_si_change(tdm_path / "index.html", html_prettify, ancien):
+        log("TDM/index.html généré avec succès")
+    else:
+        log("TDM/index.html inchangé")
     log("=== FIN GÉNÉRATION TDM ===")
 
 if __name__ == "__main__":
     generer_tdm()
 
-# fin du "cree_table_des_matieres.py" version "6.29"
+# fin du "cree_table_des_matieres.py" version "6.36"
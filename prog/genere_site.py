@@ -1,9 +1,184 @@
-# genere_site.py — Version 23.4
+# genere_site.py — Version 23.27
 
-version = ("genere_site.py", "23.4")
+version = ("genere_site.py", "23.27")
 
 """
-Générateur de site statique - Version 23.4
+Générateur de site statique - Version 23.27
+
+v23.27:
+- html.empreinte : écritures du run dans DOCUMENTS (STRUCTURE.py, PDF
+  convertis) intégrées à l'empreinte enregistrée ; toute autre
+  modification pendant le run garde l'empreinte initiale. La
+  construction suivante sans changement prend le raccourci « à jour »
+- Pré-compression par le système de fichiers actif (liens durs, écriture
+  atomique, .precompression.json réécrit seulement s'il change) et
+  avant le rapport de --dry-run, qui liste donc les .gz/.br
+- PDF web : clé de cache d'un PDF inchangé (taille, date) reprise sans
+  relecture ; seuls les PDF illisibles sont mémorisés en échec, un
+  incident d'exécution (pool, mémoire, disque) est retenté au run suivant
+- Aperçus PDF : idem (clé sans relecture, incidents non mémorisés) ;
+  sources lues par le scanner, PDF publiés par le système actif
+- Variantes d'images : idem ; le rendu des pages reprend la clé
+  mémorisée à la copie au lieu de relire chaque image
+
+v23.26:
+- copier_fichiers_site() retiré : la copie passe par les tâches
+  copy:DOSSIER du graphe
+- Empreinte des entrées calculée avant la construction (une
+  modification pendant le run n'est plus marquée à jour) ; raccourci
+  « à jour » limité à la construction complète, sans --only ni --dry-run
+- favicon.ico publié depuis la racine du dépôt ; seuls les liens vers la
+  racine du site (base, {{BASE_PATH}} ou relatifs) sont renommés par
+  empreinte ; ressources.json réécrit seulement s'il change, comme
+  chapitres.json et apercus.json
+- --only : STRUCTURE.py des ancêtres du sous-arbre réconciliés (avant
+  celui du sous-arbre), sans vérification d'empreinte
+- srcset des images d'après les variantes réellement produites (méta du
+  cache) : plus de lien vers une variante en échec ; render(D) après
+  copy(D) ; noms des variantes réservés dans la table des URL
+
+v23.25:
+- --only DOSSIER : conversion, STRUCTURE.py, pages, copie et résultats
+  dérivés limités à un sous-arbre de DOCUMENTS ; index.html des
+  ancêtres et TDM régénérés (écrits seulement s'ils changent), le reste
+  de html/ repris par liens durs. Bascule et retour arrière inchangés
+
+v23.24:
+- Système de fichiers de la construction (lib1/fs_utils.py) : disque
+  ou mémoire. Pages, copies, résultats dérivés, STRUCTURE.py et
+  bascule passent par le système actif
+- --dry-run : construction complète en mémoire (sauf conversion Word
+  et pré-compression), puis liste des fichiers nouveaux, modifiés et
+  supprimés dans HTML et des STRUCTURE.py qui seraient réécrits
+
+v23.23:
+- Cache unique des résultats dérivés (PDF optimisés, chapitres,
+  aperçus, variantes d'images, lectures HTML) : dossier configurable
+  (CONFIG "dossier_cache", défaut html.cache/), succès/productions par
+  espace en fin de run (processus du pool compris), plafond CONFIG
+  "taille_cache_max" avec éviction des entrées les moins récemment
+  utilisées. « genere_site.py cache stats » / « cache prune »
+
+v23.22:
+- Lecture HTML des DOCX (CONFIG "lecture_html") : page HTML légère
+  (titres, listes, tableaux, liens, images extraites, hébreu RTL en
+  UTF-8) publiée à côté du PDF et liée depuis index.html. Conversion
+  sans dépendance (zipfile + xml.etree) dans le pool de processus,
+  fragments gardés dans html.cache/ par empreinte du DOCX
+
+v23.21:
+- Images responsives (CONFIG "images_responsives", Pillow) : à la
+  copie, variantes jpg/png de 320, 640 et 1280 px et WebP si l'encodeur
+  est disponible, produites par le pool de processus et gardées dans
+  html.cache/ par empreinte. Les <img> des entête/pied reçoivent
+  srcset, sizes et loading="lazy" ; les images des pages index une
+  vignette à chargement différé
+
+v23.20:
+- Aperçu des PDF dans index.html (CONFIG "apercus_pdf") : nombre de
+  pages, taille et vignette de la première page chargée à la demande
+  (fitz ou pdftoppm s'ils sont installés). Tâche du pool de processus
+  après la copie ; résultats dans html.cache/ par empreinte du PDF,
+  un document inchangé n'est jamais réanalysé
+
+v23.19:
+- Découpage par chapitres (STRUCTURE : "chapitres": True sur un PDF,
+  pikepdf) : un PDF par signet de premier niveau dans
+  <nom>_chapitres/, listés sous le PDF complet dans index.html.
+  Tâche du pool de processus entre reconcile et render ; parties
+  gardées dans html.cache/ par empreinte de la source
+
+v23.18:
+- Optimisation web des PDF (CONFIG "optimisation_pdf", pikepdf) :
+  linéarisation (affichage de la page 1 avant la fin du
+  téléchargement) et recompression sans perte à la copie, dans le pool
+  de processus. Résultats dans html.cache/ par empreinte de la source :
+  chaque PDF n'est optimisé qu'une fois ; gain par fichier et total
+  dans le log
+
+v23.17:
+- Ressources statiques à nom dérivé du contenu (CONFIG
+  "ressources_empreintees") : style.css publié aussi sous
+  style.<empreinte>.css (idem favicon.ico s'il existe dans lib1/),
+  pages et entête/pied pointent vers ce nom, manifeste dans
+  ressources.json. Cache navigateur illimité possible pour ces fichiers,
+  une modification de style s'applique quand même immédiatement
+
+v23.16:
+- Pré-compression optionnelle (CONFIG "precompression") : fichier.gz
+  (et .br si brotli est installé) à côté des pages, de la TDM et de
+  style.css, pour les serveurs qui servent les fichiers pré-compressés.
+  Seules les ressources dont les octets ont changé sont recompressées
+  (empreintes dans .precompression.json) ; taux par type en fin de run
+
+v23.15:
+- Liens relatifs à la page (CONFIG "liens_relatifs") : style.css, fil
+  d'Ariane et {{BASE_PATH}} des entête/pied deviennent ../.. selon la
+  profondeur ; le même html/ se sert en local et sur GitHub Pages sans
+  reconstruction
+
+v23.14:
+- Démarrage rapide : bs4, psutil et docx2pdf/win32com importés à la
+  première utilisation
+- Construction sans objet évitée : empreinte des entrées (dates et
+  tailles de DOCUMENTS, CONFIG, programmes) mémorisée dans
+  html.empreinte ; identique au lancement → sortie immédiate
+  (--force pour reconstruire quand même)
+
+v23.13:
+- Rendu sur le modèle typé lib1/modele.py (Dossier / Element à
+  __slots__) : plus de copie de dict par élément, tri par position fait
+  une fois au chargement, noms affichés résolus à la demande
+
+v23.12:
+- normaliser_nom mémoïsée
+- Table des URL du site (chemin normalisé → source) construite après le
+  scan : deux sources qui donneraient la même URL sont signalées avant
+  toute écriture, et la construction est annulée (CONFIG
+  "arret_sur_collision", True par défaut)
+
+v23.11:
+- normaliser_nom partagé (lib1/noms_utils.py) ; appariement PDF ↔ DOCX
+  par index des radicaux normalisés du dossier, construit une fois par
+  scan ; DOCX produisant le même PDF signalés
+
+v23.10:
+- Réconciliation de STRUCTURE.py indexée par nom (plus de recherche
+  linéaire par entrée) ; un fichier ou dossier renommé garde son
+  nom_affiché et sa position (empreinte du contenu mémorisée dans
+  STRUCTURE.py) ; éléments orphelins signalés
+
+v23.9:
+- Sortie reproductible : le pied de page porte une empreinte du contenu
+  au lieu de la date (CONFIG "horodatage_pages" pour l'ancien comportement)
+- Pages écrites seulement si leurs octets changent : une construction
+  sans changement ne modifie la date d'aucun fichier de sortie
+
+v23.8:
+- html/ n'est plus supprimé au démarrage : la construction se fait dans
+  html.staging/ (lib1/publication.py), les fichiers inchangés depuis la
+  construction précédente y sont liés en dur (pas de recopie), puis
+  bascule par renommage. L'ancien site reste dans html.precedent/
+  (--rollback pour y revenir).
+
+v23.7:
+- DOCUMENTS parcouru une seule fois par lib1/scan_utils.Scanner
+  (os.scandir, dossiers frères en parallèle, au plus un stat par
+  chemin) ; plus d'iterdir/exists/is_dir répétés. Statistiques du scan
+  (durée, appels système) affichées en fin de run.
+
+v23.6:
+- Construction exprimée en graphe de tâches (lib1/taches.py) :
+  convert(dossier) → reconcile(dossier) → render(dossier),
+  copy(dossier) après convert, TDM après tous les reconcile.
+  Les tâches prêtes s'exécutent en parallèle (threads pour les E/S,
+  processus pour le rendu, un thread dédié à Word) : la copie démarre
+  pendant que les conversions lentes tournent encore.
+
+v23.5:
+- Pages index.html rendues en parallèle (pool de processus, --jobs),
+  écrites atomiquement dans l'ordre déterministe du parcours
+- --documents / --html : surcharge des dossiers de options.py
 
 Correction MAJEURE v23.4:
 - Ordre exécution corrigé :
@@ -24,30 +199,39 @@ Ensuite:
 """
 
 import os
-import shutil
-import unicodedata
+import sys
+import hashlib
+import argparse
 import tempfile
-import psutil
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
-
-# Import module conversion PDF
-try:
-    from docx2pdf import convertir_docx_vers_pdf, HAS_WIN32COM
-    DOCX2PDF_DISPONIBLE = True
-except ImportError:
-    DOCX2PDF_DISPONIBLE = False
-    HAS_WIN32COM = False
-    print("AVERTISSEMENT : docx2pdf.py non trouvé")
+from typing import List, Dict, Any, Optional, Callable
 
 # Import configuration et modules
 from lib1.options import DOSSIER_DOCUMENTS, DOSSIER_HTML, BASE_PATH
 from lib1.config import CONFIG
 from lib1 import html_utils as html
 from lib1 import structure_utils as struct
+from lib1 import reconciliation as rec
+from lib1.reconciliation import Candidat
+from lib1.modele import Dossier
 from lib1 import pdf_utils as pdf
+from lib1.taches import Tache, Ordonnanceur
+from lib1.scan_utils import Scanner
+from lib1 import publication
+from lib1 import precompression
+from lib1 import ressources
+from lib1 import pdf_web
+from lib1 import pdf_chapitres
+from lib1 import pdf_apercu
+from lib1 import images
+from lib1 import docx_html
+from lib1 import cache_utils
+from lib1 import fs_utils
+from lib1.cache_utils import Cache, dossier_cache
+from lib1.noms_utils import normaliser_nom, normaliser_chemin, TableURL
 
 print(f"[Version] {version[0]} — {version[1]}")
 
@@ -63,12 +247,75 @@ DOSSIER_TDM = CONFIG.get("dossier_tdm", "TDM")
 AJOUT_AFFICHAGE = CONFIG.get("ajout_affichage", ["", "", "", ""])
 VOIR_STRUCTURE = CONFIG.get("voir_structure", False)
 LIEN_SOULIGNÉ = CONFIG.get("lien_souligné_index", False)
+HORODATAGE_PAGES = CONFIG.get("horodatage_pages", False)
+LIENS_RELATIFS = CONFIG.get("liens_relatifs", False)
+LARGEUR_SCAN = CONFIG.get("largeur_scan", 8)
+ARRET_SUR_COLLISION = CONFIG.get("arret_sur_collision", True)
+PRECOMPRESSION = CONFIG.get("precompression", False)
+RESSOURCES_EMPREINTEES = CONFIG.get("ressources_empreintees", True)
+OPTIMISATION_PDF = CONFIG.get("optimisation_pdf", False)
+APERCUS_PDF = CONFIG.get("apercus_pdf", True)
+IMAGES_RESPONSIVES = CONFIG.get("images_responsives", True)
+LECTURE_HTML = CONFIG.get("lecture_html", False)
+DOSSIER_CACHE = CONFIG.get("dossier_cache")
+TAILLE_CACHE_MAX = CONFIG.get("taille_cache_max", 2048)  # Mo, 0 = sans limite
+
+# Scanner du processus courant (chaque processus du pool a le sien)
+_scanner = None
+
+# (fonction de conversion, HAS_WIN32COM), chargé au premier DOCX rencontré
+_convertisseur = None
+# v23.18: pdf_web.OptimiseurPDF du run en cours (None : PDF copiés tels quels)
+_optimiseur = None
+# v23.21: images.VariantesImages du run en cours (None : images seules)
+_variantes = None
+# v23.22: docx_html.LecteurDOCX du run en cours (None : pas de lecture HTML)
+_lecteur = None
+# v23.27: Fichiers de DOCUMENTS écrits par le run en cours (STRUCTURE.py, PDF)
+_ecrits_documents = set()
 
 log_file = Path("generation.log")
-log_file.write_text(
-    f"--- GÉNÉRATION v{version[1]} — {datetime.now().strftime('%d/%m/%Y %H:%M:%S')} ---\n",
-    encoding="utf-8"
-)
+
+def initialiser_log() -> None:
+    """Réinitialise le fichier log (processus principal uniquement).
+    
+    v23.5: N'est plus fait à l'import, sinon chaque processus du pool
+    de rendu vidait le log.
+    """
+    log_file.write_text(
+        f"--- GÉNÉRATION v{version[1]} — {datetime.now().strftime('%d/%m/%Y %H:%M:%S')} ---\n",
+        encoding="utf-8"
+    )
+
+# Site en ligne (construction précédente) : source des liens durs
+DOSSIER_PUBLIE = DOSSIER_HTML
+
+def configurer_chemins(documents: str, html_dir: str, publie: str = None) -> None:
+    """Remplace les dossiers DOCUMENTS / HTML de options.py.
+    
+    Sert aussi d'initialiseur des processus du pool de rendu.
+    
+    Args:
+        documents: Dossier source
+        html_dir: Dossier où la construction écrit (html.staging/)
+        publie: Site en ligne dont on réutilise les fichiers (défaut html_dir)
+    """
+    global DOSSIER_DOCUMENTS, DOSSIER_HTML, DOSSIER_PUBLIE, _scanner
+    DOSSIER_DOCUMENTS = documents
+    DOSSIER_HTML = html_dir
+    DOSSIER_PUBLIE = publie or html_dir
+    _scanner = None
+
+def racine_cache() -> Path:
+    """Dossier du cache des résultats dérivés (défaut : html.cache/)."""
+    return dossier_cache(DOSSIER_PUBLIE, DOSSIER_CACHE)
+
+def scanner() -> Scanner:
+    """Scanner de DOCUMENTS du processus (créé à la demande, sans pré-scan)."""
+    global _scanner
+    if _scanner is None:
+        _scanner = Scanner(Path(DOSSIER_DOCUMENTS), IGNORER, LARGEUR_SCAN)
+    return _scanner
 
 # ============================================================================
 # UTILITAIRES
@@ -80,16 +327,28 @@ def log(msg: str) -> None:
     with open(log_file, "a", encoding="utf-8") as f:
         f.write(msg + "\n")
 
-def normaliser_nom(nom: str) -> str:
-    """Normalise nom pour URL."""
-    nom = unicodedata.normalize('NFD', nom)
-    nom = ''.join(c for c in nom if unicodedata.category(c) != 'Mn')
-    nom = nom.replace("'", "_").replace("'", "_")
-    nom = nom.replace(" ", "_")
-    return nom.lower()
+def convertisseur() -> tuple:
+    """Module de conversion DOCX→PDF, importé à la première utilisation.
+    
+    v23.14: docx2pdf (et win32com) ne sont plus chargés au démarrage :
+    un site sans DOCX à convertir ne paie pas leur import.
+    
+    Returns:
+        (convertir_docx_vers_pdf ou None, HAS_WIN32COM)
+    """
+    global _convertisseur
+    if _convertisseur is None:
+        try:
+            from docx2pdf import convertir_docx_vers_pdf, HAS_WIN32COM
+            _convertisseur = (convertir_docx_vers_pdf, HAS_WIN32COM)
+        except ImportError:
+            print("AVERTISSEMENT : docx2pdf.py non trouvé")
+            _convertisseur = (None, False)
+    return _convertisseur
 
 def get_word_processes() -> List[Any]:
     """Retourne processus Word actifs."""
+    import psutil
     return [
         proc for proc in psutil.process_iter(['pid', 'name'])
         if proc.info['name'] and proc.info['name'].upper() == 'WINWORD.EXE'
@@ -110,67 +369,76 @@ def kill_word_processes(processes: List[Any]) -> None:
     print(" !")
 
 def fichier_docx_existe(fichier_pdf: Path, dossier: Path) -> bool:
-    """Vérifie si DOCX correspondant au PDF existe."""
-    stem = fichier_pdf.stem
-    
-    for f in dossier.iterdir():
-        if f.suffix.lower() in ['.doc', '.docx']:
-            docx_stem_norm = normaliser_nom(f.stem)
-            pdf_stem_norm = normaliser_nom(stem)
-            
-            if docx_stem_norm == pdf_stem_norm:
-                return True
+    """Vérifie si DOCX correspondant au PDF existe.
     
-    return False
+    v23.11: Recherche dans l'index des noms du dossier (lib1/noms_utils)
+    """
+    return scanner().index_noms(dossier).a_source_docx(fichier_pdf.name)
 
 # ============================================================================
 # TEMPLATES ET NAVIGATION
 # ============================================================================
 
 def charger_fichier_html_avec_fallback(dossier: Path, fichier: str, 
-                                       position: str = "", commun: str = "") -> str:
-    """Charge fichier HTML avec templates {{BASE_PATH}} interprétés."""
-    local = dossier / fichier
-    
-    if local.exists():
-        return html.charger_template_html(
-            local,
-            {"BASE_PATH": BASE_PATH},
-            VOIR_STRUCTURE,
-            position,
-            commun
-        )
+                                       position: str = "", commun: str = "",
+                                       base: str = BASE_PATH) -> str:
+    """Charge fichier HTML avec templates {{BASE_PATH}} interprétés.
     
-    if fichier in ("entete_general.html", "pied_general.html"):
-        racine = Path(DOSSIER_DOCUMENTS) / fichier
-        if racine.exists():
-            return html.charger_template_html(
-                racine,
-                {"BASE_PATH": BASE_PATH},
-                VOIR_STRUCTURE,
-                position,
-                commun
-            )
+    v23.15: base = préfixe de la page qui inclut le fichier (relatif
+    en mode liens_relatifs : un même pied_general.html sert à toutes
+    les profondeurs). Les liens écrits en dur avec BASE_PATH sont
+    relativisés aussi.
+    """
+    modele = dossier / fichier
     
-    return ""
+    if not scanner().existe(modele):
+        if fichier not in ("entete_general.html", "pied_general.html"):
+            return ""
+        modele = Path(DOSSIER_DOCUMENTS) / fichier
+        if not scanner().existe(modele):
+            return ""
+    
+    contenu = html.charger_template_html(
+        modele,
+        {"BASE_PATH": base},
+        VOIR_STRUCTURE,
+        position,
+        commun
+    )
+    if LIENS_RELATIFS:
+        contenu = html.relativiser_liens(contenu, BASE_PATH, base)
+    # v23.21: <img> du site en srcset à chargement différé
+    if IMAGES_RESPONSIVES:
+        contenu = images.enrichir_images(contenu, base, trouver_image, variantes_produites)
+    # v23.17: {{BASE_PATH}}/style.css → nom empreinté
+    return ressources.reecrire_references(contenu, ressources.manifeste(RESSOURCES_EMPREINTEES), base)
+
+def trouver_image(chemin_site: str) -> Optional[Path]:
+    """Image source d'un chemin relatif à la racine du site ("ig/potier.png").
+    
+    Les noms publiés sont normalisés : retrouvé directement si la source
+    porte déjà un nom d'URL, sinon par le nom normalisé dans le dossier.
+    """
+    source = Path(DOSSIER_DOCUMENTS) / chemin_site
+    if scanner().existe(source):
+        return source
+    for nom in scanner().index_noms(source.parent).variantes(source.name):
+        if normaliser_nom(nom) == source.name:
+            return source.parent / nom
+    return None
+
+def variantes_produites(source: Path) -> List[str]:
+    """Suffixes des variantes de source produites (méta du cache images)."""
+    return images.produites(Cache(racine_cache(), images.ESPACE), source)
 
 def trouver_nom_navigation(parent_dossier: Path, nom_dossier: str) -> str:
     """Retourne nom_navigation depuis STRUCTURE.py parent."""
-    structure = struct.charger_structure(parent_dossier)
-    
-    for item in structure.get("dossiers", []):
-        if item["nom_document"] == nom_dossier:
-            variables = {
-                "nom_document": item["nom_document"],
-                "titre_dossier": structure.get("titre_dossier", "")
-            }
-            resolved = struct.resoudre_templates_runtime(item, variables)
-            return resolved.get("nom_navigation", nom_dossier)
-    
-    return nom_dossier
+    element = Dossier.charger(parent_dossier).element(nom_dossier, "dossier")
+    return element.nom_navigation if element else nom_dossier
 
-def generer_navigation_ariane(chemin_relatif: List[str], dossier_documents: Path) -> str:
-    """Génère navigation fil d'Ariane."""
+def generer_navigation_ariane(chemin_relatif: List[str], dossier_documents: Path,
+                              base: str = BASE_PATH) -> str:
+    """Génère navigation fil d'Ariane (liens préfixés par base)."""
     if len(chemin_relatif) <= 1:
         return ""
     
@@ -182,7 +450,7 @@ def generer_navigation_ariane(chemin_relatif: List[str], dossier_documents: Path
         nom_nav = trouver_nom_navigation(current_parent, nom_dossier)
         
         lien_parts = [normaliser_nom(p) for p in chemin_relatif[:i+1]]
-        lien = BASE_PATH + "/" + "/".join(lien_parts)
+        lien = base + "/" + "/".join(lien_parts)
         
         nom_nav_html = html.appliquer_mini_markdown(nom_nav)
         
@@ -210,29 +478,90 @@ def generer_pdf_manquants(dossier: Path) -> None:
     v23.4: Cette fonction est appelée AVANT mise à jour STRUCTURE.py
     pour que les PDF soient présents lors du scan.
     """
-    if not DOCX2PDF_DISPONIBLE:
+    convertir, _ = convertisseur()
+    if convertir is None:
         return
     
-    fichiers = list(dossier.iterdir())
+    fichiers = [e.chemin for e in scanner().lister(dossier)]
     log(f"Vérification PDF manquants : {dossier}")
     
     nb_conv = pdf.traiter_conversions_dossier(
         dossier,
         fichiers,
         normaliser_nom,
-        convertir_docx_vers_pdf,
+        convertir,
         CONFIG,
         log
     )
     
     if nb_conv > 0:
         log(f"{nb_conv} PDF généré(s)")
+        scanner().rescanner(dossier)
+        _ecrits_documents.update(
+            e.chemin for e in scanner().lister(dossier)
+            if e.est_fichier and e.suffixe.lower() == ".pdf" and fichier_docx_existe(e.chemin, dossier)
+        )
+
+def candidats_dossier(dossier: Path) -> List[Candidat]:
+    """Entrées d'un dossier qui doivent figurer dans STRUCTURE.py.
+    
+    v23.10: Règles de v23.4 inchangées (DOCX → nom_html du PDF, PDF
+    dérivé d'un DOCX ignoré), chaque entrée décrite une seule fois.
+    """
+    candidats = []
+    
+    for radical, sources in scanner().index_noms(dossier).doublons().items():
+        log(f"  ⚠ {' / '.join(sources)} : même PDF {radical}.pdf (une conversion écrase l'autre)")
+    
+    for entry in scanner().lister(dossier):
+        if entry.nom in IGNORER or entry.nom in FICHIERS_ENTETE_PIED:
+            continue
+        
+        if entry.est_fichier and entry.suffixe.lower() == ".py":
+            continue
+        
+        # Dossiers : empreinte = noms de leur contenu
+        if entry.est_dossier:
+            noms = [e.nom for e in scanner().lister(entry.chemin) if e.nom not in IGNORER]
+            candidats.append(Candidat(
+                entry.nom, "dossiers", normaliser_nom(entry.nom), entry.mtime,
+                lambda noms=noms: rec.empreinte_dossier(noms)
+            ))
+            continue
+        
+        if not entry.est_fichier:
+            continue
+        
+        ext = entry.suffixe.lower().lstrip(".")
+        
+        # v23.4: DOCX référencé sous le nom HTML du PDF correspondant
+        if ext in ("doc", "docx"):
+            nom_html = normaliser_nom(entry.stem + ".pdf")
+        # v23.4: Ignorer PDF si DOCX existe
+        elif ext == "pdf" and fichier_docx_existe(entry.chemin, dossier):
+            log(f"  PDF ignoré : {entry.nom} (dérivé de DOCX)")
+            continue
+        elif ext in EXTENSIONS_ACCEPTEES:
+            nom_html = normaliser_nom(entry.nom)
+        else:
+            continue
+        
+        candidats.append(Candidat(
+            entry.nom, "fichiers", nom_html, entry.mtime,
+            lambda chemin=entry.chemin: rec.empreinte_fichier(chemin)
+        ))
+    
+    return candidats
 
 def mettre_a_jour_structure(dossier: Path) -> Dict[str, Any]:
     """Met à jour STRUCTURE.py d'un dossier.
     
     v23.4: Appelé APRÈS génération PDF, scanne les fichiers
     réellement présents dans DOCUMENTS.
+    
+    v23.10: Réconciliation en une passe (lib1/reconciliation.py) :
+    renommages détectés par empreinte du contenu (personnalisations
+    conservées), orphelins signalés, écriture seulement si changement.
     """
     log(f"Mise à jour STRUCTURE.py : {dossier}")
     
@@ -244,86 +573,17 @@ def mettre_a_jour_structure(dossier: Path) -> Dict[str, Any]:
         CONFIG.get("titre_site", "Site")
     )
     
-    # Scanner nouveaux éléments
-    modified = False
-    position_suivante = struct.calculer_position_suivante(structure)
+    # Empreintes des entrées modifiées après la dernière écriture recalculées
+    entree_structure = scanner().entree(dossier / "STRUCTURE.py")
+    reference = entree_structure.mtime if entree_structure else 0.0
     
-    entries = sorted(list(dossier.iterdir()), key=lambda x: x.name.lower())
+    rapport = rec.reconcilier(structure, candidats_dossier(dossier), reference, log)
     
-    for entry in entries:
-        if entry.name in IGNORER or entry.name in FICHIERS_ENTETE_PIED:
-            continue
-        
-        if entry.is_file() and entry.suffix.lower() == ".py":
-            continue
-        
-        # Dossiers
-        if entry.is_dir():
-            if not struct.element_existe(structure, entry.name, "dossiers"):
-                struct.ajouter_element_structure(
-                    structure,
-                    entry.name,
-                    normaliser_nom(entry.name),
-                    "dossiers",
-                    position_suivante,
-                    log
-                )
-                position_suivante += 1
-                modified = True
-        
-        # Fichiers
-        elif entry.is_file():
-            ext = entry.suffix.lower().lstrip(".")
-            
-            # v23.4: Traiter DOCX spécialement
-            if ext in ("doc", "docx"):
-                # Vérifier si déjà dans STRUCTURE
-                if not struct.element_existe(structure, entry.name, "fichiers"):
-                    # Ajouter avec nom_html = PDF correspondant
-                    nom_pdf_normalise = normaliser_nom(entry.stem + ".pdf")
-                    
-                    element = {
-                        "nom_document": entry.name,
-                        "nom_html": nom_pdf_normalise,
-                        "nom_affiché": "{{nom_document_sans_ext}}",
-                        "nom_TDM": "{{nom_document_sans_ext}}",
-                        "ajout_affichage": True,
-                        "affiché_index": True,
-                        "affiché_TDM": True,
-                        "position": position_suivante
-                    }
-                    
-                    structure.setdefault("fichiers", []).append(element)
-                    position_suivante += 1
-                    modified = True
-                    log(f"  Ajouté DOCX : {entry.name} → {nom_pdf_normalise}")
-                
-                continue  # Ne pas traiter dans EXTENSIONS_ACCEPTEES
-            
-            # v23.4: Ignorer PDF si DOCX existe
-            if ext == "pdf":
-                if fichier_docx_existe(entry, dossier):
-                    log(f"  PDF ignoré : {entry.name} (dérivé de DOCX)")
-                    continue
-            
-            if ext in EXTENSIONS_ACCEPTEES:
-                if not struct.element_existe(structure, entry.name, "fichiers"):
-                    struct.ajouter_element_structure(
-                        structure,
-                        entry.name,
-                        normaliser_nom(entry.name),
-                        "fichiers",
-                        position_suivante,
-                        log
-                    )
-                    position_suivante += 1
-                    modified = True
-                    log(f"  Ajouté : {entry.name}")
-    
-    # Sauvegarder si modifié
-    if modified:
-        struct.sauvegarder_structure(dossier, structure)
-        log(f"✓ STRUCTURE.py mis à jour")
+    # Sauvegarder si modifié (et seulement si le contenu du fichier change)
+    if rapport.modifie and struct.sauvegarder_structure(dossier, structure):
+        _ecrits_documents.add(dossier / "STRUCTURE.py")
+        log(f"✓ STRUCTURE.py mis à jour ({len(rapport.ajoutes)} ajouté(s), "
+            f"{len(rapport.renommes)} renommé(s), {len(rapport.orphelins)} orphelin(s))")
     else:
         log(f"✓ STRUCTURE.py inchangé")
     
@@ -333,203 +593,909 @@ def mettre_a_jour_structure(dossier: Path) -> Dict[str, Any]:
 # GÉNÉRATION PAGES HTML
 # ============================================================================
 
-def generer_page_index(dossier_documents: Path) -> None:
-    """Génère index.html pour un dossier.
+def rendre_page_index(dossier_documents: Path) -> tuple:
+    """Rend index.html d'un dossier sans l'écrire.
     
     v23.4: Assume que STRUCTURE.py est déjà à jour.
+    v23.5: Fonction pure (exécutable dans un processus du pool).
+    
+    Returns:
+        (chemin cible de index.html, HTML final)
     """
     log(f"Génération index.html : {dossier_documents}")
     
-    # Charger structure (déjà à jour)
-    structure = struct.charger_structure(dossier_documents)
+    # Charger structure (déjà à jour) : éléments triés, noms résolus à la lecture
+    modele = Dossier.charger(dossier_documents)
     
     rel_path = dossier_documents.relative_to(DOSSIER_DOCUMENTS)
     
-    # Préparer éléments
-    elements = []
-    
-    for item in structure.get("dossiers", []):
-        variables = {
-            "nom_document": item["nom_document"],
-            "titre_dossier": structure.get("titre_dossier", "")
-        }
-        resolved = struct.resoudre_templates_runtime(item, variables)
-        resolved["genre"] = "dossier"
-        elements.append(resolved)
-    
-    for item in structure.get("fichiers", []):
-        variables = {
-            "nom_document": item["nom_document"],
-            "titre_dossier": structure.get("titre_dossier", "")
-        }
-        resolved = struct.resoudre_templates_runtime(item, variables)
-        resolved["genre"] = "fichier"
-        elements.append(resolved)
-    
-    elements.sort(key=lambda x: x.get("position", 9999))
-    elements = struct.filtrer_elements_existants(dossier_documents, elements, log)
+    elements = modele.existants(scanner().existe, log)
+    
+    # v23.15: Préfixe des liens vers la racine du site (absolu ou relatif à la page)
+    base = html.chemin_base(len(rel_path.parts), BASE_PATH, LIENS_RELATIFS)
     
     # Assemblage HTML
     html_parts = []
     
-    titre = structure.get("titre_dossier", dossier_documents.name)
-    html_parts.append(html.generer_debut_html(titre, BASE_PATH))
+    titre = modele.get("titre_dossier", dossier_documents.name)
+    html_parts.append(html.generer_debut_html(titre, base, ressources.manifeste(RESSOURCES_EMPREINTEES)))
     
-    if structure.get("haut_page", False):
+    if modele.get("haut_page", False):
         contenu = "".join(CONFIG.get("haut_page", []))
         if contenu:
             html_parts.append(contenu)
     
-    if structure.get("entete_general", False):
+    if modele.get("entete_general", False):
         html_parts.append(
-            charger_fichier_html_avec_fallback(dossier_documents, "entete_general.html", "début", "_général")
+            charger_fichier_html_avec_fallback(dossier_documents, "entete_general.html", "début", "_général", base)
         )
     
-    if structure.get("navigation", False):
-        nav = generer_navigation_ariane(list(rel_path.parts), Path(DOSSIER_DOCUMENTS))
+    if modele.get("navigation", False):
+        nav = generer_navigation_ariane(list(rel_path.parts), Path(DOSSIER_DOCUMENTS), base)
         if nav:
             html_parts.append(nav)
     
-    if structure.get("entete", False):
+    if modele.get("entete", False):
         html_parts.append(
-            charger_fichier_html_avec_fallback(dossier_documents, "entete.html", "début", "")
+            charger_fichier_html_avec_fallback(dossier_documents, "entete.html", "début", "", base)
         )
     
-    titre_table = structure.get("titre_table", "{{titre_dossier}}")
+    titre_table = modele.get("titre_table", "{{titre_dossier}}")
     if "{{" in titre_table:
         titre_table = titre_table.replace("{{titre_dossier}}", titre)
     
     if titre_table:
         html_parts.append(html.generer_titre_table(titre_table))
     
+    # v23.19: Chapitres des PDF découpés (placés par decouper_chapitres_dossier)
+    cible_html = Path(DOSSIER_HTML) / normaliser_chemin(rel_path)
+    chapitres = {}
+    for e in elements:
+        if e.chapitres:
+            sous_dossier = pdf_chapitres.dossier_chapitres(e.nom_html)
+            chapitres[e.nom_html] = [
+                (c["titre"], f"{sous_dossier}/{c['fichier']}")
+                for c in pdf_chapitres.lire_manifeste(cible_html / sous_dossier)
+            ]
+    
+    # v23.20: Pages, taille et vignette des PDF (placés par apercus_dossier)
+    apercus = pdf_apercu.lire_manifeste(cible_html)
+    
+    # v23.21: Vignette des images (variantes produites à la copie)
+    vignettes = {}
+    if IMAGES_RESPONSIVES and images.disponible():
+        for e in elements:
+            if os.path.splitext(e.nom_html)[1] in images.EXTENSIONS:
+                source = dossier_documents / e.nom_document
+                taille = images.dimensions(source)
+                if taille:
+                    vignettes[e.nom_html] = images.balise_img(
+                        e.nom_html, *taille, 'class="vignette" alt=""', "8em",
+                        variantes_produites(source)
+                    )
+    
+    # v23.22: Lien vers la page de lecture HTML des DOCX
+    lectures = {}
+    if LECTURE_HTML:
+        lectures = {e.nom_html: nom_lecture(e.nom_document) for e in elements
+                    if e.nom_document.lower().endswith(".docx")}
+    
     html_parts.append(
-        html.generer_table_index(elements, AJOUT_AFFICHAGE, LIEN_SOULIGNÉ)
+        html.generer_table_index(elements, AJOUT_AFFICHAGE, LIEN_SOULIGNÉ, chapitres,
+                                 apercus, pdf_apercu.DOSSIER_VIGNETTES, vignettes, lectures)
     )
     
-    if structure.get("pied", False):
+    if modele.get("pied", False):
         html_parts.append(
-            charger_fichier_html_avec_fallback(dossier_documents, "pied.html", "fin", "")
+            charger_fichier_html_avec_fallback(dossier_documents, "pied.html", "fin", "", base)
         )
     
-    if structure.get("pied_general", False):
+    if modele.get("pied_general", False):
         html_parts.append(
-            charger_fichier_html_avec_fallback(dossier_documents, "pied_general.html", "fin", "_général")
+            charger_fichier_html_avec_fallback(dossier_documents, "pied_general.html", "fin", "_général", base)
         )
     
-    if structure.get("bas_page", False):
+    if modele.get("bas_page", False):
         contenu = "".join(CONFIG.get("bas_page", []))
         if contenu:
             html_parts.append(contenu)
     
-    html_parts.append(html.generer_fin_html(version[1]))
+    # v23.9: Empreinte du contenu (déterministe) plutôt que la date
+    empreinte = ""
+    if not HORODATAGE_PAGES:
+        empreinte = hashlib.sha256("".join(html_parts).encode("utf-8")).hexdigest()[:12]
+    html_parts.append(html.generer_fin_html(version[1], empreinte))
     
     # Sauvegarde dans HTML
     html_brut = "".join(html_parts)
-    html_final = BeautifulSoup(html_brut, 'html.parser').prettify()
+    html_final = html.embellir(html_brut)
     
-    cible_rel_norm = Path(*(normaliser_nom(part) for part in rel_path.parts))
+    cible_rel_norm = normaliser_chemin(rel_path)
     cible = Path(DOSSIER_HTML) / cible_rel_norm
-    cible.mkdir(parents=True, exist_ok=True)
     
-    (cible / "index.html").write_text(html_final, encoding="utf-8")
+    return cible / "index.html", html_final
+
+def ecrire_page_index(cible: Path, html_final: str) -> None:
+    """Écrit une page rendue si elle diffère de la version en ligne."""
+    ancien = Path(DOSSIER_PUBLIE) / cible.relative_to(DOSSIER_HTML)
+    publication.ecrire_si_change(cible, html_final, ancien)
+
+def generer_page_index(dossier_documents: Path) -> None:
+    """Génère et écrit index.html pour un dossier."""
+    cible, html_final = rendre_page_index(dossier_documents)
+    ecrire_page_index(cible, html_final)
     log(f"✓ index.html généré")
 
+def generer_pages_index(dossiers: List[Path], jobs: int = 1) -> None:
+    """Génère les index.html de tous les dossiers.
+    
+    v23.5: Rendu réparti sur `jobs` processus. Les pages reviennent dans
+    l'ordre de `dossiers` (pool.map) et sont écrites atomiquement par le
+    processus principal : sortie identique au mode séquentiel.
+    """
+    if jobs <= 1 or len(dossiers) < 2:
+        for dossier in dossiers:
+            generer_page_index(dossier)
+        return
+    
+    chunksize = max(1, len(dossiers) // (jobs * 8))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=configurer_chemins,
+        initargs=(DOSSIER_DOCUMENTS, DOSSIER_HTML)
+    ) as pool:
+        for cible, html_final in pool.map(rendre_page_index, dossiers, chunksize=chunksize):
+            ecrire_page_index(cible, html_final)
+    
+    log(f"✓ {len(dossiers)} index.html générés ({jobs} processus)")
+
+
 # ============================================================================
 # COPIE FICHIERS
 # ============================================================================
 
-def copier_fichiers_site() -> None:
-    """Copie fichiers DOCUMENTS → HTML.
+def copier_fichiers_dossier(racine: Path, files: List[str]) -> int:
+    """Copie les fichiers copiables d'un dossier DOCUMENTS → HTML.
     
-    v23.4: Appelé EN DERNIER, après génération PDF et index.html.
+    Returns:
+        Nombre de fichiers copiés
     """
-    log("Copie fichiers vers HTML")
+    rel_path = racine.relative_to(DOSSIER_DOCUMENTS)
+    cible_rel_norm = normaliser_chemin(rel_path)
+    cible = Path(DOSSIER_HTML) / cible_rel_norm
+    fs_utils.actif().creer_dossier(cible)
+    ancienne_cible = Path(DOSSIER_PUBLIE) / cible_rel_norm
+    
+    nb = 0
+    for fichier in files:
+        src_file = racine / fichier
+        if _lecteur and src_file.suffix.lower() == ".docx" and not fichier.startswith("~$"):
+            publier_lecture(src_file, cible, ancienne_cible, len(cible_rel_norm.parts))
+        if pdf.est_fichier_copiable(src_file, EXTENSIONS_COPIABLES):
+            nom = normaliser_nom(fichier)
+            dst_file = cible / nom
+            if _optimiseur and src_file.suffix.lower() == ".pdf" and _optimiseur.placer(src_file, dst_file):
+                nb += 1
+                continue
+            if not publication.lier_ou_copier(src_file, dst_file, ancienne_cible / nom):
+                print(f"Range {dst_file}" )
+            if _variantes and variantes_actives(nom):
+                _variantes.placer(src_file, dst_file)
+            nb += 1
+    return nb
+
+def nom_lecture(nom_docx: str) -> str:
+    """Lecon 1.docx → lecon_1.html (page de lecture publiée à côté du PDF)."""
+    return normaliser_nom(os.path.splitext(nom_docx)[0] + ".html")
+
+def page_lecture(titre: str, contenu: str, base: str, nom_pdf: str) -> str:
+    """Page de lecture d'un DOCX : style du site, retour au dossier, lien PDF."""
+    nav = (f'<nav class="navigation"><div class="gauche"><a href="index.html" class="monbouton">Retour</a></div>'
+           f'<div class="droite"><a href="{nom_pdf}" class="monbouton">PDF</a></div></nav>')
+    corps = f'{nav}<article class="lecture">{contenu}</article>'
+    empreinte = "" if HORODATAGE_PAGES else hashlib.sha256(corps.encode("utf-8")).hexdigest()[:12]
+    return (html.generer_debut_html(titre, base, ressources.manifeste(RESSOURCES_EMPREINTEES))
+            + corps + html.generer_fin_html(version[1], empreinte))
+
+def publier_lecture(src_docx: Path, cible: Path, ancienne_cible: Path, profondeur: int) -> None:
+    """Écrit la page de lecture HTML d'un DOCX et ses images.
+    
+    v23.22: Fragment converti une fois par contenu (cache), page
+    assemblée ici (style, liens) et écrite seulement si elle change.
+    Conversion impossible : page qui renvoie vers le PDF (le lien de
+    l'index reste valide).
+    """
+    nom = nom_lecture(src_docx.name)
+    nom_pdf = normaliser_nom(src_docx.stem + ".pdf")
+    base = html.chemin_base(profondeur, BASE_PATH, LIENS_RELATIFS)
+    rendu = _lecteur.fragment(src_docx)
+    if rendu is None:
+        titre, contenu = src_docx.stem, f'<p>Version HTML indisponible : <a href="{nom_pdf}">lire le PDF</a>.</p>'
+    else:
+        dossier_images = os.path.splitext(nom)[0] + docx_html.SUFFIXE_IMAGES
+        docx_html.placer_images(rendu["images"], cible / dossier_images)
+        titre = rendu["titre"] or src_docx.stem
+        contenu = rendu["html"].replace(docx_html.JETON_IMAGES, dossier_images)
+    publication.ecrire_si_change(cible / nom, page_lecture(titre, contenu, base, nom_pdf), ancienne_cible / nom)
+
+def copier_dossier(racine: Path) -> int:
+    """Copie un dossier d'après la liste du scanner (à jour après conversion)."""
+    files = [e.nom for e in scanner().lister(racine) if e.est_fichier]
+    return copier_fichiers_dossier(racine, files)
+
+# ============================================================================
+# CHAPITRES
+# ============================================================================
+
+def source_pdf(dossier: Path, element) -> Path:
+    """PDF d'un élément : le fichier lui-même, ou la conversion d'un DOCX."""
+    if element.nom_document.lower().endswith(".pdf"):
+        return dossier / element.nom_document
+    return dossier / element.nom_html
+
+def a_decouper(dossier: Path) -> bool:
+    """True si un PDF du dossier est marqué "chapitres" dans STRUCTURE.py."""
+    return any(e.chapitres for e in Dossier.charger(dossier).fichiers())
+
+def decouper_chapitres_dossier(dossier: Path) -> int:
+    """Découpe les PDF marqués "chapitres" et place les parties dans HTML.
     
-    for racine, dirs, files in os.walk(DOSSIER_DOCUMENTS):
-        dirs[:] = [d for d in dirs if d not in IGNORER]
+    v23.19: Exécuté dans un processus du pool, après reconcile (STRUCTURE
+    à jour, PDF convertis) et avant render (qui lit chapitres.json).
+    
+    Returns:
+        Relevé du cache de ce processus (v23.23, fusionné par le principal)
+    """
+    cache = Cache(racine_cache(), pdf_chapitres.ESPACE)
+    rel = normaliser_chemin(dossier.relative_to(DOSSIER_DOCUMENTS))
+    cible, ancienne_cible = Path(DOSSIER_HTML) / rel, Path(DOSSIER_PUBLIE) / rel
+    for element in Dossier.charger(dossier).fichiers():
+        if not element.chapitres:
+            continue
+        source = source_pdf(dossier, element)
+        if not source.is_file():
+            log(f"Chapitres : {source.name} introuvable")
+            continue
+        try:
+            cle, chapitres = pdf_chapitres.decouper(source, cache)
+        except Exception as e:
+            log(f"✗ Découpage impossible : {source.name} — {e}")
+            continue
+        if not chapitres:
+            log(f"Chapitres : {source.name} a moins de deux signets de premier niveau")
+            continue
+        sous_dossier = pdf_chapitres.dossier_chapitres(element.nom_html)
+        pdf_chapitres.placer(cache, cle, chapitres, cible / sous_dossier, ancienne_cible / sous_dossier)
+        log(f"✓ {source.name} : {len(chapitres)} chapitres")
+    return cache_utils.releve()
+
+def a_apercevoir(dossier: Path) -> bool:
+    """True si le dossier contient des PDF (ou des DOCX qui en produisent)."""
+    return any(
+        e.est_fichier and e.suffixe.lower() in (".pdf", ".doc", ".docx")
+        for e in scanner().lister(dossier)
+    )
+
+def apercus_dossier(dossier: Path) -> int:
+    """Aperçus (pages, taille, vignette) des PDF du dossier, placés dans HTML.
+    
+    v23.20: Exécuté dans un processus du pool, après copy(D) : la taille
+    affichée est celle du fichier publié (PDF optimisé compris).
+    
+    Returns:
+        Relevé du cache de ce processus (v23.23, fusionné par le principal)
+    """
+    cache = Cache(racine_cache(), pdf_apercu.ESPACE)
+    moteur = pdf_apercu.moteur_vignettes()
+    rel = normaliser_chemin(dossier.relative_to(DOSSIER_DOCUMENTS))
+    cible = Path(DOSSIER_HTML) / rel
+    fs = fs_utils.actif()
+    apercus = {}
+    for element in Dossier.charger(dossier).fichiers():
+        if not element.nom_html.lower().endswith(".pdf"):
+            continue
+        source = source_pdf(dossier, element)
+        # v23.27: Liste et stat du scanner ; clé d'un PDF inchangé sans relecture
+        entree = scanner().entree(source)
+        if entree is None or not entree.est_fichier:
+            continue
+        apercu = pdf_apercu.analyser(source, cache, moteur, entree.stat())
+        if apercu.get("echec"):
+            log(f"✗ Aperçu incomplet : {source.name} — {apercu['echec']}")
+        publie = cible / element.nom_html
+        apercu["octets"] = fs.stat(publie).st_size if fs.existe(publie) else entree.taille
+        apercus[element.nom_html] = apercu
+    pdf_apercu.placer(cache, apercus, cible, Path(DOSSIER_PUBLIE) / rel)
+    return cache_utils.releve()
+
+def construire_table_url() -> TableURL:
+    """Réserve toutes les sorties du site avant écriture.
+    
+    v23.12: dossiers (index.html), fichiers copiés, et PDF que produira
+    chaque DOCX (même source que le PDF déjà converti s'il existe).
+    v23.26: et variantes des images copiées.
+    """
+    table = TableURL()
+    for dossier in scanner().dossiers():
+        rel_path = dossier.relative_to(DOSSIER_DOCUMENTS)
+        cible = normaliser_chemin(rel_path)
+        table.enregistrer(cible, dossier)
+        for entry in scanner().lister(dossier):
+            if not entry.est_fichier:
+                continue
+            if entry.suffixe.lower() in (".doc", ".docx"):
+                nom_pdf = normaliser_nom(entry.stem + ".pdf")
+                table.enregistrer(cible / nom_pdf, dossier / nom_pdf)
+                if LECTURE_HTML and entry.suffixe.lower() == ".docx":
+                    table.enregistrer(cible / nom_lecture(entry.nom), entry.chemin)
+            elif pdf.est_fichier_copiable(entry.chemin, EXTENSIONS_COPIABLES):
+                nom = normaliser_nom(entry.nom)
+                table.enregistrer(cible / nom, entry.chemin)
+                # v23.26: Variantes placées à côté de l'image (x-320w.png, x.webp)
+                taille = images.dimensions(entry.chemin) if variantes_actives(nom) else None
+                for variante, _ in images.variantes(nom, taille[0]) if taille else []:
+                    table.enregistrer(cible / variante, entry.chemin)
+    return table
+
+def variantes_actives(nom: str) -> bool:
+    """True si la copie de nom s'accompagne de variantes d'image."""
+    return IMAGES_RESPONSIVES and os.path.splitext(nom)[1] in images.EXTENSIONS
+
+def signaler_collisions(table: TableURL) -> bool:
+    """Log des sources qui se normalisent vers la même URL.
+    
+    Returns:
+        True si aucune collision
+    """
+    collisions = table.collisions()
+    for cible, sources in collisions:
+        log(f"✗ Collision URL {cible.as_posix()} :")
+        for source in sources:
+            log(f"    {source}")
+    log(f"Table URL : {len(table)} sorties, {len(collisions)} collision(s)")
+    return not collisions
+
+# ============================================================================
+# GRAPHE DE CONSTRUCTION
+# ============================================================================
+
+def _initialiser_thread_word() -> None:
+    """Initialise COM dans le thread dédié aux conversions Word."""
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+def generer_tdm_site() -> None:
+    """Génère TDM/index.html (cree_table_des_matieres) sur les mêmes dossiers."""
+    import cree_table_des_matieres as tdm
+    tdm.DOSSIER_DOCUMENTS = DOSSIER_DOCUMENTS
+    tdm.DOSSIER_HTML = DOSSIER_HTML
+    tdm.generer_tdm(Path(DOSSIER_PUBLIE))
+
+def construire_graphe(ordonnanceur: Ordonnanceur, simulation: bool = False,
+                      sous_arbre: Optional[Path] = None) -> None:
+    """Déclare les tâches de construction et leurs dépendances.
+    
+    - convert(D)   : DOCX→PDF du dossier D (thread Word)
+    - reconcile(D) : STRUCTURE.py de D, après convert(D)
+    - render(D)    : index.html de D, après reconcile de D et de ses
+                     ancêtres (fil d'Ariane : nom_navigation des parents),
+                     chapitres(D) et apercu(D)
+    - chapitres(D) : PDF de D marqués "chapitres" découpés, après
+                     reconcile(D), avant render(D)
+    - copy(D)      : fichiers de D, après convert(D) seulement si D
+                     contient des DOCX (sinon immédiatement)
+    - apercu(D)    : pages, taille et vignette des PDF de D, après
+                     reconcile(D) et copy(D), avant render(D)
+    - render(D) après copy(D) : srcset des seules variantes produites
+    - TDM          : après tous les reconcile
+    
+    v23.24: simulation : pas de convert (Word écrirait les PDF dans
+    DOCUMENTS), les DOCX concernés sont seulement signalés.
+    
+    v23.25: sous_arbre : tâches complètes pour ses seuls dossiers ; ses
+    ancêtres n'ont qu'un render (leur liste le contient), après le
+    reconcile de sous_arbre ; les autres dossiers ne sont pas touchés.
+    
+    v23.26: les ancêtres de sous_arbre ont aussi leur reconcile (leur
+    STRUCTURE.py liste le sous-arbre), avant celui de sous_arbre ; leur
+    render attend les reconcile de leurs propres ancêtres.
+    """
+    reconciles: Dict[Path, Tache] = {}
+    decoupage = pdf_web.disponible()
+    ancetres_sous_arbre = []
+    
+    for dossier in scanner().dossiers():
+        if sous_arbre is not None and not dans_sous_arbre(dossier, sous_arbre):
+            if dans_sous_arbre(sous_arbre, dossier):
+                # Ordre préfixe : ancêtres déclarés avant le sous-arbre
+                reconciles[dossier] = ordonnanceur.ajouter(Tache(
+                    f"reconcile:{dossier}", mettre_a_jour_structure, (dossier,)
+                ))
+                ancetres_sous_arbre.append(dossier)
+            continue
         
-        rel_path = Path(racine).relative_to(DOSSIER_DOCUMENTS)
-        cible_rel_norm = Path(*(normaliser_nom(part) for part in rel_path.parts))
-        cible = Path(DOSSIER_HTML) / cible_rel_norm
-        cible.mkdir(parents=True, exist_ok=True)
+        a_convertir = any(
+            e.est_fichier and e.suffixe.lower() in (".doc", ".docx") and not e.nom.startswith("~$")
+            for e in scanner().lister(dossier)
+        ) and convertisseur()[0] is not None
         
-        for fichier in files:
-            src_file = Path(racine) / fichier
-            if pdf.est_fichier_copiable(src_file, EXTENSIONS_COPIABLES):
-                dst_file = cible / normaliser_nom(fichier)
-                print(f"Range {dst_file}" )
-                shutil.copy2(src_file, dst_file)
+        convert = None
+        if a_convertir and simulation:
+            log(f"Simulation : conversion DOCX→PDF de {dossier} non exécutée")
+        elif a_convertir:
+            convert = ordonnanceur.ajouter(Tache(
+                f"convert:{dossier}", generer_pdf_manquants, (dossier,), genre="word"
+            ))
+        
+        # v23.26: Racine de --only après le reconcile de son parent
+        parent = reconciles.get(dossier.parent) if dossier == sous_arbre else None
+        reconcile = ordonnanceur.ajouter(Tache(
+            f"reconcile:{dossier}", mettre_a_jour_structure, (dossier,), [convert, parent]
+        ))
+        reconciles[dossier] = reconcile
+        
+        # v23.19: Découpage des PDF marqués, avant le rendu qui liste les chapitres
+        decoupe = None
+        if a_decouper(dossier):
+            if decoupage:
+                decoupe = ordonnanceur.ajouter(Tache(
+                    f"chapitres:{dossier}", decouper_chapitres_dossier, (dossier,),
+                    [reconcile], genre="cpu", suite=cache_utils.fusionner
+                ))
+            else:
+                log(f"pikepdf non installé : PDF de {dossier} non découpés")
+        
+        copie = ordonnanceur.ajouter(Tache(
+            f"copy:{dossier}", copier_dossier, (dossier,), [convert]
+        ))
+        
+        # v23.20: Aperçus des PDF, une fois copiés (taille publiée)
+        apercu = None
+        if APERCUS_PDF and a_apercevoir(dossier):
+            apercu = ordonnanceur.ajouter(Tache(
+                f"apercu:{dossier}", apercus_dossier, (dossier,),
+                [reconcile, copie], genre="cpu", suite=cache_utils.fusionner
+            ))
+        
+        ancetres = [reconciles[p] for p in dossier.parents if p in reconciles]
+        ordonnanceur.ajouter(Tache(
+            f"render:{dossier}", rendre_page_index, (dossier,),
+            [reconcile, copie, decoupe, apercu] + ancetres, genre="cpu",
+            suite=lambda resultat: ecrire_page_index(*resultat)
+        ))
+    
+    for dossier in ancetres_sous_arbre:
+        ancetres = [reconciles[p] for p in [dossier, *dossier.parents] if p in reconciles]
+        ordonnanceur.ajouter(Tache(
+            f"render:{dossier}", rendre_page_index, (dossier,),
+            ancetres + [reconciles[sous_arbre]], genre="cpu",
+            suite=lambda resultat: ecrire_page_index(*resultat)
+        ))
+    
+    if reconciles:
+        ordonnanceur.ajouter(Tache(
+            "TDM", generer_tdm_site, (), list(reconciles.values())
+        ))
+
+# ============================================================================
+# CONSTRUCTION À JOUR ?
+# ============================================================================
+
+def etat_entrees() -> tuple:
+    """Ce dont dépend le site, sans lire de contenu.
+    
+    CONFIG, BASE_PATH, date des programmes et des ressources (style.css...),
+    puis chemin, taille et date de chaque entrée de DOCUMENTS (STRUCTURE.py,
+    entête/pied compris) : un parcours (os.scandir) et un stat par entrée.
+    
+    Returns:
+        (empreinte de l'environnement, {chemin relatif: (taille, mtime_ns)})
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((version, BASE_PATH)).encode("utf-8"))
+    digest.update(json.dumps(CONFIG, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    
+    prog = Path(__file__).parent
+    for fichier in sorted([*prog.glob("*.py"), *(prog / "lib1").glob("*.py"),
+                          *ressources.RESSOURCES.values()]):
+        try:
+            st = fichier.stat()
+        except OSError:
+            continue
+        digest.update(f"{fichier.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    
+    racine = Path(DOSSIER_DOCUMENTS)
+    analyse = Scanner(racine, IGNORER, LARGEUR_SCAN).scanner()
+    entrees = {}
+    for dossier in analyse.dossiers():
+        for e in analyse.lister(dossier):
+            st = e.stat()
+            entrees[e.chemin.relative_to(racine).as_posix()] = (st.st_size, st.st_mtime_ns)
+    return digest.hexdigest(), entrees
+
+def empreinte_entrees(etat: tuple = None) -> str:
+    """Empreinte de etat_entrees() (état actuel par défaut)."""
+    environnement, entrees = etat or etat_entrees()
+    digest = hashlib.sha256(environnement.encode("utf-8"))
+    for rel, (taille, mtime_ns) in entrees.items():
+        digest.update(f"{rel}\0{taille}\0{mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def empreinte_apres_construction(initial: tuple) -> str:
+    """Empreinte à enregistrer dans html.empreinte en fin de construction.
+    
+    v23.27: Les écritures du run dans DOCUMENTS (_ecrits_documents, et la
+    date de leur dossier) sont reprises de l'état final : la construction
+    suivante les trouve à jour. Toute autre différence avec l'état lu au
+    lancement (modification pendant le run) laisse l'empreinte initiale,
+    et la construction suivante la prend en compte.
+    
+    Args:
+        initial: etat_entrees() du lancement
+    """
+    final = etat_entrees()
+    racine = Path(DOSSIER_DOCUMENTS)
+    ecrits = set()
+    for chemin in _ecrits_documents:
+        ecrits.add(chemin.relative_to(racine).as_posix())
+        if chemin.parent != racine:
+            ecrits.add(chemin.parent.relative_to(racine).as_posix())
+    
+    if initial[0] != final[0]:
+        log("Programmes ou configuration modifiés pendant la construction : à refaire")
+        return empreinte_entrees(initial)
+    for rel in initial[1].keys() | final[1].keys():
+        if rel not in ecrits and initial[1].get(rel) != final[1].get(rel):
+            log(f"{rel} modifié pendant la construction : à refaire")
+            return empreinte_entrees(initial)
+    return empreinte_entrees(final)
+
+def construction_a_jour() -> bool:
+    """True si html/ a été construit à partir des entrées actuelles."""
+    try:
+        stockee = publication.fichier_empreinte(DOSSIER_HTML).read_text(encoding="utf-8")
+    except OSError:
+        return False
+    return (Path(DOSSIER_HTML) / "index.html").exists() and stockee == empreinte_entrees()
+
+# ============================================================================
+# CONSTRUCTION PARTIELLE
+# ============================================================================
+
+def dans_sous_arbre(dossier: Path, sous_arbre: Path) -> bool:
+    """True si dossier est sous_arbre ou l'un de ses descendants."""
+    return dossier == sous_arbre or sous_arbre in dossier.parents
+
+def resoudre_sous_arbre(chemin: str) -> Path:
+    """--only : dossier de DOCUMENTS, absolu ou relatif à DOCUMENTS.
+    
+    Raises:
+        ValueError: Pas un dossier de DOCUMENTS
+    """
+    racine = Path(DOSSIER_DOCUMENTS)
+    sous_arbre = Path(chemin)
+    if not sous_arbre.is_absolute() and not dans_sous_arbre(sous_arbre, racine):
+        sous_arbre = racine / sous_arbre
+    if not sous_arbre.is_dir() or not dans_sous_arbre(sous_arbre, racine):
+        raise ValueError(f"{chemin} n'est pas un dossier de {racine}")
+    return sous_arbre
+
+def sorties_a_refaire(sous_arbre: Path) -> Callable[[Path], bool]:
+    """Fichiers de html/ qu'une construction limitée à sous_arbre réécrit.
+    
+    v23.25: sortie du sous-arbre, index.html de ses ancêtres, TDM,
+    ressources de la racine et pré-compression ; tout le reste est
+    repris tel quel (publication.reprendre).
+    """
+    racine = Path(DOSSIER_DOCUMENTS)
+    cible = normaliser_chemin(sous_arbre.relative_to(racine)).parts
+    pages = {normaliser_chemin(d.relative_to(racine)) / "index.html"
+             for d in [sous_arbre, *sous_arbre.parents] if dans_sous_arbre(d, racine)}
+    pages.add(Path(DOSSIER_TDM) / "index.html")
+    noms = ressources.manifeste(RESSOURCES_EMPREINTEES)
+    try:
+        anciens = json.loads((Path(DOSSIER_PUBLIE) / ressources.MANIFESTE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        anciens = {}
+    a_la_racine = set(noms) | set(noms.values()) | set(anciens.values()) | {ressources.MANIFESTE}
+    
+    def a_refaire(rel: Path) -> bool:
+        if rel in pages or rel.parts[:len(cible)] == cible:
+            return True
+        if rel.name.endswith((".gz", ".br")) or rel.name == precompression.MANIFESTE:
+            return True
+        return len(rel.parts) == 1 and rel.name in a_la_racine
+    
+    return a_refaire
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def rapport_simulation(memoire: "fs_utils.Memoire", preparation: Path, dossier_publie: Path) -> None:
+    """Liste ce que la construction simulée changerait dans HTML et DOCUMENTS.
+    
+    v23.24: + nouveau, ~ modifié, - supprimé (relatifs à HTML) ; inchangé
+    (lien dur vers le fichier en ligne, ou mêmes octets) seulement compté.
+    
+    v23.27: .gz/.br et .precompression.json simulés comme le reste.
+    """
+    nouveaux, modifies, inchanges = [], [], 0
+    for chemin in memoire.fichiers(preparation):
+        rel = chemin.relative_to(preparation)
+        ancien = dossier_publie / rel
+        origine = memoire.origine(chemin)
+        try:
+            if origine is not None:
+                identique = os.path.samefile(origine, ancien)
+            else:
+                # Manifestes JSON réécrits à chaque run : comparés octet par octet
+                identique = memoire.lire_octets(chemin) == ancien.read_bytes()
+        except OSError:
+            identique = False
+        if identique:
+            inchanges += 1
+        elif ancien.exists():
+            modifies.append(rel)
+        else:
+            nouveaux.append(rel)
+    
+    supprimes = []
+    if dossier_publie.is_dir():
+        for ancien in sorted(dossier_publie.rglob("*")):
+            rel = ancien.relative_to(dossier_publie)
+            if ancien.is_file() and not memoire.existe(preparation / rel):
+                supprimes.append(rel)
+    
+    sources = list(memoire.fichiers(Path(DOSSIER_DOCUMENTS)))
+    
+    log("")
+    log("=" * 70)
+    log(f"SIMULATION : {len(nouveaux)} nouveau(x), {len(modifies)} modifié(s), "
+        f"{len(supprimes)} supprimé(s), {inchanges} inchangé(s) dans {dossier_publie}")
+    log("=" * 70)
+    for signe, liste in (("+", nouveaux), ("~", modifies), ("-", supprimes)):
+        for rel in liste:
+            log(f"  {signe} {rel.as_posix()}")
+    for chemin in sources:
+        log(f"  ~ {chemin} (DOCUMENTS)")
+
+# ============================================================================
+# CACHE DES RÉSULTATS DÉRIVÉS
+# ============================================================================
+
+def lignes_statistiques_cache(statistiques: Dict[str, Dict[str, int]]) -> List[str]:
+    """« espace : N succès, M production(s) (taux) » par espace consulté."""
+    lignes = []
+    for espace, c in sorted(statistiques.items()):
+        consultations = c.get("consultations", 0)
+        productions = c.get("productions", 0)
+        succes = max(0, consultations - productions)
+        taux = f" ({succes / consultations:.0%})" if consultations else ""
+        lignes.append(f"  {espace} : {succes} succès, {productions} production(s){taux}")
+    return lignes
+
+def elaguer_cache(plafond_mo: int, epargner_depuis: float = None,
+                  afficher=log) -> None:
+    """Ramène le cache sous plafond_mo Mo (entrées les moins récemment utilisées)."""
+    if not plafond_mo:
+        return
+    supprimees, liberes, restants = cache_utils.elaguer(
+        racine_cache(), plafond_mo * 1024 * 1024, epargner_depuis
+    )
+    if supprimees:
+        afficher(f"Cache : {supprimees} entrée(s) évincée(s), {html.taille_lisible(liberes)} libérés")
+    if restants > plafond_mo * 1024 * 1024:
+        afficher(f"Cache : {html.taille_lisible(restants)} (plafond {plafond_mo} Mo, "
+                 "entrées du dernier run conservées)")
+
+def commande_cache(action: str, plafond_mo: int) -> int:
+    """« cache stats » / « cache prune » : contenu du cache, ou éviction LRU.
+    
+    v23.23: Sans construction ; code de sortie du programme.
+    """
+    racine = racine_cache()
+    if action == "prune":
+        if not plafond_mo:
+            print("✗ Aucun plafond (CONFIG taille_cache_max ou --taille-cache)")
+            return 1
+        elaguer_cache(plafond_mo, afficher=print)
+    espaces = cache_utils.inventaire(racine)
+    total = sum(e["octets"] for e in espaces.values())
+    plafond = f"plafond {plafond_mo} Mo" if plafond_mo else "sans plafond"
+    print(f"Cache : {racine} — {html.taille_lisible(total) if espaces else 'vide'} ({plafond})")
+    for espace, e in sorted(espaces.items()):
+        print(f"  {espace} : {e['entrees']} entrée(s), {html.taille_lisible(e['octets'])}, "
+              f"dernier usage {datetime.fromtimestamp(e['plus_recent']):%d/%m/%Y %H:%M}")
+    dernier = cache_utils.lire_statistiques(racine)
+    if action == "stats" and dernier:
+        print(f"Dernière construction ({datetime.fromtimestamp(dernier['date']):%d/%m/%Y %H:%M}) :")
+        for ligne in lignes_statistiques_cache(dernier["espaces"]) or ["  aucune consultation"]:
+            print(ligne)
+    return 0
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
-def main() -> None:
-    """Génération complète - WORKFLOW CORRECT v23.4."""
+def lister_dossiers() -> List[Path]:
+    """Dossiers de DOCUMENTS dans l'ordre du parcours (hors IGNORER)."""
+    return scanner().dossiers()
+
+def main(jobs: int = 1, simulation: bool = False, sous_arbre: Optional[Path] = None) -> None:
+    """Génération complète - WORKFLOW CORRECT v23.4.
+    
+    v23.24: simulation = construction en mémoire (fs_utils.Memoire) :
+    html/, DOCUMENTS et STRUCTURE.py intacts, ensemble des écritures
+    comparé au site en ligne en fin de run.
+    
+    v23.25: sous_arbre = construction limitée à ce dossier de DOCUMENTS
+    (--only), le reste de html/ repris par liens durs.
+    """
+    global _optimiseur, _variantes, _lecteur
+    initialiser_log()
+    # v23.26: Entrées telles que lues par cette construction : une
+    # modification de DOCUMENTS pendant le run n'est pas masquée
+    # (v23.27: les écritures du run lui-même sont reprises en fin de run)
+    etat_initial = etat_entrees() if sous_arbre is None and not simulation else None
+    _ecrits_documents.clear()
+    memoire = None
+    if simulation:
+        memoire = fs_utils.Memoire(base=fs_utils.Disque())
+        fs_utils.utiliser(memoire)
+    debut_run = datetime.now().timestamp()
+    cache_utils.releve()
     log("=" * 70)
-    log("=== GÉNÉRATION SITE STATIQUE v23.4 ===")
+    log(f"=== GÉNÉRATION SITE STATIQUE v{version[1]} ===")
     log("=" * 70)
     
     log(f"Source : {DOSSIER_DOCUMENTS}")
     log(f"HTML : {DOSSIER_HTML}")
-    log(f"BASE_PATH : {BASE_PATH}")
+    log(f"BASE_PATH : {BASE_PATH}" + (" (non utilisé : liens relatifs)" if LIENS_RELATIFS else ""))
+    if simulation:
+        log("Simulation (--dry-run) : aucune écriture dans HTML ni DOCUMENTS")
     log("")
     
-    # Config
-    if DOCX2PDF_DISPONIBLE and HAS_WIN32COM:
-        log("✓ Conversion PDF disponible")
-    else:
-        log("✗ Conversion PDF désactivée")
-    log("")
+    # v23.8: Construction dans html.staging/, html/ reste servi tel quel
+    dossier_publie = Path(DOSSIER_HTML)
+    preparation = publication.preparer(dossier_publie)
+    configurer_chemins(DOSSIER_DOCUMENTS, str(preparation), str(dossier_publie))
+    log(f"Préparation : {preparation}")
+    if sous_arbre is not None:
+        repris = publication.reprendre(dossier_publie, preparation, sorties_a_refaire(sous_arbre))
+        log(f"Sous-arbre : {sous_arbre} ({repris} fichiers du site repris tels quels)")
+        parent = Dossier.charger(sous_arbre.parent) if sous_arbre != Path(DOSSIER_DOCUMENTS) else None
+        if parent is not None and parent.element(sous_arbre.name) is None:
+            log(f"  ⚠ {sous_arbre.name} absent de {sous_arbre.parent / 'STRUCTURE.py'} : "
+                "non listé par son parent (construction complète, ou --only sur le parent)")
     
-    # Créer dossier HTML et copier style.css
-    if Path(DOSSIER_HTML).exists():
-        shutil.rmtree(DOSSIER_HTML)
-    Path(DOSSIER_HTML).mkdir(parents=True, exist_ok=True)
-    
-    style_src = Path(__file__).parent / "lib1" / "style.css"
-    if style_src.exists():
-        shutil.copy2(style_src, Path(DOSSIER_HTML) / "style.css")
+    # v23.17: style.css (et favicon) sous nom logique et nom empreinté
+    ressources.publier(preparation, dossier_publie, RESSOURCES_EMPREINTEES, log)
     
     tdm_path = Path(DOSSIER_HTML) / DOSSIER_TDM
-    tdm_path.mkdir(parents=True, exist_ok=True)
+    fs_utils.actif().creer_dossier(tdm_path)
     
     log("=" * 70)
-    log("PHASE 1 : GÉNÉRATION PDF + MISE À JOUR STRUCTURE.py")
+    log("CONSTRUCTION : CONVERSION / STRUCTURE / PAGES / COPIE / TDM")
     log("=" * 70)
     log("")
     
-    # PHASE 1 : Pour chaque dossier, générer PDF et mettre à jour STRUCTURE
-    for racine, dirs, files in os.walk(DOSSIER_DOCUMENTS):
-        dirs[:] = [d for d in dirs if d not in IGNORER]
-        dossier = Path(racine)
-        
-        log(f"--- {dossier} ---")
-        generer_pdf_manquants(dossier)
-        mettre_a_jour_structure(dossier)
-        log("")
+    # v23.24: En simulation, la mémoire n'est visible que de ce processus : cpu en threads
+    if simulation:
+        pool_cpu = ThreadPoolExecutor(max_workers=max(1, jobs))
+    else:
+        pool_cpu = ProcessPoolExecutor(
+            max_workers=max(1, jobs),
+            initializer=configurer_chemins,
+            initargs=(DOSSIER_DOCUMENTS, DOSSIER_HTML, DOSSIER_PUBLIE)
+        )
     
-    log("=" * 70)
-    log("PHASE 2 : GÉNÉRATION index.html")
-    log("=" * 70)
+    with ThreadPoolExecutor(max_workers=max(4, jobs)) as io, \
+         ThreadPoolExecutor(max_workers=1, initializer=_initialiser_thread_word) as word, \
+         pool_cpu as cpu:
+        ordonnanceur = Ordonnanceur({"io": io, "word": word, "cpu": cpu}, log)
+        # v23.18: PDF optimisés par le pool de processus, attendus par les tâches de copie
+        if LECTURE_HTML:
+            _lecteur = docx_html.LecteurDOCX(
+                Cache(racine_cache(), docx_html.ESPACE), cpu, log
+            )
+        if IMAGES_RESPONSIVES:
+            if images.disponible():
+                _variantes = images.VariantesImages(
+                    Cache(racine_cache(), images.ESPACE), cpu, log
+                )
+            else:
+                log("Pillow non installé : images copiées sans variantes")
+        if OPTIMISATION_PDF:
+            if pdf_web.disponible():
+                _optimiseur = pdf_web.OptimiseurPDF(
+                    Cache(racine_cache(), pdf_web.ESPACE), cpu, log
+                )
+            else:
+                log("pikepdf non installé : PDF copiés sans optimisation")
+        scanner().scanner()
+        log(scanner().rapport())
+        # v23.12: Collisions d'URL signalées avant toute écriture
+        if not signaler_collisions(construire_table_url()) and ARRET_SUR_COLLISION:
+            log("✗ Construction annulée (renommer les sources en conflit, "
+                "ou CONFIG arret_sur_collision = False) ; site en ligne inchangé")
+            fs_utils.actif().supprimer_arbre(preparation)
+            return
+        construire_graphe(ordonnanceur, simulation, sous_arbre)
+        if _convertisseur is None:
+            log("Aucun DOCX : conversion PDF non chargée")
+        elif all(convertisseur()):
+            log("✓ Conversion PDF disponible")
+        else:
+            log("✗ Conversion PDF désactivée")
+        if APERCUS_PDF:
+            moteur = pdf_apercu.moteur_vignettes()
+            log(f"Vignettes PDF : {moteur}" if moteur else "Vignettes PDF : ni fitz ni pdftoppm, pages et taille seulement")
+        log(f"{len(ordonnanceur.taches)} tâches")
+        debut = datetime.now()
+        durees = ordonnanceur.executer()
+    
+    total = (datetime.now() - debut).total_seconds()
+    cumul = sum(durees.values())
     log("")
+    log(scanner().rapport())
+    log(f"Durée : {total:.1f} s (travail cumulé {cumul:.1f} s : "
+        + ", ".join(f"{g} {d:.1f} s" for g, d in sorted(durees.items())) + ")")
+    stats = publication.statistiques
+    log(f"Fichiers : {stats['liens']} réutilisés (liens durs), {stats['copies']} copiés")
+    log(f"Pages : {stats['pages_inchangees']} inchangées, {stats['pages_ecrites']} écrites")
+    if _optimiseur:
+        log(_optimiseur.bilan())
+        _optimiseur = None
+    if _variantes:
+        log(_variantes.bilan())
+        _variantes = None
+    if _lecteur:
+        log(_lecteur.bilan())
+        _lecteur = None
+    # v23.23: Succès/productions du cache, tous processus confondus
+    statistiques_cache = cache_utils.releve()
+    if statistiques_cache:
+        log("Cache :")
+        for ligne in lignes_statistiques_cache(statistiques_cache):
+            log(ligne)
+        if not simulation:
+            cache_utils.enregistrer_statistiques(racine_cache(), statistiques_cache)
+    
+    # v23.16: .gz/.br à côté des ressources texte, repris de html/ si inchangées
+    # (v23.27: avant le rapport de simulation, qui les liste)
+    if PRECOMPRESSION:
+        precompression.precompresser(preparation, dossier_publie, max(4, jobs), log)
     
-    # PHASE 2 : Générer tous les index.html
-    for racine, dirs, files in os.walk(DOSSIER_DOCUMENTS):
-        dirs[:] = [d for d in dirs if d not in IGNORER]
-        generer_page_index(Path(racine))
+    if simulation:
+        rapport_simulation(memoire, preparation, dossier_publie)
+        fs_utils.utiliser(fs_utils.Disque())
+        configurer_chemins(DOSSIER_DOCUMENTS, str(dossier_publie))
         log("")
+        log("=" * 70)
+        log("=== FIN SIMULATION ===")
+        log("=" * 70)
+        return
     
-    log("=" * 70)
-    log("PHASE 3 : COPIE FICHIERS VERS HTML")
-    log("=" * 70)
+    # Mise en ligne atomique
+    publication.basculer(dossier_publie)
+    configurer_chemins(DOSSIER_DOCUMENTS, str(dossier_publie))
+    if etat_initial is not None:
+        fs_utils.actif().ecrire_texte(publication.fichier_empreinte(dossier_publie),
+                                      empreinte_apres_construction(etat_initial))
+    else:
+        # v23.25: Le reste du site n'a pas été vérifié : prochaine construction complète
+        fs_utils.actif().supprimer(publication.fichier_empreinte(dossier_publie))
+    log(f"✓ Site publié : {dossier_publie} (précédent : {publication.dossier_precedent(dossier_publie)})")
+    # v23.23: Plafond du cache, sans toucher aux entrées de ce run
+    elaguer_cache(TAILLE_CACHE_MAX, debut_run)
     log("")
     
-    # PHASE 3 : Copier fichiers
-    copier_fichiers_site()
-    
-    # Nettoyage
-    processes = get_word_processes()
+    # Nettoyage (Word n'a pu être lancé que si la conversion a été chargée)
+    processes = get_word_processes() if _convertisseur and _convertisseur[0] else []
     if processes:
         log("")
         log("Fermeture Word")
@@ -540,7 +1506,89 @@ def main() -> None:
     log("=== FIN GÉNÉRATION ===")
     log("=" * 70)
 
+def analyser_arguments(argv: List[str] = None) -> argparse.Namespace:
+    """Arguments de ligne de commande."""
+    parser = argparse.ArgumentParser(description="Générateur de site statique")
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processus de rendu des pages"
+    )
+    parser.add_argument(
+        "--scan-threads",
+        type=int,
+        default=LARGEUR_SCAN,
+        help="Threads de parcours de DOCUMENTS (dossiers frères en parallèle)"
+    )
+    parser.add_argument("--documents", default=DOSSIER_DOCUMENTS, help="Dossier source")
+    parser.add_argument("--html", default=DOSSIER_HTML, help="Dossier de sortie")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconstruit même si rien n'a changé depuis la dernière construction"
+    )
+    parser.add_argument(
+        "commande",
+        nargs="*",
+        metavar="cache {stats,prune}",
+        help="Sans construire : contenu du cache, ou éviction jusqu'au plafond"
+    )
+    parser.add_argument(
+        "--taille-cache",
+        type=int,
+        default=TAILLE_CACHE_MAX,
+        help="Plafond du cache en Mo, éviction LRU (0 = sans limite)"
+    )
+    parser.add_argument(
+        "--only",
+        metavar="DOSSIER",
+        help="Limite la construction à ce dossier de DOCUMENTS (et aux pages qui le listent)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Construit en mémoire et liste les fichiers que la construction écrirait"
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Revient à la construction précédente (html.precedent/) puis quitte"
+    )
+    args = parser.parse_args(argv)
+    if args.commande and (len(args.commande) != 2 or args.commande[0] != "cache"
+                          or args.commande[1] not in ("stats", "prune")):
+        parser.error("commande attendue : cache stats | cache prune")
+    return args
+
 if __name__ == "__main__":
-    main()
+    args = analyser_arguments()
+    configurer_chemins(args.documents, args.html)
+    LARGEUR_SCAN = args.scan_threads
+    TAILLE_CACHE_MAX = args.taille_cache
+    if args.commande:
+        sys.exit(commande_cache(args.commande[1], TAILLE_CACHE_MAX))
+    elif args.rollback:
+        if publication.restaurer(Path(args.html)):
+            print(f"✓ Retour à la construction précédente : {args.html}")
+        else:
+            print(f"✗ Aucune construction précédente pour {args.html}")
+            sys.exit(1)
+    # v23.26: Raccourci réservé à la construction complète (--only et
+    # --dry-run construisent toujours)
+    elif not (args.force or args.only or args.dry_run) and construction_a_jour():
+        print(f"✓ {args.html} à jour (DOCUMENTS, configuration et programmes inchangés)")
+    else:
+        sous_arbre = None
+        if args.only:
+            try:
+                sous_arbre = resoudre_sous_arbre(args.only)
+            except ValueError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+            if not (Path(args.html) / "index.html").exists():
+                print(f"✗ {args.html} : aucune construction complète à compléter")
+                sys.exit(1)
+        main(args.jobs, args.dry_run, sous_arbre)
 
-# Fin genere_site.py v23.4
+# Fin genere_site.py v23.27
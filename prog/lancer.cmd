@@ -1,8 +1,8 @@
 @echo off
-REM Début de "lancer.cmd" version "2.3"
+REM Début de "lancer.cmd" version "2.5"
 cls
 echo.
-echo lancer.cmd — Version 2.3
+echo lancer.cmd — Version 2.5
 echo.
 
 :: O entrer en mode virtualisation pour python
@@ -38,7 +38,7 @@ cd /d "%~dp0\.."
 echo.
 echo === Génération du site réel à partir du dossier documents ===
 
-:: 1. On lance d'abord genere_site.py (il crée html/ et tous les dossiers)
+:: 1. genere_site.py crée html/, tous les dossiers et la TDM
 python prog\genere_site.py
 if %errorlevel% neq 0 (
     echo [ERREUR] genere_site.py a échoué
@@ -46,15 +46,10 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
-:: 2. Ensuite seulement on génère la TDM (html/ existe maintenant → plus d'erreur)
-python prog\cree_table_des_matieres.py
-if %errorlevel% neq 0 (
-    echo [ERREUR] cree_table_des_matieres.py a échoué
-    pause
-    exit /b 1
-)
-rem créer /Hebreu4.0/html/Hebreu4.0/html/style.css
-xcopy html\style.css html\Hebreu4.0\html\*.*
+:: 2. La TDM est générée par genere_site.py (tâche TDM du graphe de construction)
+::    cree_table_des_matieres.py reste utilisable seul pour la regénérer
+::    Liens relatifs (CONFIG liens_relatifs) : html/ se sert tel quel sur le
+::    serveur local, plus de copie de style.css sous html\Hebreu4.0\html\
 
 echo.
 echo === Démarrage du serveur local ===
@@ -64,4 +59,4 @@ echo.
 echo Site réel disponible sur : http://localhost:3500/index.html
 echo.
 pause
-REM Fin de "lancer.cmd" version "2.3"
\ No newline at end of file
+REM Fin de "lancer.cmd" version "2.5"
\ No newline at end of file
@@ -0,0 +1,273 @@
+# cache_utils.py — Version 1.3
+# Cache de résultats adressé par contenu (empreinte de l'entrée → fichier produit)
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+SUFFIXE_CACHE = ".cache"
+TAILLE_BLOC = 1 << 20
+LONGUEUR_CLE = 64  # sha256 en hexadécimal
+# Temporaire plus vieux : laissé par un run interrompu
+AGE_TEMPORAIRE_ORPHELIN = 3600  # secondes
+FICHIER_STATISTIQUES = "statistiques.json"
+# Clés de contenu mémorisées par (chemin, taille, date) : partagé par tous les espaces
+ESPACE_EMPREINTES = "empreintes-1"
+
+def dossier_cache(dossier_html: Path, configure: Optional[str] = None) -> Path:
+    """html/ → html.cache/ (même disque que html.staging/ : liens durs possibles).
+
+    Args:
+        dossier_html: Site publié
+        configure: Dossier imposé (CONFIG "dossier_cache"), prioritaire
+    """
+    if configure:
+        return Path(configure)
+    dossier_html = Path(dossier_html)
+    return dossier_html.with_name(dossier_html.name + SUFFIXE_CACHE)
+
+def empreinte_contenu(chemin: Path) -> str:
+    """sha256 complet du contenu d'un fichier (lu par blocs)."""
+    digest = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(TAILLE_BLOC), b""):
+            digest.update(bloc)
+    return digest.hexdigest()
+
+# --- Statistiques -----------------------------------------------------------
+# Par processus : les processus du pool renvoient leur relevé au principal
+
+_verrou_stats = threading.Lock()
+_statistiques: Dict[str, Counter] = {}
+_pid_stats = os.getpid()
+
+def _propres() -> Dict[str, Counter]:
+    """Compteurs du processus (à appeler sous _verrou_stats)."""
+    global _pid_stats
+    if os.getpid() != _pid_stats:
+        # Processus issu d'un fork : compteurs du parent ignorés
+        _statistiques.clear()
+        _pid_stats = os.getpid()
+    return _statistiques
+
+def _compter(espace: str, evenement: str) -> None:
+    with _verrou_stats:
+        _propres().setdefault(espace, Counter())[evenement] += 1
+
+def releve() -> Dict[str, Dict[str, int]]:
+    """Compteurs {espace: {"consultations", "productions"}} du processus,
+    remis à zéro."""
+    with _verrou_stats:
+        resultat = {e: dict(c) for e, c in _propres().items()}
+        _statistiques.clear()
+    return resultat
+
+def fusionner(autre: Dict[str, Dict[str, int]]) -> None:
+    """Ajoute aux compteurs du processus le relevé d'un autre (pool)."""
+    with _verrou_stats:
+        for espace, compteurs in (autre or {}).items():
+            _propres().setdefault(espace, Counter()).update(compteurs)
+
+class Cache:
+    """Espace de cache : une entrée par empreinte d'entrée.
+
+    Entrée = fichier produit (cle + suffixe) et métadonnées (cle.json),
+    rangées dans un sous-dossier des deux premiers caractères de la clé.
+    Écritures atomiques : un run interrompu ne laisse pas d'entrée
+    tronquée. La date de modification des métadonnées est celle du
+    dernier usage (éviction LRU par elaguer()).
+
+    Chaque lire_meta() compte une consultation, chaque ecrire_meta() une
+    production : les succès sont les consultations sans production.
+
+    Args:
+        racine: Dossier du cache (dossier_cache)
+        espace: Sous-dossier propre à un type de résultat ("pdf"...) ;
+                le changer invalide toutes ses entrées
+    """
+
+    def __init__(self, racine: Path, espace: str):
+        self.espace = espace
+        self.dossier = Path(racine) / espace
+
+    def chemin(self, cle: str, suffixe: str = "") -> Path:
+        """Emplacement de l'entrée cle."""
+        return self.dossier / cle[:2] / (cle + suffixe)
+
+    def obtenir(self, cle: str, suffixe: str = "") -> Optional[Path]:
+        """Fichier de l'entrée cle, None si absent."""
+        chemin = self.chemin(cle, suffixe)
+        return chemin if chemin.is_file() else None
+
+    def temporaire(self, cle: str, suffixe: str = "") -> Path:
+        """Fichier où produire l'entrée avant ranger()."""
+        chemin = self.chemin(cle, suffixe)
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        # Processus et thread : deux sources identiques peuvent être traitées en même temps
+        return chemin.with_name(f".{chemin.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def ranger(self, cle: str, temporaire: Path, suffixe: str = "") -> Path:
+        """Installe le fichier produit comme entrée cle."""
+        chemin = self.chemin(cle, suffixe)
+        os.replace(temporaire, chemin)
+        return chemin
+
+    def lire_meta(self, cle: str) -> Optional[dict]:
+        """Métadonnées de l'entrée cle (l'entrée est marquée utilisée)."""
+        _compter(self.espace, "consultations")
+        chemin = self.chemin(cle, ".json")
+        try:
+            meta = json.loads(chemin.read_text(encoding="utf-8"))
+            os.utime(chemin)
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def ecrire_meta(self, cle: str, meta: dict) -> None:
+        """Enregistre les métadonnées de l'entrée cle."""
+        _compter(self.espace, "productions")
+        temporaire = self.temporaire(cle, ".json")
+        temporaire.write_text(json.dumps(meta, sort_keys=True), encoding="utf-8")
+        self.ranger(cle, temporaire, ".json")
+
+    def empreinte(self, source: Path, etat: Optional[os.stat_result] = None,
+                  calculer: bool = True) -> Optional[str]:
+        """Clé de contenu de source (empreinte_contenu), sans relire une
+        source inchangée.
+
+        La clé est mémorisée (espace ESPACE_EMPREINTES, éviction LRU comme
+        les autres entrées) sous (chemin absolu, taille, mtime_ns) : tant que la
+        source garde taille et date, elle n'est pas relue. Une source
+        modifiée pendant la lecture n'est pas mémorisée.
+
+        Args:
+            source: Fichier source
+            etat: stat de source s'il est déjà connu (scanner)
+            calculer: False : None si la clé n'est pas mémorisée (pas de lecture)
+        """
+        etat = etat or os.stat(source)
+        memo = Cache(self.dossier.parent, ESPACE_EMPREINTES)
+        cle_memo = hashlib.sha256(
+            f"{os.path.abspath(source)}\0{etat.st_size}\0{etat.st_mtime_ns}".encode("utf-8")
+        ).hexdigest()
+        _compter(ESPACE_EMPREINTES, "consultations")
+        chemin = memo.chemin(cle_memo, ".cle")
+        try:
+            cle = chemin.read_text(encoding="ascii")
+            if len(cle) == LONGUEUR_CLE:
+                os.utime(chemin)
+                return cle
+        except (OSError, ValueError):
+            pass
+        if not calculer:
+            return None
+
+        _compter(ESPACE_EMPREINTES, "productions")
+        cle = empreinte_contenu(source)
+        apres = os.stat(source)
+        if (apres.st_size, apres.st_mtime_ns) == (etat.st_size, etat.st_mtime_ns):
+            temporaire = memo.temporaire(cle_memo, ".cle")
+            temporaire.write_text(cle, encoding="ascii")
+            memo.ranger(cle_memo, temporaire, ".cle")
+        return cle
+
+# --- Inventaire et éviction -------------------------------------------------
+
+def _entrees(racine: Path) -> Dict[Tuple[str, str], dict]:
+    """{(espace, cle): {"octets", "usage", "fichiers"}} des entrées complètes.
+
+    usage = date du dernier lire_meta()/ecrire_meta() ; les temporaires
+    récents (production en cours) sont ignorés, les orphelins supprimés.
+    """
+    entrees = {}
+    limite = time.time() - AGE_TEMPORAIRE_ORPHELIN
+    for fichier in Path(racine).glob("*/??/*"):
+        try:
+            st = fichier.stat()
+        except OSError:
+            continue  # supprimé entre-temps (autre construction)
+        if fichier.name.startswith("."):
+            if st.st_mtime < limite:
+                fichier.unlink(missing_ok=True)
+            continue
+        entree = entrees.setdefault(
+            (fichier.parent.parent.name, fichier.name[:LONGUEUR_CLE]),
+            {"octets": 0, "usage": 0.0, "meta": None, "fichiers": []},
+        )
+        entree["octets"] += st.st_size
+        entree["fichiers"].append(fichier)
+        if fichier.name.endswith(".json"):
+            entree["meta"] = st.st_mtime
+        else:
+            entree["usage"] = max(entree["usage"], st.st_mtime)
+    for entree in entrees.values():
+        # Sans métadonnées (production interrompue) : date du fichier le plus récent
+        meta = entree.pop("meta")
+        if meta is not None:
+            entree["usage"] = meta
+    return entrees
+
+def inventaire(racine: Path) -> Dict[str, dict]:
+    """{espace: {"entrees", "octets", "plus_ancien", "plus_recent"}}."""
+    resultat = {}
+    for (espace, _), entree in _entrees(racine).items():
+        r = resultat.setdefault(espace, {"entrees": 0, "octets": 0,
+                                         "plus_ancien": entree["usage"], "plus_recent": entree["usage"]})
+        r["entrees"] += 1
+        r["octets"] += entree["octets"]
+        r["plus_ancien"] = min(r["plus_ancien"], entree["usage"])
+        r["plus_recent"] = max(r["plus_recent"], entree["usage"])
+    return resultat
+
+def elaguer(racine: Path, plafond: int, epargner_depuis: Optional[float] = None) -> Tuple[int, int, int]:
+    """Supprime les entrées les moins récemment utilisées jusqu'à plafond.
+
+    Une entrée supprimée reste valable dans le site (lien dur) ; elle
+    sera simplement reproduite si elle resert.
+
+    Args:
+        racine: Dossier du cache
+        plafond: Taille maximale en octets
+        epargner_depuis: Les entrées utilisées depuis cette date (run en
+                         cours) ne sont jamais supprimées
+
+    Returns:
+        (entrées supprimées, octets libérés, octets restants)
+    """
+    entrees = sorted(_entrees(racine).values(), key=lambda e: e["usage"])
+    total = sum(e["octets"] for e in entrees)
+    supprimees = liberes = 0
+    for entree in entrees:
+        if total - liberes <= plafond:
+            break
+        if epargner_depuis is not None and entree["usage"] >= epargner_depuis:
+            break  # triées : toutes les suivantes sont aussi récentes
+        # Métadonnées en premier : une lecture concurrente voit l'entrée absente
+        for fichier in sorted(entree["fichiers"], key=lambda f: not f.name.endswith(".json")):
+            fichier.unlink(missing_ok=True)
+        supprimees += 1
+        liberes += entree["octets"]
+    return supprimees, liberes, total - liberes
+
+def enregistrer_statistiques(racine: Path, statistiques: Dict[str, Dict[str, int]]) -> None:
+    """Garde les compteurs du dernier run (affichés par « cache stats »)."""
+    racine = Path(racine)
+    racine.mkdir(parents=True, exist_ok=True)
+    temporaire = racine / f".{FICHIER_STATISTIQUES}.{os.getpid()}.tmp"
+    temporaire.write_text(json.dumps({"date": time.time(), "espaces": statistiques},
+                                     sort_keys=True, indent=1), encoding="utf-8")
+    os.replace(temporaire, racine / FICHIER_STATISTIQUES)
+
+def lire_statistiques(racine: Path) -> Optional[dict]:
+    """Compteurs du dernier run ({"date", "espaces"}), None si aucun."""
+    try:
+        return json.loads((Path(racine) / FICHIER_STATISTIQUES).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+# Fin cache_utils.py v1.3
@@ -19,6 +19,17 @@ CONFIG = {
     "dossier_tdm": "TDM",
     "voir_structure": False,  # Ajoute commentaires HTML structure
     "lien_souligné_index": False,
+    # True : date de génération en pied de page (chaque run réécrit toutes
+    # les pages). False : empreinte du contenu, sortie reproductible
+    "horodatage_pages": False,
+    # True : liens relatifs à chaque page (../style.css...), le même html/
+    # se sert en local comme sur GitHub Pages. False : liens absolus
+    # préfixés par options.BASE_PATH
+    "liens_relatifs": True,
+    # True : style.css (et lib1/favicon.ico) publiés aussi sous un nom
+    # dérivé de leur contenu (style.3f2a9c81d0.css, cf. html/ressources.json)
+    # et référencés sous ce nom : cache navigateur illimité possible
+    "ressources_empreintees": True,
     
     # ========================================
     # EXTENSIONS ACCEPTÉES
@@ -30,6 +41,43 @@ CONFIG = {
     # ========================================
     "ignorer": ["nppBackup", ".git", ".github", "__pycache__"],
     
+    # Threads de parcours de DOCUMENTS (dossiers frères lus en parallèle,
+    # utile sur un dossier synchronisé où chaque appel système est lent)
+    "largeur_scan": 8,
+    
+    # Deux sources donnant la même URL (ex: "Leçon.pdf" et "lecon.pdf") :
+    # True = construction annulée, False = simple avertissement
+    "arret_sur_collision": True,
+    
+    # Écrit fichier.gz (et .br si brotli est installé) à côté des pages
+    # HTML, de la TDM et de style.css : un serveur qui sert les fichiers
+    # pré-compressés (nginx gzip_static...) n'a plus rien à compresser
+    "precompression": False,
+    
+    # PDF linéarisés (« affichage web rapide ») et recompressés sans perte
+    # à la copie (nécessite pikepdf) ; résultats gardés dans html.cache/
+    "optimisation_pdf": False,
+    
+    # Pages index : nombre de pages, taille et vignette de la première
+    # page de chaque PDF (vignette si fitz ou pdftoppm est installé)
+    "apercus_pdf": True,
+    
+    # Images jpg/png : variantes 320/640/1280 px (et WebP) à la copie,
+    # <img> des entête/pied en srcset à chargement différé (Pillow)
+    "images_responsives": True,
+    
+    # DOCX : page de lecture HTML légère (hébreu RTL, images) publiée à
+    # côté du PDF et liée depuis l'index ("lire en ligne")
+    "lecture_html": False,
+    
+    # Cache des résultats dérivés (PDF optimisés, vignettes, variantes
+    # d'images...) : None = html.cache/ à côté du site (liens durs)
+    "dossier_cache": None,
+    
+    # Plafond du cache en Mo : au-delà, les entrées les moins récemment
+    # utilisées sont supprimées en fin de construction (0 = sans limite)
+    "taille_cache_max": 2048,
+    
     # ========================================
     # CONVERSION PDF (v23.1)
     # ========================================
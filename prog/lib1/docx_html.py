@@ -0,0 +1,388 @@
+# docx_html.py — Version 1.2
+# Rendu HTML léger d'un DOCX (zipfile + xml.etree) : titres, listes, tableaux, liens, images, hébreu RTL
+
+import os
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor
+from html import escape
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lib1 import fs_utils
+from lib1.cache_utils import Cache, empreinte_contenu
+
+# Révision du rendu : la changer invalide le cache
+ESPACE = "docx-html-1"
+JETON_IMAGES = "{{IMAGES}}"  # Remplacé par le dossier des images à la publication
+SUFFIXE_IMAGES = "_images"
+# Formats affichables par un navigateur (EMF/WMF/TIFF ignorés)
+FORMATS_IMAGES = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".svg", ".webp"}
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+WP = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}"
+V = "{urn:schemas-microsoft-com:vml}"
+
+HEBREU = re.compile("[\u0590-\u05FF\uFB1D-\uFB4F]")
+TITRE_STYLE = re.compile(r"^(?:heading|titre)\s*(\d)$", re.IGNORECASE)
+
+# Erreurs dues au document lui-même : mémorisées, le même DOCX échouerait
+# encore. Les autres (pool interrompu, disque...) laissent un nouvel essai.
+ERREURS_CONVERSION = (zipfile.BadZipFile, zipfile.LargeZipFile, ET.ParseError,
+                      KeyError, ValueError, UnicodeDecodeError)
+
+def _actif(element: Optional[ET.Element]) -> bool:
+    """Propriété booléenne OOXML (<w:b/>, <w:b w:val="0"/>...)."""
+    if element is None:
+        return False
+    return element.get(W + "val", "true").lower() not in ("0", "false", "off", "none")
+
+def _lire_xml(archive: zipfile.ZipFile, nom: str) -> Optional[ET.Element]:
+    try:
+        return ET.fromstring(archive.read(nom))
+    except KeyError:
+        return None
+
+class _Rendu:
+    """Conversion d'un document.xml en fragment HTML."""
+
+    def __init__(self, archive: zipfile.ZipFile):
+        self.archive = archive
+        self.liens: Dict[str, str] = {}
+        self.medias: Dict[str, str] = {}
+        self.images: Dict[str, str] = {}  # nom publié → chemin dans l'archive
+        self.niveaux_styles: Dict[str, int] = {}
+        self.formats_listes: Dict[Tuple[str, str], str] = {}
+        self.titre = ""
+        self._relations()
+        self._styles()
+        self._numerotation()
+
+    # --- Parties annexes ----------------------------------------------------
+
+    def _relations(self) -> None:
+        racine = _lire_xml(self.archive, "word/_rels/document.xml.rels")
+        for rel in (racine if racine is not None else []):
+            cible = rel.get("Target", "")
+            if rel.get("TargetMode") == "External":
+                self.liens[rel.get("Id")] = cible
+            elif rel.get("Type", "").endswith("/image"):
+                self.medias[rel.get("Id")] = "word/" + cible.lstrip("/").removeprefix("word/")
+
+    def _styles(self) -> None:
+        racine = _lire_xml(self.archive, "word/styles.xml")
+        for style in (racine.iter(W + "style") if racine is not None else []):
+            nom = style.find(W + "name")
+            nom = nom.get(W + "val", "") if nom is not None else ""
+            niveau = style.find(f"{W}pPr/{W}outlineLvl")
+            m = TITRE_STYLE.match(nom)
+            if nom.lower() == "title":
+                self.niveaux_styles[style.get(W + "styleId")] = 1
+            elif m:
+                self.niveaux_styles[style.get(W + "styleId")] = min(6, int(m.group(1)))
+            elif niveau is not None:
+                self.niveaux_styles[style.get(W + "styleId")] = min(6, int(niveau.get(W + "val", "0")) + 1)
+
+    def _numerotation(self) -> None:
+        racine = _lire_xml(self.archive, "word/numbering.xml")
+        if racine is None:
+            return
+        abstraits = {}
+        for abstrait in racine.iter(W + "abstractNum"):
+            for lvl in abstrait.iter(W + "lvl"):
+                fmt = lvl.find(W + "numFmt")
+                abstraits[(abstrait.get(W + "abstractNumId"), lvl.get(W + "ilvl"))] = (
+                    fmt.get(W + "val", "bullet") if fmt is not None else "bullet"
+                )
+        for num in racine.iter(W + "num"):
+            ref = num.find(W + "abstractNumId")
+            if ref is None:
+                continue
+            for (abstrait, ilvl), fmt in abstraits.items():
+                if abstrait == ref.get(W + "val"):
+                    self.formats_listes[(num.get(W + "numId"), ilvl)] = "ul" if fmt == "bullet" else "ol"
+
+    # --- Texte --------------------------------------------------------------
+
+    def _image(self, element: ET.Element) -> str:
+        blip = element.find(f".//{A}blip")
+        rid = blip.get(R + "embed") if blip is not None else None
+        if rid is None:
+            donnees = element.find(f".//{V}imagedata")
+            rid = donnees.get(R + "id") if donnees is not None else None
+        chemin = self.medias.get(rid)
+        if not chemin or os.path.splitext(chemin)[1].lower() not in FORMATS_IMAGES:
+            return ""
+        nom = os.path.basename(chemin)
+        self.images[nom] = chemin
+        description = element.find(f".//{WP}docPr")
+        alt = description.get("descr", "") if description is not None else ""
+        return f'<img src="{JETON_IMAGES}/{escape(nom)}" alt="{escape(alt)}" loading="lazy"/>'
+
+    def _run(self, run: ET.Element) -> Tuple[tuple, str]:
+        """(mise en forme, HTML) d'un w:r."""
+        rpr = run.find(W + "rPr")
+        forme = ()
+        if rpr is not None:
+            u = rpr.find(W + "u")
+            va = rpr.find(W + "vertAlign")
+            va = va.get(W + "val") if va is not None else ""
+            forme = tuple(balise for balise, actif in (
+                ("strong", _actif(rpr.find(W + "b"))),
+                ("em", _actif(rpr.find(W + "i"))),
+                ("u", u is not None and u.get(W + "val", "single") != "none"),
+                ("s", _actif(rpr.find(W + "strike"))),
+                ("sup", va == "superscript"),
+                ("sub", va == "subscript"),
+            ) if actif)
+        morceaux = []
+        for enfant in run:
+            if enfant.tag == W + "t":
+                morceaux.append(escape(enfant.text or ""))
+            elif enfant.tag == W + "tab":
+                morceaux.append("\t")
+            elif enfant.tag in (W + "br", W + "cr"):
+                morceaux.append("<br/>")
+            elif enfant.tag == W + "noBreakHyphen":
+                morceaux.append("‑")
+            elif enfant.tag in (W + "drawing", W + "pict"):
+                morceaux.append(self._image(enfant))
+        return forme, "".join(morceaux)
+
+    def _segments(self, parent: ET.Element) -> List[Tuple[tuple, str]]:
+        """Runs d'un paragraphe (liens, insertions, champs compris)."""
+        segments = []
+        for enfant in parent:
+            if enfant.tag == W + "r":
+                segments.append(self._run(enfant))
+            elif enfant.tag == W + "hyperlink":
+                interieur = self._fusionner(self._segments(enfant))
+                cible = self.liens.get(enfant.get(R + "id"))
+                if cible:
+                    interieur = f'<a href="{escape(cible)}">{interieur}</a>'
+                segments.append(((), interieur))
+            elif enfant.tag in (W + "ins", W + "smartTag", W + "fldSimple", W + "sdt", W + "sdtContent"):
+                segments.extend(self._segments(enfant))
+            # w:del (suppressions suivies), w:proofErr, w:bookmark* : ignorés
+        return segments
+
+    @staticmethod
+    def _fusionner(segments: List[Tuple[tuple, str]]) -> str:
+        """Runs consécutifs de même mise en forme regroupés."""
+        html = []
+        courant, texte = None, []
+
+        def vider():
+            if texte:
+                contenu = "".join(texte)
+                for balise in reversed(courant or ()):
+                    contenu = f"<{balise}>{contenu}</{balise}>"
+                html.append(contenu)
+
+        for forme, morceau in segments:
+            if forme != courant:
+                vider()
+                courant, texte = forme, []
+            texte.append(morceau)
+        vider()
+        return "".join(html)
+
+    # --- Blocs --------------------------------------------------------------
+
+    def _paragraphe(self, p: ET.Element) -> Tuple[str, Optional[Tuple[str, int, str]]]:
+        """(HTML du paragraphe, (numId, niveau, ul|ol) si élément de liste)."""
+        ppr = p.find(W + "pPr")
+        contenu = self._fusionner(self._segments(p)).strip()
+        if not contenu:
+            return "", None
+        texte = re.sub(r"<[^>]+>", "", contenu)
+        if ppr is not None and _actif(ppr.find(W + "bidi")):
+            direction = ' dir="rtl"'
+        elif HEBREU.search(texte):
+            direction = ' dir="auto"'
+        else:
+            direction = ""
+
+        niveau = None
+        liste = None
+        if ppr is not None:
+            style = ppr.find(W + "pStyle")
+            if style is not None:
+                niveau = self.niveaux_styles.get(style.get(W + "val"))
+            plan = ppr.find(W + "outlineLvl")
+            if plan is not None and niveau is None:
+                niveau = min(6, int(plan.get(W + "val", "0")) + 1)
+            num = ppr.find(W + "numPr")
+            if num is not None and niveau is None:
+                num_id = num.find(W + "numId")
+                ilvl = num.find(W + "ilvl")
+                num_id = num_id.get(W + "val") if num_id is not None else "0"
+                ilvl = ilvl.get(W + "val") if ilvl is not None else "0"
+                if num_id != "0":
+                    liste = (num_id, int(ilvl), self.formats_listes.get((num_id, ilvl), "ul"))
+
+        if niveau:
+            if not self.titre:
+                self.titre = texte
+            return f"<h{niveau}{direction}>{contenu}</h{niveau}>", None
+        if liste:
+            # <li> fermé par blocs() : une sous-liste doit s'y imbriquer
+            return f"<li{direction}>{contenu}", liste
+        return f"<p{direction}>{contenu}</p>", None
+
+    def _tableau(self, tbl: ET.Element) -> str:
+        lignes = []
+        for tr in tbl.findall(W + "tr"):
+            cellules = []
+            for tc in tr.findall(W + "tc"):
+                fusion = tc.find(f"{W}tcPr/{W}gridSpan")
+                colspan = f' colspan="{fusion.get(W + "val")}"' if fusion is not None else ""
+                cellules.append(f"<td{colspan}>{self.blocs(tc)}</td>")
+            lignes.append(f"<tr>{''.join(cellules)}</tr>")
+        return f"<table>{''.join(lignes)}</table>"
+
+    def blocs(self, parent: ET.Element) -> str:
+        """Paragraphes, listes (imbriquées par niveau) et tableaux de parent."""
+        html = []
+        pile: List[str] = []  # balises de liste ouvertes, chacune avec un <li> ouvert
+
+        def fermer(jusqua: int) -> None:
+            while len(pile) > jusqua:
+                html.append(f"</li></{pile.pop()}>")
+
+        for enfant in parent:
+            if enfant.tag == W + "sdt":
+                contenu = enfant.find(W + "sdtContent")
+                if contenu is not None:
+                    fermer(0)
+                    html.append(self.blocs(contenu))
+                continue
+            if enfant.tag == W + "tbl":
+                fermer(0)
+                html.append(self._tableau(enfant))
+                continue
+            if enfant.tag != W + "p":
+                continue
+            bloc, liste = self._paragraphe(enfant)
+            if not bloc:
+                continue
+            if liste is None:
+                fermer(0)
+                html.append(bloc)
+                continue
+            _, niveau, balise = liste
+            fermer(niveau + 1)
+            if len(pile) == niveau + 1:
+                html.append("</li>")
+            while len(pile) < niveau + 1:
+                pile.append(balise)
+                html.append(f"<{balise}>")
+                if len(pile) < niveau + 1:
+                    # Niveau sauté (premier élément en retrait) : <li> intermédiaire
+                    html.append("<li>")
+            html.append(bloc)
+        fermer(0)
+        return "\n".join(html)
+
+def produire(source: str, dossier: str, cle: str) -> dict:
+    """Convertit un DOCX ; écrit cle.html (fragment) et cle.img.<nom> dans dossier.
+
+    Exécuté dans un processus du pool. Les <img> du fragment pointent
+    vers JETON_IMAGES/<nom>.
+
+    Returns:
+        {"titre", "images": [noms]}
+
+    Raises:
+        ValueError: Archive sans word/document.xml ou sans corps
+    """
+    with zipfile.ZipFile(source) as archive:
+        document = _lire_xml(archive, "word/document.xml")
+        corps = document.find(W + "body") if document is not None else None
+        if corps is None:
+            raise ValueError("word/document.xml absent ou sans corps (pas un document Word)")
+        rendu = _Rendu(archive)
+        fragment = rendu.blocs(corps)
+        for nom, chemin in rendu.images.items():
+            temporaire = os.path.join(dossier, f".{cle}.img.{nom}.{os.getpid()}.tmp")
+            with open(temporaire, "wb") as f:
+                f.write(archive.read(chemin))
+            os.replace(temporaire, os.path.join(dossier, f"{cle}.img.{nom}"))
+    temporaire = os.path.join(dossier, f".{cle}.html.{os.getpid()}.tmp")
+    with open(temporaire, "w", encoding="utf-8") as f:
+        f.write(fragment)
+    os.replace(temporaire, os.path.join(dossier, cle + ".html"))
+    return {"titre": rendu.titre, "images": sorted(rendu.images)}
+
+class LecteurDOCX:
+    """Fragments HTML des DOCX, via le cache.
+
+    Clé du cache = sha256 du DOCX : un document n'est converti qu'une
+    fois ; un échec de conversion (ERREURS_CONVERSION) est mémorisé
+    aussi, un incident d'exécution est seulement compté (nouvel essai à
+    la prochaine construction).
+
+    Args:
+        cache: Espace de cache (Cache(dossier_cache(html), ESPACE))
+        executeur: Pool de processus qui exécute produire()
+        log_func: Fonction de log
+    """
+
+    def __init__(self, cache: Cache, executeur: Executor,
+                 log_func: Callable[[str], None] = print):
+        self.cache = cache
+        self.executeur = executeur
+        self.log = log_func
+        self._verrou = threading.Lock()
+        self.statistiques = {"convertis": 0, "en_cache": 0, "echecs": 0}
+
+    def fragment(self, source: Path) -> Optional[dict]:
+        """{"titre", "html", "images": {nom: chemin en cache}}, None si échec."""
+        cle = empreinte_contenu(source)
+        meta = self.cache.lire_meta(cle)
+        nouveau = meta is None or ("echec" not in meta and self.cache.obtenir(cle, ".html") is None)
+        if nouveau:
+            dossier = self.cache.chemin(cle).parent
+            dossier.mkdir(parents=True, exist_ok=True)
+            try:
+                meta = self.executeur.submit(produire, str(source), str(dossier), cle).result()
+            except ERREURS_CONVERSION as e:
+                meta = {"echec": str(e) or type(e).__name__}
+                self.log(f"✗ Rendu HTML impossible : {source.name} — {meta['echec']}")
+            except Exception as e:
+                self.log(f"✗ Rendu HTML interrompu : {source.name} — {str(e) or type(e).__name__}")
+                with self._verrou:
+                    self.statistiques["echecs"] += 1
+                return None
+            meta["source"] = source.name
+            self.cache.ecrire_meta(cle, meta)
+        with self._verrou:
+            cle_stat = "echecs" if "echec" in meta else ("convertis" if nouveau else "en_cache")
+            self.statistiques[cle_stat] += 1
+        if "echec" in meta:
+            return None
+        return {
+            "titre": meta["titre"],
+            "html": self.cache.chemin(cle, ".html").read_text(encoding="utf-8"),
+            "images": {nom: self.cache.chemin(cle, ".img." + nom) for nom in meta["images"]},
+        }
+
+    def bilan(self) -> str:
+        """Ligne de résumé pour le log de fin de construction."""
+        s = self.statistiques
+        return f"Lecture HTML : {s['convertis']} converti(s), {s['en_cache']} depuis le cache, {s['echecs']} en échec"
+
+def placer_images(images: Dict[str, Path], dossier: Path) -> None:
+    """Lie en dur les images d'un fragment dans son dossier publié."""
+    if not images:
+        return
+    fs = fs_utils.actif()
+    fs.creer_dossier(dossier)
+    for nom, chemin in images.items():
+        fs.placer(chemin, dossier / nom)
+
+# Fin docx_html.py v1.2
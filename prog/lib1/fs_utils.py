@@ -0,0 +1,236 @@
+# fs_utils.py — Version 1.2
+# Système de fichiers de la construction : disque réel ou mémoire (simulation, benchmarks)
+
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional
+
+class Etat(NamedTuple):
+    """Sous-ensemble de os.stat_result utilisé par la construction."""
+    st_size: int
+    st_mtime_ns: int
+
+class Disque:
+    """Opérations de la construction sur le disque.
+
+    Tout ce que la construction écrit (site en préparation, STRUCTURE.py,
+    bascule) passe par le système actif (utiliser()) ; les lectures des
+    sources restent directes.
+    """
+
+    def stat(self, chemin: Path):
+        return os.stat(chemin)
+
+    def existe(self, chemin: Path) -> bool:
+        return os.path.exists(chemin)
+
+    def lire_octets(self, chemin: Path) -> bytes:
+        return Path(chemin).read_bytes()
+
+    def lire_texte(self, chemin: Path) -> str:
+        return self.lire_octets(chemin).decode("utf-8")
+
+    def ecrire_octets(self, chemin: Path, donnees: bytes) -> None:
+        """Écriture atomique (fichier temporaire + renommage) : un lecteur
+        ne voit jamais de fichier à moitié écrit."""
+        chemin = Path(chemin)
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        tmp = chemin.with_name(f".{chemin.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(donnees)
+        os.replace(tmp, chemin)
+
+    def ecrire_texte(self, chemin: Path, contenu: str) -> None:
+        self.ecrire_octets(chemin, contenu.encode("utf-8"))
+
+    def lier(self, source: Path, destination: Path) -> None:
+        """Lien dur (OSError si impossible : l'appelant copie)."""
+        os.link(source, destination)
+
+    def copier(self, source: Path, destination: Path) -> None:
+        """Copie avec date et permissions (shutil.copy2).
+
+        Une destination existante est d'abord retirée : si c'est un lien
+        dur vers le site en ligne, la copie ne doit pas écrire dedans.
+        """
+        Path(destination).unlink(missing_ok=True)
+        shutil.copy2(source, destination)
+
+    def placer(self, source: Path, destination: Path) -> None:
+        """Lien dur, à défaut copie (autre disque, FAT...)."""
+        try:
+            self.lier(source, destination)
+        except OSError:
+            self.copier(source, destination)
+
+    def creer_dossier(self, chemin: Path) -> None:
+        Path(chemin).mkdir(parents=True, exist_ok=True)
+
+    def supprimer(self, chemin: Path) -> None:
+        Path(chemin).unlink(missing_ok=True)
+
+    def supprimer_arbre(self, chemin: Path) -> None:
+        shutil.rmtree(chemin, ignore_errors=True)
+
+    def renommer(self, source: Path, destination: Path) -> None:
+        os.replace(source, destination)
+
+    def fichiers(self, racine: Path) -> Iterator[Path]:
+        """Fichiers sous racine, triés."""
+        chemins = []
+        for dossier, _, noms in os.walk(racine):
+            chemins.extend(Path(dossier, nom) for nom in noms)
+        return iter(sorted(chemins))
+
+class _Fichier(NamedTuple):
+    donnees: Optional[bytes]   # None : contenu de origine (lien/copie)
+    origine: Optional[Path]    # fichier du disque lié ou copié
+    etat: Etat
+    operation: str             # "écrit", "lié", "copié"
+
+class Memoire(Disque):
+    """Système en mémoire : rien n'est écrit sur le disque.
+
+    Avec base (Disque()), les chemins non écrits se lisent sur le disque :
+    simulation d'une construction (--dry-run) qui compare au site en
+    ligne. Sans base, arbre entièrement virtuel (benchmarks).
+
+    Visible du seul processus qui l'a créé : la construction l'utilise
+    avec un exécuteur cpu en threads.
+
+    Args:
+        base: Système lu pour les chemins absents de la mémoire
+    """
+
+    def __init__(self, base: Optional[Disque] = None):
+        self.base = base
+        self._fichiers: Dict[Path, _Fichier] = {}
+        self._dossiers = set()
+        self._effaces = set()
+        self._verrou = threading.RLock()
+
+    def _efface(self, chemin: Path) -> bool:
+        return any(p == chemin or p in chemin.parents for p in self._effaces)
+
+    def _entree(self, chemin: Path) -> Optional[_Fichier]:
+        return self._fichiers.get(Path(chemin))
+
+    def stat(self, chemin: Path):
+        chemin = Path(chemin)
+        with self._verrou:
+            entree = self._entree(chemin)
+            if entree is not None:
+                return entree.etat
+            if self.base is None or self._efface(chemin):
+                raise FileNotFoundError(str(chemin))
+        return self.base.stat(chemin)
+
+    def existe(self, chemin: Path) -> bool:
+        chemin = Path(chemin)
+        with self._verrou:
+            if chemin in self._fichiers or chemin in self._dossiers:
+                return True
+            if self.base is None or self._efface(chemin):
+                return False
+        return self.base.existe(chemin)
+
+    def lire_octets(self, chemin: Path) -> bytes:
+        chemin = Path(chemin)
+        with self._verrou:
+            entree = self._entree(chemin)
+            if entree is None and (self.base is None or self._efface(chemin)):
+                raise FileNotFoundError(str(chemin))
+        if entree is None:
+            return self.base.lire_octets(chemin)
+        if entree.donnees is not None:
+            return entree.donnees
+        return self.lire_octets(entree.origine)
+
+    def ecrire_octets(self, chemin: Path, donnees: bytes) -> None:
+        etat = Etat(len(donnees), time.time_ns())
+        with self._verrou:
+            self._ranger(Path(chemin), _Fichier(bytes(donnees), None, etat, "écrit"))
+
+    def _ranger(self, chemin: Path, entree: _Fichier) -> None:
+        self._fichiers[chemin] = entree
+        self._dossiers.update(chemin.parents)
+
+    def _reprendre(self, source: Path, destination: Path, operation: str) -> None:
+        source = Path(source)
+        with self._verrou:
+            entree = self._entree(source)
+            if entree is None:
+                # Fichier du disque : référencé, pas chargé en mémoire
+                st = self.stat(source)
+                entree = _Fichier(None, source, Etat(st.st_size, st.st_mtime_ns), operation)
+            self._ranger(Path(destination), entree._replace(operation=operation))
+
+    def lier(self, source: Path, destination: Path) -> None:
+        self._reprendre(source, destination, "lié")
+
+    def copier(self, source: Path, destination: Path) -> None:
+        self._reprendre(source, destination, "copié")
+
+    def creer_dossier(self, chemin: Path) -> None:
+        chemin = Path(chemin)
+        with self._verrou:
+            self._dossiers.add(chemin)
+            self._dossiers.update(chemin.parents)
+
+    def supprimer(self, chemin: Path) -> None:
+        chemin = Path(chemin)
+        with self._verrou:
+            self._fichiers.pop(chemin, None)
+            self._effaces.add(chemin)
+
+    def supprimer_arbre(self, chemin: Path) -> None:
+        chemin = Path(chemin)
+        with self._verrou:
+            for p in [p for p in self._fichiers if p == chemin or chemin in p.parents]:
+                del self._fichiers[p]
+            self._dossiers = {d for d in self._dossiers if d != chemin and chemin not in d.parents}
+            self._effaces.add(chemin)
+
+    def renommer(self, source: Path, destination: Path) -> None:
+        source, destination = Path(source), Path(destination)
+        with self._verrou:
+            for p in [p for p in self._fichiers if p == source or source in p.parents]:
+                self._ranger(destination / p.relative_to(source), self._fichiers.pop(p))
+            for d in [d for d in self._dossiers if d == source or source in d.parents]:
+                self._dossiers.discard(d)
+                self._dossiers.add(destination / d.relative_to(source))
+            self._effaces.add(source)
+
+    def fichiers(self, racine: Path) -> Iterator[Path]:
+        """Fichiers écrits, liés ou copiés sous racine, triés."""
+        racine = Path(racine)
+        with self._verrou:
+            chemins = [p for p in self._fichiers if racine in p.parents]
+        return iter(sorted(chemins))
+
+    def operation(self, chemin: Path) -> Optional[str]:
+        """Opération qui a produit chemin ("écrit", "lié", "copié"), None si aucune."""
+        entree = self._entree(chemin)
+        return entree.operation if entree else None
+
+    def origine(self, chemin: Path) -> Optional[Path]:
+        """Fichier du disque lié ou copié en chemin, None si écrit."""
+        entree = self._entree(chemin)
+        return entree.origine if entree else None
+
+# Système actif du processus (disque par défaut)
+_actif: Disque = Disque()
+
+def actif() -> Disque:
+    """Système de fichiers utilisé par la construction."""
+    return _actif
+
+def utiliser(systeme: Disque) -> Disque:
+    """Remplace le système actif et retourne le précédent."""
+    global _actif
+    precedent, _actif = _actif, systeme
+    return precedent
+
+# Fin fs_utils.py v1.2
@@ -1,10 +1,13 @@
-# html_utils.py — Version 1.0
+# html_utils.py — Version 1.11
 # Utilitaires pour génération HTML et interprétation templates
 
 from pathlib import Path
 from datetime import datetime
 import re
-from typing import List
+from html import escape
+from typing import Any, List, Optional
+
+from lib1 import fs_utils
 
 def interpreter_template(contenu: str, variables: dict) -> str:
     """Interprète les variables {{VAR}} dans un template.
@@ -124,12 +127,68 @@ def echapper_accents_html(texte: str) -> str:
             result.append(char)
     return "".join(result)
 
-def generer_debut_html(titre: str, base_path: str) -> str:
+def chemin_base(profondeur: int, base_path: str, relatif: bool) -> str:
+    """Préfixe des liens vers la racine du site depuis une page.
+    
+    Args:
+        profondeur: Nombre de dossiers entre la racine du site et la page
+                    (0 pour html/index.html, 1 pour html/TDM/index.html)
+        base_path: Préfixe absolu (options.BASE_PATH)
+        relatif: Liens relatifs à la page plutôt qu'absolus
+        
+    Returns:
+        base_path, ou "." / "../.." selon la profondeur
+        
+    Example:
+        >>> chemin_base(2, "/Hebreu4.0/html", True) + "/style.css"
+        '../../style.css'
+    """
+    if not relatif:
+        return base_path
+    return "/".join([".."] * profondeur) or "."
+
+def relativiser_liens(contenu: str, base_path: str, base: str) -> str:
+    """Remplace les liens absolus écrits en dur (href="/Hebreu4.0/html/...")
+    par le préfixe de la page (liens relatifs).
+
+    Args:
+        contenu: HTML (entête, pied...)
+        base_path: Préfixe absolu à remplacer (options.BASE_PATH)
+        base: Préfixe de la page (chemin_base)
+
+    Returns:
+        HTML aux liens href/src relatifs
+    """
+    if not base_path or base_path == base:
+        return contenu
+    motif = re.compile(r"""(\b(?:href|src)\s*=\s*["'])""" + re.escape(base_path) + r"""(?=[/"'#?])""")
+    return motif.sub(lambda m: m.group(1) + base, contenu)
+
+def liens_ressources(base_path: str, ressources: Optional[dict] = None) -> str:
+    """Balises <link> de la feuille de style et de l'icône du site.
+    
+    Args:
+        base_path: Chemin de base pour les ressources
+        ressources: {nom logique: nom publié} (lib1.ressources.manifeste) ;
+                    None → style.css sous son nom
+        
+    Returns:
+        HTML des balises <link>
+    """
+    if ressources is None:
+        ressources = {"style.css": "style.css"}
+    liens = [f'<link href="{base_path}/{ressources.get("style.css", "style.css")}" rel="stylesheet"/>']
+    if "favicon.ico" in ressources:
+        liens.append(f'<link href="{base_path}/{ressources["favicon.ico"]}" rel="icon"/>')
+    return "\n    ".join(liens)
+
+def generer_debut_html(titre: str, base_path: str, ressources: Optional[dict] = None) -> str:
     """Génère le début d'un fichier HTML.
     
     Args:
         titre: Titre de la page
         base_path: Chemin de base pour les ressources
+        ressources: Noms publiés des ressources (cf. liens_ressources)
         
     Returns:
         HTML de début
@@ -139,19 +198,25 @@ def generer_debut_html(titre: str, base_path: str) -> str:
 <head>
     <meta charset="utf-8"/>
     <title>{echapper_accents_html(titre)}</title>
-    <link href="{base_path}/style.css" rel="stylesheet"/>
+    {liens_ressources(base_path, ressources)}
 </head>
 <body>"""
 
-def generer_fin_html(version: str = "23.1") -> str:
-    """Génère la fin d'un fichier HTML avec timestamp.
+def generer_fin_html(version: str = "23.1", empreinte: str = "") -> str:
+    """Génère la fin d'un fichier HTML.
     
     Args:
         version: Version du générateur
+        empreinte: Identifiant de construction dérivé du contenu de la page.
+                   Si vide, horodatage (la page change alors à chaque run).
         
     Returns:
         HTML de fin
     """
+    if empreinte:
+        return f"""<!-- Généré par genere_site.py v{version} — empreinte {empreinte} -->
+</body>
+</html>"""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     return f"""<!-- Généré le {timestamp} par genere_site.py v{version} -->
 </body>
@@ -197,14 +262,57 @@ def generer_titre_table(titre: str) -> str:
     titre_html = echapper_accents_html(titre_html)
     return f'<div class="titre-table">{titre_html}</div>'
 
-def generer_table_index(liste_fils: List[dict], ajout_affichage: list, 
-                       lien_souligné: bool = False) -> str:
+def taille_lisible(octets: int) -> str:
+    """Taille en Ko/Mo à la française.
+    
+    Example:
+        >>> taille_lisible(2_500_000)
+        '2,4 Mo'
+    """
+    if octets < 1024 * 1024:
+        return f"{max(1, round(octets / 1024))} Ko"
+    return f"{octets / (1024 * 1024):.1f} Mo".replace(".", ",")
+
+def generer_apercu(apercu: dict, prefixe: str) -> tuple:
+    """Vignette (chargée à la demande) et mention "12 pages, 2,4 Mo" d'un PDF.
+    
+    Args:
+        apercu: {"pages", "octets", "vignette"} (lib1.pdf_apercu.lire_manifeste)
+        prefixe: Dossier des vignettes relatif à la page
+        
+    Returns:
+        (HTML avant le lien, HTML après le lien)
+    """
+    avant = ""
+    if apercu.get("vignette"):
+        avant = f'<img class="vignette" src="{prefixe}/{apercu["vignette"]}" alt="" loading="lazy" decoding="async"/>'
+    details = []
+    if apercu.get("pages"):
+        details.append(f'{apercu["pages"]} page{"s" if apercu["pages"] > 1 else ""}')
+    if apercu.get("octets") is not None:
+        details.append(taille_lisible(apercu["octets"]))
+    apres = f' <span class="details-pdf">({", ".join(details)})</span>' if details else ""
+    return avant, apres
+
+def generer_table_index(liste_fils: List[Any], ajout_affichage: list, 
+                       lien_souligné: bool = False,
+                       chapitres: Optional[dict] = None,
+                       apercus: Optional[dict] = None,
+                       dossier_vignettes: str = "_vignettes",
+                       images: Optional[dict] = None,
+                       lectures: Optional[dict] = None) -> str:
     """Génère le HTML de la table d'index.
     
     Args:
-        liste_fils: Liste des éléments à afficher
+        liste_fils: Éléments à afficher (lib1.modele.Element), triés
         ajout_affichage: Préfixes/suffixes [dossier_pre, dossier_suf, fichier_pre, fichier_suf]
         lien_souligné: Souligner les liens
+        chapitres: {nom_html: [(titre, lien)]} des PDF découpés, listés
+                   sous le lien du PDF complet
+        apercus: {nom_html: aperçu} des PDF (cf. generer_apercu)
+        dossier_vignettes: Dossier des vignettes relatif à la page
+        images: {nom_html: balise <img>} des images (lib1.images.balise_img)
+        lectures: {nom_html: page de lecture HTML} des PDF issus d'un DOCX
         
     Returns:
         HTML de la table
@@ -213,23 +321,53 @@ def generer_table_index(liste_fils: List[dict], ajout_affichage: list,
     lignes = []
     
     for fils in liste_fils:
-        if not fils.get("affiché_index", True):
+        if not fils.affiche_index:
             continue
         
-        nom_affiché = fils.get("nom_affiché", fils.get("nom_document", ""))
-        nom_html = appliquer_mini_markdown(nom_affiché)
+        nom_html = appliquer_mini_markdown(fils.nom_affiche)
         nom_html = echapper_accents_html(nom_html)
         
-        if fils.get("genre") == "dossier":
-            if fils.get("ajout_affichage", True):
+        if fils.genre == "dossier":
+            if fils.ajout_affichage:
                 nom_html = f"{ajout_affichage[0]}{nom_html}{ajout_affichage[1]}"
-            lignes.append(f'<a class="dossier-item" style="{style_a}" href="{fils["nom_html"]}/index.html">{nom_html}</a><br>')
+            lignes.append(f'<a class="dossier-item" style="{style_a}" href="{fils.nom_html}/index.html">{nom_html}</a><br>')
         else:
-            if fils.get("ajout_affichage", True):
+            if fils.ajout_affichage:
                 nom_html = f"{ajout_affichage[2]}{nom_html}{ajout_affichage[3]}"
-            lignes.append(f'<a class="dossier-item" style="{style_a}" href="{fils["nom_html"]}">{nom_html}</a><br>')
+            avant, apres = "", ""
+            if apercus and fils.nom_html in apercus:
+                avant, apres = generer_apercu(apercus[fils.nom_html], dossier_vignettes)
+            elif images and fils.nom_html in images:
+                avant = images[fils.nom_html]
+            if lectures and fils.nom_html in lectures:
+                apres += f' <a class="lecture-item" style="{style_a}" href="{lectures[fils.nom_html]}">lire en ligne</a>'
+            lignes.append(f'{avant}<a class="dossier-item" style="{style_a}" href="{fils.nom_html}">{nom_html}</a>{apres}<br>')
+            for titre, lien in (chapitres or {}).get(fils.nom_html, []):
+                titre_html = echapper_accents_html(escape(titre))
+                lignes.append(f'<a class="chapitre-item" style="{style_a}" href="{lien}">{titre_html}</a><br>')
     
     contenu = "".join(lignes)
     return f'<div class="table-container"><table class="dossiers"><tbody><tr><td>{contenu}</td></tr></tbody></table></div>'
 
-# Fin html_utils.py v1.0
+def embellir(html_brut: str) -> str:
+    """Indente le HTML (BeautifulSoup.prettify).
+    
+    bs4 importé au premier appel : une exécution qui ne rend aucune page
+    ne le charge pas.
+    """
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html_brut, 'html.parser').prettify()
+
+def ecrire_page(chemin: Path, contenu: str) -> None:
+    """Écrit une page de façon atomique (fichier temporaire + renommage).
+    
+    Un lecteur (serveur local, synchronisation) ne voit jamais de page
+    à moitié écrite.
+    
+    Args:
+        chemin: Fichier cible
+        contenu: HTML à écrire
+    """
+    fs_utils.actif().ecrire_texte(chemin, contenu)
+
+# Fin html_utils.py v1.11
@@ -0,0 +1,301 @@
+# images.py — Version 1.3
+# Variantes d'images jpg/png par largeur (et WebP), balises <img> srcset à chargement différé
+
+import importlib.util
+import os
+import re
+import struct as binaire
+import threading
+from concurrent.futures import Executor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from lib1 import fs_utils
+from lib1.cache_utils import Cache
+
+# Révision des variantes (largeurs, qualité) : la changer invalide le cache
+ESPACE = "images-1"
+_SUFFIXE_LARGEUR = re.compile(r"^-(\d+)w(\.\w+)$")
+LARGEURS = (320, 640, 1280)
+EXTENSIONS = (".jpg", ".jpeg", ".png")
+QUALITE_JPEG = 85
+QUALITE_WEBP = 80
+
+@lru_cache(maxsize=1)
+def disponible() -> bool:
+    """True si Pillow est installé (sans l'importer)."""
+    return importlib.util.find_spec("PIL") is not None
+
+@lru_cache(maxsize=1)
+def webp_disponible() -> bool:
+    """True si Pillow sait encoder le WebP (libwebp)."""
+    if not disponible():
+        return False
+    from PIL import features
+    return bool(features.check("webp"))
+
+def dimensions(chemin: Path) -> Optional[Tuple[int, int]]:
+    """(largeur, hauteur) lues dans l'en-tête PNG ou JPEG, sans Pillow."""
+    try:
+        with open(chemin, "rb") as f:
+            entete = f.read(26)
+            if entete[:8] == b"\x89PNG\r\n\x1a\n":
+                return binaire.unpack(">II", entete[16:24])
+            if entete[:2] != b"\xff\xd8":
+                return None
+            f.seek(2)
+            while True:
+                marqueur = f.read(2)
+                if len(marqueur) < 2 or marqueur[0] != 0xFF:
+                    return None
+                longueur = binaire.unpack(">H", f.read(2))[0]
+                # SOF0..SOF15 sauf DHT (C4), JPG (C8), DAC (CC)
+                if 0xC0 <= marqueur[1] <= 0xCF and marqueur[1] not in (0xC4, 0xC8, 0xCC):
+                    hauteur, largeur = binaire.unpack(">xHH", f.read(5))
+                    return largeur, hauteur
+                f.seek(longueur - 2, os.SEEK_CUR)
+    except (OSError, binaire.error):
+        return None
+
+def variantes(nom: str, largeur: int) -> List[Tuple[str, int]]:
+    """(nom de fichier, largeur) des variantes produites pour une image.
+
+    Une variante par largeur de LARGEURS inférieure à l'originale, au
+    format d'origine et en WebP ; plus l'originale en WebP.
+
+    Example:
+        >>> variantes("potier.png", 800)   # avec WebP
+        [('potier-320w.png', 320), ('potier-320w.webp', 320),
+         ('potier-640w.png', 640), ('potier-640w.webp', 640), ('potier.webp', 800)]
+    """
+    if not disponible() or os.path.splitext(nom)[1].lower() not in EXTENSIONS:
+        return []
+    radical, extension = os.path.splitext(nom)
+    formats = [extension] + ([".webp"] if webp_disponible() else [])
+    resultat = [(f"{radical}-{l}w{ext}", l) for l in LARGEURS if l < largeur for ext in formats]
+    if webp_disponible():
+        resultat.append((f"{radical}.webp", largeur))
+    return resultat
+
+def illisible(erreur: BaseException) -> bool:
+    """True si erreur vient de l'image elle-même : mémorisée. Les autres
+    (pool interrompu, mémoire, disque) sont des incidents d'exécution :
+    nouvel essai à la construction suivante.
+
+    Pillow signale une image tronquée ou inconnue par un OSError sans
+    errno ; les erreurs du système en portent un.
+    """
+    from PIL import Image
+    if isinstance(erreur, (Image.DecompressionBombError, SyntaxError, ValueError)):
+        return True
+    return isinstance(erreur, OSError) and erreur.errno is None
+
+def produire(source: str, dossier: str, cle: str) -> List[str]:
+    """Écrit les variantes de source dans dossier, nommées cle + suffixe.
+
+    Exécuté dans un processus du pool. Les métadonnées EXIF (orientation)
+    sont conservées.
+
+    Returns:
+        Suffixes écrits ("-320w.png", ".webp"...)
+    """
+    from PIL import Image
+    # Extension en minuscules comme le nom publié (normaliser_nom)
+    nom = os.path.basename(source).lower()
+    radical = os.path.splitext(nom)[0]
+    ecrits = []
+    with Image.open(source) as originale:
+        originale.load()
+        exif = originale.info.get("exif", b"")
+        image = originale
+        if image.mode not in ("RGB", "RGBA", "L"):
+            # Palette, CMJN... : redimensionnement et WebP en RGB(A)
+            alpha = "A" in image.mode or "transparency" in image.info
+            image = image.convert("RGBA" if alpha else "RGB")
+        for fichier, largeur in variantes(nom, image.width):
+            suffixe = fichier[len(radical):]
+            cible = os.path.join(dossier, f".{cle}{suffixe}.{os.getpid()}.tmp")
+            copie = image
+            if largeur < image.width:
+                hauteur = max(1, round(image.height * largeur / image.width))
+                copie = image.resize((largeur, hauteur), Image.LANCZOS)
+            if suffixe.endswith(".webp"):
+                copie.save(cible, "WEBP", quality=QUALITE_WEBP, method=6, exif=exif)
+            elif suffixe.lower().endswith(".png"):
+                copie.save(cible, "PNG", optimize=True)
+            else:
+                copie.convert("RGB").save(cible, "JPEG", quality=QUALITE_JPEG,
+                                          optimize=True, progressive=True, exif=exif)
+            os.replace(cible, os.path.join(dossier, cle + suffixe))
+            ecrits.append(suffixe)
+    return ecrits
+
+class VariantesImages:
+    """Place à côté de chaque image copiée ses variantes, via le cache.
+
+    Clé du cache = sha256 de l'image : une image n'est traitée qu'une
+    fois ; ensuite ses variantes sont liées en dur.
+
+    Args:
+        cache: Espace de cache (Cache(dossier_cache(html), ESPACE))
+        executeur: Pool de processus qui exécute produire()
+        log_func: Fonction de log
+    """
+
+    def __init__(self, cache: Cache, executeur: Executor,
+                 log_func: Callable[[str], None] = print):
+        self.cache = cache
+        self.executeur = executeur
+        self.log = log_func
+        self._verrou = threading.Lock()
+        self.statistiques = {"produites": 0, "en_cache": 0, "echecs": 0}
+
+    def placer(self, source: Path, destination: Path) -> int:
+        """Place les variantes de source à côté de destination.
+
+        Returns:
+            Nombre de variantes placées
+        """
+        cle = self.cache.empreinte(source)
+        meta = self.cache.lire_meta(cle)
+        nouveau = meta is None or ("echec" not in meta and not all(
+            self.cache.obtenir(cle, s) for s in meta["suffixes"]))
+        if nouveau:
+            dossier = self.cache.chemin(cle).parent
+            dossier.mkdir(parents=True, exist_ok=True)
+            try:
+                suffixes = self.executeur.submit(produire, str(source), str(dossier), cle).result()
+                meta = {"source": source.name, "suffixes": suffixes}
+            except Exception as e:
+                if not illisible(e):
+                    # Incident d'exécution : signalé, non mémorisé
+                    self.log(f"✗ Variantes interrompues : {source.name} — {str(e) or type(e).__name__}")
+                    with self._verrou:
+                        self.statistiques["echecs"] += 1
+                    return 0
+                # Image illisible : mémorisée, pas de nouvel essai à chaque construction
+                meta = {"source": source.name, "suffixes": [], "echec": str(e) or type(e).__name__}
+                self.log(f"✗ Variantes impossibles : {source.name} — {meta['echec']}")
+            self.cache.ecrire_meta(cle, meta)
+
+        radical = os.path.splitext(destination.name)[0]
+        for suffixe in meta["suffixes"]:
+            fs_utils.actif().placer(self.cache.chemin(cle, suffixe), destination.with_name(radical + suffixe))
+        with self._verrou:
+            if meta.get("echec"):
+                self.statistiques["echecs"] += 1
+            else:
+                self.statistiques["produites" if nouveau else "en_cache"] += 1
+        return len(meta["suffixes"])
+
+    def bilan(self) -> str:
+        """Ligne de résumé pour le log de fin de construction."""
+        s = self.statistiques
+        return (f"Images : {s['produites']} déclinée(s), {s['en_cache']} depuis le cache, "
+                f"{s['echecs']} en échec" + ("" if webp_disponible() else " (WebP indisponible)"))
+
+def produites(cache: Cache, source: Path) -> List[str]:
+    """Suffixes ("-320w.png", ".webp"...) des variantes effectivement
+    produites pour source, d'après la méta du cache ; [] si l'image n'a
+    pas encore été traitée ou si la production a échoué.
+
+    L'image n'est pas relue : la clé est celle mémorisée par placer().
+    """
+    try:
+        cle = cache.empreinte(source, calculer=False)
+    except OSError:
+        return []
+    if cle is None:
+        return []
+    meta = cache.lire_meta(cle)
+    if not meta or meta.get("echec"):
+        return []
+    return list(meta.get("suffixes", []))
+
+# --- Balises ----------------------------------------------------------------
+
+def balise_img(src: str, largeur: int, hauteur: int, attributs: str = "",
+               tailles: str = "", suffixes: Sequence[str] = ()) -> str:
+    """<img> (dans un <picture> si WebP) avec srcset des variantes.
+
+    Seules les variantes produites (suffixes) sont référencées : sans
+    elles, l'image garde son seul src.
+
+    Args:
+        src: URL de l'image d'origine, telle qu'écrite dans la page
+        largeur, hauteur: Dimensions de l'originale
+        attributs: Autres attributs de la balise (alt, class...) ; s'ils
+                   fixent width/height, les dimensions ne sont pas ajoutées
+        tailles: Attribut sizes ; par défaut la largeur d'origine au plus
+        suffixes: Variantes placées à côté de l'image (produites())
+
+    Returns:
+        HTML de l'image à chargement différé
+    """
+    dossier, _, nom = src.rpartition("/")
+    prefixe = f"{dossier}/" if dossier else ""
+    radical, extension = os.path.splitext(nom)
+    liste = []
+    for suffixe in suffixes:
+        m = _SUFFIXE_LARGEUR.match(suffixe)
+        if m and int(m.group(1)) < largeur:
+            liste.append((f"{radical}{suffixe}", int(m.group(1))))
+    webp = ".webp" in suffixes
+    tailles = tailles or f"(max-width: {largeur}px) 100vw, {largeur}px"
+
+    def srcset(ext: str, originale: str) -> str:
+        entrees = [f"{prefixe}{fichier} {l}w" for fichier, l in liste
+                   if fichier.lower().endswith(ext.lower())]
+        return ", ".join(entrees + [f"{originale} {largeur}w"])
+
+    morceaux = [f'src="{src}"']
+    if any(fichier.lower().endswith(extension.lower()) for fichier, _ in liste):
+        morceaux.append(f'srcset="{srcset(extension, src)}" sizes="{tailles}"')
+    if not re.search(r"\b(width|height)\s*=", attributs, re.IGNORECASE):
+        morceaux.append(f'width="{largeur}" height="{hauteur}"')
+    morceaux.append('loading="lazy" decoding="async"')
+    if attributs.strip():
+        morceaux.append(attributs.strip())
+    img = f"<img {' '.join(morceaux)}/>"
+    if not webp:
+        return img
+    sources = srcset(".webp", f"{prefixe}{radical}.webp")
+    return f'<picture><source type="image/webp" srcset="{sources}" sizes="{tailles}"/>{img}</picture>'
+
+_IMG = re.compile(r"<img\b([^>]*?)/?>", re.IGNORECASE)
+_SRC = re.compile(r"""\bsrc\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+def enrichir_images(contenu: str, base: str, trouver_source: Callable[[str], Optional[Path]],
+                    suffixes: Callable[[Path], Sequence[str]]) -> str:
+    """Ajoute srcset et chargement différé aux <img> d'un entête/pied.
+
+    Seules les images du site (src commençant par base/) sans srcset
+    sont modifiées ; leurs dimensions sont lues dans la source.
+
+    Args:
+        contenu: HTML interprété
+        base: Préfixe des liens vers la racine du site depuis la page
+        trouver_source: Chemin relatif à la racine du site → image source
+        suffixes: Image source → variantes produites (produites())
+    """
+    if not disponible():
+        return contenu
+
+    def remplacer(m: re.Match) -> str:
+        attributs = m.group(1)
+        src = _SRC.search(attributs)
+        if not src or "srcset" in attributs.lower() or not src.group(1).startswith(base + "/"):
+            return m.group(0)
+        source = trouver_source(src.group(1)[len(base) + 1:])
+        taille = dimensions(source) if source else None
+        if not taille:
+            return m.group(0)
+        autres = _SRC.sub("", attributs)
+        autres = re.sub(r"""\b(loading|decoding)\s*=\s*["'][^"']*["']""", "", autres)
+        return balise_img(src.group(1), *taille, re.sub(r"\s+", " ", autres),
+                          suffixes=suffixes(source))
+
+    return _IMG.sub(remplacer, contenu)
+
+# Fin images.py v1.3
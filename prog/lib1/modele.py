@@ -0,0 +1,227 @@
+# modele.py — Version 1.2
+# Modèle typé d'un dossier DOCUMENTS et de ses éléments (contenu de STRUCTURE.py)
+
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from lib1 import structure_utils as struct
+
+# Champs d'affichage à templates {{variable}}, résolus à la première lecture
+CHAMPS_NOMS = {"nom_affiché": "_nom_affiche", "nom_TDM": "_nom_tdm", "nom_navigation": "_nom_navigation"}
+
+# Clés d'un élément dans l'ordre d'écriture de STRUCTURE.py (cf. ajouter_element_structure)
+ORDRE_CLES = ("nom_document", "nom_html", "nom_affiché", "nom_TDM", "ajout_affichage",
+              "affiché_index", "affiché_TDM", "position", "nom_navigation", "empreinte",
+              "chapitres")
+
+GENRES = {"dossiers": "dossier", "fichiers": "fichier"}
+
+def _interner(valeur: Any) -> Any:
+    """Partage les chaînes répétées d'un dossier à l'autre (templates...)."""
+    return sys.intern(valeur) if type(valeur) is str else valeur
+
+class Element:
+    """Élément (sous-dossier ou fichier) d'un dossier.
+
+    Un objet à attributs fixes (__slots__) au lieu d'un dict copié et
+    complété à chaque étape. Les booléens absents de STRUCTURE.py restent
+    None (valeur par défaut appliquée à la lecture, rien d'ajouté à
+    l'écriture) ; les noms affichés sont résolus une seule fois, au
+    premier accès.
+    """
+
+    __slots__ = ("genre", "nom_document", "nom_html", "position", "empreinte",
+                 "_ajout_affichage", "_affiche_index", "_affiche_tdm", "_chapitres",
+                 "_nom_affiche", "_nom_tdm", "_nom_navigation",
+                 "_resolus", "_autres", "_cles", "parent")
+
+    def __init__(self, genre: str, item: dict, parent: "Dossier"):
+        self.genre = sys.intern(genre)
+        self.nom_document = item.get("nom_document", "")
+        self.nom_html = item.get("nom_html", "")
+        self.position = item.get("position")
+        self.empreinte = item.get("empreinte")
+        self._ajout_affichage = item.get("ajout_affichage")
+        self._affiche_index = item.get("affiché_index")
+        self._affiche_tdm = item.get("affiché_TDM")
+        self._chapitres = item.get("chapitres")
+        self._nom_affiche = _interner(item.get("nom_affiché"))
+        self._nom_tdm = _interner(item.get("nom_TDM"))
+        self._nom_navigation = _interner(item.get("nom_navigation"))
+        self._resolus = None
+        autres = {k: v for k, v in item.items() if k not in ORDRE_CLES}
+        self._autres = autres or None
+        self._cles = tuple(item)
+        self.parent = parent
+
+    # --- Valeurs effectives -------------------------------------------------
+
+    @property
+    def rang(self) -> int:
+        """Clé de tri (position absente = en fin de liste)."""
+        return 9999 if self.position is None else self.position
+
+    @property
+    def ajout_affichage(self) -> bool:
+        return self._ajout_affichage is not False
+
+    @property
+    def affiche_index(self) -> bool:
+        return self._affiche_index is not False
+
+    @property
+    def affiche_tdm(self) -> bool:
+        return self._affiche_tdm is not False
+
+    @property
+    def chapitres(self) -> bool:
+        """PDF à découper par signets (opt-in, "chapitres": True)."""
+        return self._chapitres is True
+
+    def _resoudre(self) -> tuple:
+        if self._resolus is None:
+            bruts = {champ: getattr(self, attr) for champ, attr in CHAMPS_NOMS.items()
+                     if getattr(self, attr) is not None}
+            variables = {
+                "nom_document": self.nom_document,
+                "titre_dossier": self.parent.get("titre_dossier", "") if self.parent else "",
+            }
+            resolus = struct.resoudre_templates_runtime(bruts, variables)
+            self._resolus = tuple(resolus.get(champ) for champ in CHAMPS_NOMS)
+        return self._resolus
+
+    @property
+    def nom_affiche(self) -> str:
+        valeur = self._resoudre()[0]
+        return self.nom_document if valeur is None else valeur
+
+    @property
+    def nom_tdm(self) -> str:
+        valeur = self._resoudre()[1]
+        return self.nom_affiche if valeur is None else valeur
+
+    @property
+    def nom_navigation(self) -> str:
+        valeur = self._resoudre()[2]
+        return self.nom_document if valeur is None else valeur
+
+    # --- Valeurs brutes (templates non résolus) -----------------------------
+
+    def brut(self, champ: str) -> Optional[str]:
+        """Valeur telle qu'écrite dans STRUCTURE.py ("nom_affiché"...)."""
+        return getattr(self, CHAMPS_NOMS[champ])
+
+    def definir(self, champ: str, valeur: str) -> None:
+        """Modifie un champ d'affichage (résolution refaite au prochain accès)."""
+        setattr(self, CHAMPS_NOMS[champ], _interner(valeur))
+        self._resolus = None
+
+    def vers_dict(self) -> dict:
+        """Élément au format STRUCTURE.py.
+
+        Les clés lues gardent leur ordre d'origine, les clés ajoutées
+        depuis suivent dans l'ordre d'écriture ; seules les valeurs None
+        (absentes) sont omises, une chaîne vide est conservée.
+        """
+        valeurs = {
+            "nom_document": self.nom_document,
+            "nom_html": self.nom_html,
+            "nom_affiché": self._nom_affiche,
+            "nom_TDM": self._nom_tdm,
+            "ajout_affichage": self._ajout_affichage,
+            "affiché_index": self._affiche_index,
+            "affiché_TDM": self._affiche_tdm,
+            "position": self.position,
+            "nom_navigation": self._nom_navigation,
+            "empreinte": self.empreinte,
+            "chapitres": self._chapitres,
+        }
+        if self._autres:
+            valeurs.update(self._autres)
+        cles = self._cles + tuple(c for c in ORDRE_CLES if c not in self._cles)
+        return {cle: valeurs[cle] for cle in cles if valeurs.get(cle) is not None}
+
+    def __repr__(self) -> str:
+        return f"Element({self.genre}, {self.nom_document!r}, position={self.position})"
+
+class Dossier:
+    """Dossier DOCUMENTS : réglages de STRUCTURE.py et éléments triés.
+
+    Les éléments (sous-dossiers puis fichiers) sont triés une fois par
+    position à la construction ; l'ordre est stable, à position égale un
+    sous-dossier précède un fichier.
+
+    Args:
+        chemin: Dossier DOCUMENTS
+        structure: Contenu de STRUCTURE.py
+    """
+
+    __slots__ = ("chemin", "reglages", "elements", "_index", "_cles")
+
+    def __init__(self, chemin: Path, structure: dict):
+        self.chemin = Path(chemin)
+        self.reglages = {cle: _interner(valeur) for cle, valeur in structure.items()
+                         if cle not in GENRES}
+        elements = [
+            Element(genre, item, self)
+            for categorie, genre in GENRES.items()
+            for item in structure.get(categorie, [])
+        ]
+        elements.sort(key=lambda e: e.rang)
+        self.elements: List[Element] = elements
+        self._index: Optional[Dict[tuple, Element]] = None
+        self._cles = tuple(structure)
+
+    @classmethod
+    def charger(cls, chemin: Path) -> "Dossier":
+        """Dossier depuis son STRUCTURE.py (vide si absent)."""
+        return cls(chemin, struct.charger_structure(Path(chemin)))
+
+    def get(self, cle: str, defaut: Any = None) -> Any:
+        """Réglage du dossier (titre_dossier, entete, navigation...)."""
+        return self.reglages.get(cle, defaut)
+
+    def dossiers(self) -> List[Element]:
+        """Sous-dossiers, par position."""
+        return [e for e in self.elements if e.genre == "dossier"]
+
+    def fichiers(self) -> List[Element]:
+        """Fichiers, par position."""
+        return [e for e in self.elements if e.genre == "fichier"]
+
+    def element(self, nom_document: str, genre: str = "dossier") -> Optional[Element]:
+        """Élément par nom (index construit au premier appel)."""
+        if self._index is None:
+            self._index = {(e.genre, e.nom_document): e for e in self.elements}
+        return self._index.get((genre, nom_document))
+
+    def retirer(self, element: Element) -> None:
+        """Retire un élément."""
+        self.elements.remove(element)
+        self._index = None
+
+    def existants(self, existe: Callable[[Path], bool] = Path.exists,
+                  log_func: Callable[[str], None] = print) -> List[Element]:
+        """Éléments dont le fichier/dossier existe (les autres signalés)."""
+        presents = []
+        for e in self.elements:
+            if existe(self.chemin / e.nom_document):
+                presents.append(e)
+            else:
+                log_func(f"Élément ignoré (inexistant): {e.nom_document}")
+        return presents
+
+    def vers_structure(self) -> dict:
+        """Contenu de STRUCTURE.py (pour struct.sauvegarder_structure),
+        clés dans l'ordre du fichier lu."""
+        valeurs = dict(self.reglages)
+        valeurs["dossiers"] = [e.vers_dict() for e in self.dossiers()]
+        valeurs["fichiers"] = [e.vers_dict() for e in self.fichiers()]
+        cles = self._cles + tuple(c for c in valeurs if c not in self._cles)
+        return {cle: valeurs[cle] for cle in cles if cle in valeurs}
+
+    def __repr__(self) -> str:
+        return f"Dossier({str(self.chemin)!r}, {len(self.elements)} éléments)"
+
+# Fin modele.py v1.2
@@ -0,0 +1,116 @@
+# noms_utils.py — Version 1.1
+# Normalisation des noms pour URL, table des URL du site, index des noms d'un dossier
+
+import os
+import unicodedata
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EXTENSIONS_SOURCES = (".doc", ".docx")
+
+@lru_cache(maxsize=65536)
+def normaliser_nom(nom: str) -> str:
+    """Normalise nom pour URL.
+    
+    Mémoïsée : appelée pour chaque partie de chemin de chaque page et de
+    chaque fichier copié, toujours sur les mêmes noms.
+    """
+    nom = unicodedata.normalize('NFD', nom)
+    nom = ''.join(c for c in nom if unicodedata.category(c) != 'Mn')
+    nom = nom.replace("'", "_")
+    nom = nom.replace(" ", "_")
+    return nom.lower()
+
+def normaliser_chemin(chemin: PurePath) -> Path:
+    """Chemin relatif DOCUMENTS → chemin relatif HTML (chaque partie normalisée)."""
+    return Path(*(normaliser_nom(part) for part in chemin.parts))
+
+class TableURL:
+    """Table du site : chemin HTML normalisé → chemin source.
+
+    Deux sources différentes qui se normalisent vers le même chemin
+    (ex: "Leçon 1.pdf" et "lecon 1.pdf") s'écraseraient dans html/ ;
+    enregistrer toutes les sorties avant toute écriture permet de les
+    signaler d'abord.
+    """
+
+    def __init__(self):
+        self._sources: Dict[Path, Path] = {}
+        self._collisions: Dict[Path, List[Path]] = {}
+
+    def enregistrer(self, cible: PurePath, source: PurePath) -> bool:
+        """Réserve cible pour source.
+
+        Returns:
+            False si cible est déjà réservée par une autre source
+        """
+        cible, source = Path(cible), Path(source)
+        existante = self._sources.setdefault(cible, source)
+        if existante == source:
+            return True
+        self._collisions.setdefault(cible, [existante])
+        if source not in self._collisions[cible]:
+            self._collisions[cible].append(source)
+        return False
+
+    def source(self, cible: PurePath) -> Optional[Path]:
+        """Source qui a réservé cible."""
+        return self._sources.get(Path(cible))
+
+    def collisions(self) -> List[Tuple[Path, List[Path]]]:
+        """(cible, sources en conflit), dans l'ordre des cibles."""
+        return sorted(self._collisions.items())
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+class IndexNoms:
+    """Index des fichiers d'un dossier par radical normalisé.
+
+    Construit une fois depuis la liste du scan : l'appariement PDF ↔ DOCX
+    et la recherche de doublons deviennent des accès dictionnaire au lieu
+    d'un parcours du dossier (et d'une normalisation par fichier) pour
+    chaque PDF.
+
+    Args:
+        noms: Noms des fichiers du dossier
+    """
+
+    __slots__ = ("_par_radical",)
+
+    def __init__(self, noms: Iterable[str]):
+        self._par_radical: Dict[str, List[str]] = {}
+        for nom in noms:
+            radical = os.path.splitext(nom)[0]
+            self._par_radical.setdefault(normaliser_nom(radical), []).append(nom)
+
+    def variantes(self, nom: str) -> List[str]:
+        """Fichiers du dossier de même radical normalisé que nom."""
+        return self._par_radical.get(normaliser_nom(os.path.splitext(nom)[0]), [])
+
+    def source_docx(self, nom_pdf: str) -> Optional[str]:
+        """DOCX (ou DOC) dont nom_pdf est la conversion, None sinon."""
+        for nom in self.variantes(nom_pdf):
+            if os.path.splitext(nom)[1].lower() in EXTENSIONS_SOURCES:
+                return nom
+        return None
+
+    def a_source_docx(self, nom_pdf: str) -> bool:
+        """True si nom_pdf est dérivé d'un DOCX du dossier."""
+        return self.source_docx(nom_pdf) is not None
+
+    def doublons(self) -> Dict[str, List[str]]:
+        """Radicaux normalisés produits par plusieurs DOCX/DOC.
+
+        Ex: "Leçon 1.docx" et "Lecon 1.doc" convertis tous deux en
+        lecon_1.pdf, l'un écrase l'autre.
+        """
+        resultat = {}
+        for radical, noms in self._par_radical.items():
+            sources = [n for n in noms if os.path.splitext(n)[1].lower() in EXTENSIONS_SOURCES]
+            if len(sources) > 1:
+                resultat[radical] = sources
+        return resultat
+
+# Fin noms_utils.py v1.1
@@ -1,7 +1,6 @@
-# options.py — Version 1.2
+# options.py — Version 1.3
 
-version = ("options.py", "1.2")
-print(f"[Import] {version[0]} - Version {version[1]} chargé")
+version = ("options.py", "1.3")
 
 # Chemins relatifs ou absolus selon ton environnement
 DOSSIER_RACINE = r"C:\SiteGITHUB\Hebreu4.0"
@@ -14,4 +13,4 @@ DOSSIER_HTML = f"{DOSSIER_RACINE}\\html"
 BASE_PATH = "/Hebreu4.0/html"  # ← Modifier ici : "" pour local, "/Hebreu4.0/html" pour GitHub
 #BASE_PATH = ""  # ← Modifier ici : "" pour local, "/Hebreu4.0" pour GitHub
 
-# fin du "options.py" version "1.2"
\ No newline at end of file
+# fin du "options.py" version "1.3"
\ No newline at end of file
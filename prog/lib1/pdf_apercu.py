@@ -0,0 +1,140 @@
+# pdf_apercu.py — Version 1.3
+# Aperçu des PDF pour les pages index : nombre de pages, taille, vignette de la première page
+
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional
+
+from lib1 import fs_utils, publication
+from lib1.cache_utils import Cache
+
+# Révision des aperçus (largeur, format) : la changer invalide le cache
+ESPACE = "pdf-apercu-1"
+LARGEUR_VIGNETTE = 120  # pixels
+DOSSIER_VIGNETTES = "_vignettes"
+MANIFESTE = "apercus.json"
+
+def moteur_vignettes() -> Optional[str]:
+    """Outil local de rendu de la première page : "fitz" (PyMuPDF),
+    "pdftoppm" (poppler), ou None (aperçu sans vignette)."""
+    if importlib.util.find_spec("fitz") is not None:
+        return "fitz"
+    if shutil.which("pdftoppm"):
+        return "pdftoppm"
+    return None
+
+def compter_pages(source: Path) -> Optional[int]:
+    """Nombre de pages (pikepdf, à défaut fitz), None si aucun n'est installé."""
+    if importlib.util.find_spec("pikepdf") is not None:
+        import pikepdf
+        with pikepdf.open(source) as document:
+            return len(document.pages)
+    if importlib.util.find_spec("fitz") is not None:
+        import fitz
+        with fitz.open(source) as document:
+            return document.page_count
+    return None
+
+def rendre_vignette(source: Path, destination: Path, moteur: str) -> None:
+    """Première page de source en PNG de LARGEUR_VIGNETTE pixels de large."""
+    if moteur == "fitz":
+        import fitz
+        with fitz.open(source) as document:
+            page = document[0]
+            zoom = LARGEUR_VIGNETTE / page.rect.width
+            page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).save(str(destination))
+    else:
+        # pdftoppm ajoute lui-même l'extension .png au préfixe
+        prefixe = destination.with_name(destination.name + ".rendu")
+        subprocess.run(
+            ["pdftoppm", "-png", "-singlefile", "-f", "1", "-l", "1",
+             "-scale-to-x", str(LARGEUR_VIGNETTE), "-scale-to-y", "-1",
+             str(source), str(prefixe)],
+            check=True, capture_output=True, timeout=120,
+        )
+        os.replace(prefixe.with_name(prefixe.name + ".png"), destination)
+
+def erreurs_document() -> tuple:
+    """Exceptions d'un PDF illisible : mémorisées. Les autres (pdftoppm
+    trop long, pool interrompu, mémoire, disque) sont des incidents
+    d'exécution : nouvel essai à la construction suivante."""
+    erreurs = [ValueError, subprocess.CalledProcessError]
+    if importlib.util.find_spec("pikepdf") is not None:
+        import pikepdf
+        erreurs.append(pikepdf.PdfError)
+    if importlib.util.find_spec("fitz") is not None:
+        import fitz
+        erreurs.append(getattr(fitz, "FileDataError", RuntimeError))
+    return tuple(erreurs)
+
+def analyser(source: Path, cache: Cache, moteur: Optional[str],
+             etat: Optional[os.stat_result] = None) -> dict:
+    """Aperçu d'un PDF, calculé une fois par contenu.
+
+    Args:
+        etat: stat de source s'il est déjà connu (scanner) : un PDF
+              inchangé (taille, date) n'est pas relu pour trouver sa clé
+
+    Returns:
+        {"cle", "pages" (None si inconnu), "vignette" (True si rendue)}
+    """
+    cle = cache.empreinte(source, etat)
+    meta = cache.lire_meta(cle)
+    # Entrée sans vignette reprise si un outil de rendu est apparu depuis
+    if meta is not None and (meta["vignette"] or moteur is None or meta.get("echec")):
+        meta["vignette"] = meta["vignette"] and cache.obtenir(cle, ".png") is not None
+        return dict(meta, cle=cle)
+
+    meta = {"source": source.name, "pages": None, "vignette": False}
+    try:
+        meta["pages"] = compter_pages(source)
+        if moteur and meta["pages"] != 0:
+            temporaire = cache.temporaire(cle, ".png")
+            rendre_vignette(source, temporaire, moteur)
+            cache.ranger(cle, temporaire, ".png")
+            meta["vignette"] = True
+    except erreurs_document() as e:
+        # PDF illisible : mémorisé, pas de nouvel essai à chaque construction
+        meta["echec"] = str(e) or type(e).__name__
+    except Exception as e:
+        # Incident d'exécution : signalé, non mémorisé
+        return dict(meta, cle=cle, echec=str(e) or type(e).__name__)
+    cache.ecrire_meta(cle, meta)
+    return dict(meta, cle=cle)
+
+def placer(cache: Cache, apercus: Dict[str, dict], dossier_html: Path, ancien: Path) -> None:
+    """Lie les vignettes en dur dans dossier_html/DOSSIER_VIGNETTES et
+    écrit le MANIFESTE {nom_html: {"pages", "octets", "vignette"}}.
+
+    Args:
+        ancien: dossier_html du site en ligne (MANIFESTE inchangé repris,
+                date conservée)
+    """
+    if not apercus:
+        return
+    fs = fs_utils.actif()
+    dossier = dossier_html / DOSSIER_VIGNETTES
+    fs.creer_dossier(dossier)
+    manifeste = {}
+    for nom_html, apercu in apercus.items():
+        vignette = None
+        if apercu["vignette"]:
+            vignette = os.path.splitext(nom_html)[0] + ".png"
+            fs.placer(cache.chemin(apercu["cle"], ".png"), dossier / vignette)
+        manifeste[nom_html] = {"pages": apercu["pages"], "octets": apercu["octets"], "vignette": vignette}
+    publication.ecrire_si_change(dossier / MANIFESTE,
+                                 json.dumps(manifeste, ensure_ascii=False, sort_keys=True, indent=1),
+                                 ancien / DOSSIER_VIGNETTES / MANIFESTE)
+
+def lire_manifeste(dossier_html: Path) -> Dict[str, dict]:
+    """Aperçus placés par placer() ({} si aucun)."""
+    try:
+        return json.loads(fs_utils.actif().lire_texte(dossier_html / DOSSIER_VIGNETTES / MANIFESTE))
+    except (OSError, ValueError):
+        return {}
+
+# Fin pdf_apercu.py v1.3
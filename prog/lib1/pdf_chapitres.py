@@ -0,0 +1,123 @@
+# pdf_chapitres.py — Version 1.2
+# Découpage d'un PDF assemblé en un fichier par chapitre (signets de premier niveau)
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from lib1 import fs_utils, publication
+from lib1.cache_utils import Cache, empreinte_contenu
+
+# Révision du découpage : la changer invalide le cache
+ESPACE = "pdf-chapitres-1"
+SUFFIXE_DOSSIER = "_chapitres"
+MANIFESTE = "chapitres.json"
+
+def dossier_chapitres(nom_pdf: str) -> str:
+    """cours_grammaire.pdf → cours_grammaire_chapitres (dossier des parties)."""
+    return os.path.splitext(nom_pdf)[0] + SUFFIXE_DOSSIER
+
+def _page_destination(document, item, pages: dict) -> Optional[int]:
+    """Index (base 0) de la page visée par un signet, None si introuvable."""
+    import pikepdf
+    destination = item.destination
+    if destination is None and item.action is not None and item.action.get("/S") == "/GoTo":
+        destination = item.action.get("/D")
+    if isinstance(destination, int):
+        return destination
+    # Destination nommée : arbre /Names /Dests, ou dictionnaire /Dests (PDF 1.1)
+    if isinstance(destination, (pikepdf.String, pikepdf.Name, str)):
+        nom = str(destination)
+        racine = document.Root
+        try:
+            if "/Names" in racine and "/Dests" in racine.Names:
+                destination = pikepdf.NameTree(racine.Names.Dests).get(nom.lstrip("/"))
+            elif "/Dests" in racine:
+                destination = racine.Dests.get("/" + nom.lstrip("/"))
+        except (KeyError, ValueError, pikepdf.PdfError):
+            return None
+    if isinstance(destination, pikepdf.Dictionary):
+        destination = destination.get("/D")
+    if isinstance(destination, pikepdf.Array) and len(destination):
+        return pages.get(destination[0].objgen)
+    return None
+
+def lire_chapitres(document) -> List[Tuple[str, int]]:
+    """(titre, première page base 0) des signets de premier niveau.
+
+    Triés par page ; deux signets sur la même page n'en font qu'un (le
+    premier), les signets sans page résolue sont ignorés.
+    """
+    pages = {getattr(p, "obj", p).objgen: i for i, p in enumerate(document.pages)}
+    debuts = {}
+    with document.open_outline() as sommaire:
+        for item in sommaire.root:
+            page = _page_destination(document, item, pages)
+            if page is not None and page not in debuts:
+                debuts[page] = str(item.title).strip() or f"Page {page + 1}"
+    return sorted(((titre, page) for page, titre in debuts.items()), key=lambda c: c[1])
+
+def decouper(source: Path, cache: Cache) -> Tuple[str, List[dict]]:
+    """Découpe source en chapitres, dans le cache (une fois par contenu).
+
+    Chapitre i = de sa première page à la veille du chapitre i+1 ; les
+    pages avant le premier signet (couverture, sommaire) restent dans le
+    seul PDF complet. Moins de deux chapitres : rien à découper.
+
+    Args:
+        source: PDF assemblé
+        cache: Espace de cache (Cache(dossier_cache(html), ESPACE))
+
+    Returns:
+        (clé du cache, [{"titre", "fichier", "pages": [première, dernière]}])
+    """
+    cle = empreinte_contenu(source)
+    meta = cache.lire_meta(cle)
+    if meta is not None and all(cache.obtenir(cle, "." + c["fichier"]) for c in meta["chapitres"]):
+        return cle, meta["chapitres"]
+
+    import pikepdf
+    chapitres = []
+    with pikepdf.open(source) as document:
+        debuts = lire_chapitres(document)
+        total = len(document.pages)
+        if len(debuts) >= 2:
+            for i, (titre, debut) in enumerate(debuts):
+                fin = debuts[i + 1][1] if i + 1 < len(debuts) else total
+                fichier = f"{i + 1:02d}.pdf"
+                temporaire = cache.temporaire(cle, "." + fichier)
+                partie = pikepdf.new()
+                partie.pages.extend(document.pages[debut:fin])
+                partie.save(temporaire, linearize=True, compress_streams=True,
+                            object_stream_mode=pikepdf.ObjectStreamMode.generate)
+                cache.ranger(cle, temporaire, "." + fichier)
+                chapitres.append({"titre": titre, "fichier": fichier, "pages": [debut + 1, fin]})
+    cache.ecrire_meta(cle, {"source": source.name, "chapitres": chapitres})
+    return cle, chapitres
+
+def placer(cache: Cache, cle: str, chapitres: List[dict], dossier_sortie: Path,
+           ancien: Path) -> None:
+    """Lie les parties en dur dans le site et écrit leur MANIFESTE.
+
+    Args:
+        ancien: dossier_sortie du site en ligne (MANIFESTE inchangé repris,
+                date conservée)
+    """
+    if not chapitres:
+        return
+    fs = fs_utils.actif()
+    fs.creer_dossier(dossier_sortie)
+    for chapitre in chapitres:
+        fs.placer(cache.chemin(cle, "." + chapitre["fichier"]), dossier_sortie / chapitre["fichier"])
+    publication.ecrire_si_change(dossier_sortie / MANIFESTE, json.dumps(chapitres, ensure_ascii=False, indent=1),
+                                 ancien / MANIFESTE)
+
+def lire_manifeste(dossier_sortie: Path) -> List[dict]:
+    """Chapitres placés par placer() (liste vide si aucun)."""
+    try:
+        return json.loads(fs_utils.actif().lire_texte(dossier_sortie / MANIFESTE))
+    except (OSError, ValueError):
+        return []
+
+# Fin pdf_chapitres.py v1.2
@@ -0,0 +1,144 @@
+# pdf_web.py — Version 1.2
+# Optimisation des PDF pour le web : linéarisation et recompression sans perte (pikepdf)
+
+import importlib.util
+import os
+import shutil
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from lib1 import fs_utils
+from lib1.cache_utils import Cache
+
+# Révision des réglages d'optimisation : la changer invalide le cache
+ESPACE = "pdf-web-1"
+# Sortie gardée même un peu plus grosse que la source (tables de
+# linéarisation) : l'affichage de la page 1 avant la fin du
+# téléchargement compte plus que quelques Ko
+TOLERANCE = 0.02
+
+def disponible() -> bool:
+    """True si pikepdf est installé (sans l'importer)."""
+    return importlib.util.find_spec("pikepdf") is not None
+
+def optimiser(source: str, destination: str) -> Tuple[int, int]:
+    """Linéarise (« affichage web rapide ») et recompresse un PDF.
+
+    Sans perte : flux recompressés en Flate, objets regroupés en flux
+    d'objets, ressources non référencées supprimées ; les images ne
+    sont pas rééchantillonnées. Exécuté dans un processus du pool.
+
+    Returns:
+        (taille source, taille optimisée) en octets
+    """
+    import pikepdf
+    with pikepdf.open(source) as document:
+        document.remove_unreferenced_resources()
+        document.save(
+            destination,
+            linearize=True,
+            compress_streams=True,
+            recompress_flate=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+    return os.path.getsize(source), os.path.getsize(destination)
+
+def erreurs_document() -> tuple:
+    """Exceptions d'un PDF qu'on ne sait pas optimiser (chiffré, corrompu) :
+    mémorisées. Les autres (pool interrompu, mémoire, disque plein) sont
+    des incidents d'exécution : nouvel essai à la construction suivante."""
+    import pikepdf
+    return (pikepdf.PdfError, ValueError)
+
+def _ko(octets: int) -> str:
+    return f"{octets / 1024:,.0f} Ko".replace(",", " ")
+
+class OptimiseurPDF:
+    """Place les PDF dans le site en version optimisée, via le cache.
+
+    Clé du cache = sha256 de la source : un PDF n'est optimisé qu'une
+    fois, quel que soit son nom ou son dossier ; les constructions
+    suivantes lient le résultat en dur ; la clé d'une source inchangée
+    (taille, date) est reprise sans relire le PDF. Un échec
+    (erreurs_document : PDF chiffré, corrompu) est mémorisé aussi : le
+    fichier est alors copié tel quel sans nouvel essai ; un incident
+    d'exécution n'est pas mémorisé.
+
+    Args:
+        cache: Espace de cache (Cache(dossier_cache(html), ESPACE))
+        executeur: Pool de processus qui exécute optimiser()
+        log_func: Fonction de log
+    """
+
+    def __init__(self, cache: Cache, executeur: Executor,
+                 log_func: Callable[[str], None] = print):
+        self.cache = cache
+        self.executeur = executeur
+        self.log = log_func
+        self._verrou = threading.Lock()
+        self.statistiques = {"optimises": 0, "en_cache": 0, "echecs": 0,
+                             "octets_avant": 0, "octets_apres": 0}
+
+    def _produire(self, cle: str, source: Path) -> Optional[dict]:
+        """Optimise source dans le cache et retourne les métadonnées de
+        l'entrée (None après un incident d'exécution, non mémorisé)."""
+        temporaire = self.cache.temporaire(cle, ".pdf")
+        try:
+            avant, apres = self.executeur.submit(optimiser, str(source), str(temporaire)).result()
+        except erreurs_document() as e:
+            temporaire.unlink(missing_ok=True)
+            meta = {"source": source.name, "echec": str(e) or type(e).__name__}
+            self.log(f"✗ PDF non optimisé (copié tel quel) : {source.name} — {meta['echec']}")
+        except Exception as e:
+            temporaire.unlink(missing_ok=True)
+            self.log(f"✗ Optimisation interrompue (copié tel quel) : {source.name} — "
+                     f"{str(e) or type(e).__name__}")
+            return None
+        else:
+            if apres > avant * (1 + TOLERANCE):
+                shutil.copyfile(source, temporaire)
+                apres = avant
+            self.cache.ranger(cle, temporaire, ".pdf")
+            meta = {"source": source.name, "avant": avant, "apres": apres}
+            gain = 1 - apres / avant if avant else 0
+            self.log(f"PDF web : {source.name} {_ko(avant)} → {_ko(apres)} ({-gain:+.0%})")
+        self.cache.ecrire_meta(cle, meta)
+        return meta
+
+    def placer(self, source: Path, destination: Path) -> bool:
+        """Place la version optimisée de source en destination.
+
+        Returns:
+            False si le PDF n'a pas pu être optimisé (à copier tel quel)
+        """
+        cle = self.cache.empreinte(source)
+        meta = self.cache.lire_meta(cle)
+        resultat = self.cache.obtenir(cle, ".pdf")
+        nouveau = meta is None or ("echec" not in meta and resultat is None)
+        if nouveau:
+            meta = self._produire(cle, source)
+            resultat = self.cache.obtenir(cle, ".pdf")
+
+        if meta is None or "echec" in meta:
+            with self._verrou:
+                self.statistiques["echecs"] += 1
+            return False
+
+        fs_utils.actif().placer(resultat, destination)
+        with self._verrou:
+            self.statistiques["optimises" if nouveau else "en_cache"] += 1
+            self.statistiques["octets_avant"] += meta["avant"]
+            self.statistiques["octets_apres"] += meta["apres"]
+        return True
+
+    def bilan(self) -> str:
+        """Ligne de résumé pour le log de fin de construction."""
+        s = self.statistiques
+        gagne = s["octets_avant"] - s["octets_apres"]
+        return (f"PDF web : {s['optimises']} optimisé(s), {s['en_cache']} depuis le cache, "
+                f"{s['echecs']} copié(s) tel(s) quel(s) ; {_ko(s['octets_avant'])} → "
+                f"{_ko(s['octets_apres'])} ({_ko(gagne)} gagnés)")
+
+# Fin pdf_web.py v1.2
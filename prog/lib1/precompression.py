@@ -0,0 +1,146 @@
+# precompression.py — Version 1.1
+# Fichiers .gz / .br pré-compressés à côté des ressources texte du site
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from lib1 import fs_utils
+from lib1 import publication
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+EXTENSIONS_TEXTE = {".html", ".htm", ".css", ".js", ".txt", ".svg", ".json", ".xml"}
+TAILLE_MIN = 256  # En dessous, l'en-tête de compression coûte plus qu'il ne gagne
+MANIFESTE = ".precompression.json"
+
+def formats() -> Dict[str, Callable[[bytes], bytes]]:
+    """Extension → compresseur (brotli seulement s'il est installé).
+
+    gzip avec mtime=0 : même source, mêmes octets d'une construction à l'autre.
+    """
+    compresseurs = {".gz": lambda donnees: gzip.compress(donnees, 9, mtime=0)}
+    if HAS_BROTLI:
+        compresseurs[".br"] = lambda donnees: brotli.compress(donnees, quality=11)
+    return compresseurs
+
+def lister_ressources(dossier_html: Path) -> List[Path]:
+    """Ressources texte du site à pré-compresser (chemins relatifs, triés)."""
+    dossier_html = Path(dossier_html)
+    return [
+        chemin.relative_to(dossier_html)
+        for chemin in fs_utils.actif().fichiers(dossier_html)
+        if os.path.splitext(chemin.name)[1].lower() in EXTENSIONS_TEXTE
+    ]
+
+def charger_manifeste(dossier_html: Path) -> Dict[str, str]:
+    """{chemin relatif posix: sha256 de la source des fichiers compressés}."""
+    try:
+        return json.loads(fs_utils.actif().lire_texte(Path(dossier_html) / MANIFESTE))
+    except (OSError, ValueError):
+        return {}
+
+class _Bilan:
+    """Tailles cumulées par type de ressource (thread-safe)."""
+
+    def __init__(self):
+        self.verrou = threading.Lock()
+        self.tailles: Dict[str, Dict[str, int]] = {}
+        self.compresses = 0
+        self.reutilises = 0
+
+    def ajouter(self, suffixe: str, source: int, sorties: Dict[str, int], reutilise: bool) -> None:
+        with self.verrou:
+            t = self.tailles.setdefault(suffixe, {"fichiers": 0, "source": 0})
+            t["fichiers"] += 1
+            t["source"] += source
+            for ext, taille in sorties.items():
+                t[ext] = t.get(ext, 0) + taille
+            if reutilise:
+                self.reutilises += 1
+            else:
+                self.compresses += 1
+
+def precompresser(dossier_html: Path, ancien: Optional[Path] = None, jobs: int = 4,
+                  log_func: Callable[[str], None] = print) -> Dict[str, str]:
+    """Écrit fichier.gz (et fichier.br) à côté de chaque ressource texte.
+
+    Un fichier dont les octets ont la même empreinte que dans le
+    manifeste de la construction `ancien` récupère ses versions
+    compressées par lien dur : seules les ressources modifiées sont
+    recompressées. Compression en parallèle (zlib et brotli libèrent le
+    GIL). Lectures et écritures par le système actif (fs_utils) : une
+    simulation (--dry-run) liste aussi les .gz/.br et le manifeste.
+
+    Args:
+        dossier_html: Site à traiter (html.staging/)
+        ancien: Construction précédente (html/) dont réutiliser les fichiers
+        jobs: Threads de compression
+        log_func: Fonction de log
+
+    Returns:
+        Manifeste {chemin relatif: sha256 source}, écrit dans MANIFESTE
+    """
+    fs = fs_utils.actif()
+    dossier_html = Path(dossier_html)
+    compresseurs = formats()
+    precedent = charger_manifeste(ancien) if ancien else {}
+    manifeste: Dict[str, str] = {}
+    bilan = _Bilan()
+
+    def traiter(rel: Path) -> None:
+        source = dossier_html / rel
+        donnees = fs.lire_octets(source)
+        if len(donnees) < TAILLE_MIN:
+            return
+        cle = rel.as_posix()
+        empreinte = hashlib.sha256(donnees).hexdigest()
+        sorties = {}
+        reutilise = precedent.get(cle) == empreinte
+        for ext, compresser in compresseurs.items():
+            cible = source.with_name(source.name + ext)
+            place = False
+            if reutilise:
+                try:
+                    # Lien dur, à défaut copie
+                    fs.placer(ancien / (cle + ext), cible)
+                    place = True
+                except OSError:
+                    # Ancien fichier absent (format ajouté depuis)
+                    reutilise = False
+            if not place:
+                fs.ecrire_octets(cible, compresser(donnees))
+            sorties[ext] = fs.stat(cible).st_size
+        with bilan.verrou:
+            manifeste[cle] = empreinte
+        bilan.ajouter(source.suffix.lower(), len(donnees), sorties, reutilise)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(traiter, lister_ressources(dossier_html)))
+
+    # Manifeste inchangé : lien dur vers l'ancien, sa date est conservée
+    publication.ecrire_si_change(
+        dossier_html / MANIFESTE,
+        json.dumps(manifeste, sort_keys=True, indent=0),
+        Path(ancien or dossier_html) / MANIFESTE,
+    )
+
+    log_func(f"Pré-compression : {bilan.compresses} compressé(s), {bilan.reutilises} réutilisé(s)"
+             + ("" if HAS_BROTLI else " (brotli non installé : .gz seulement)"))
+    for suffixe, t in sorted(bilan.tailles.items()):
+        ratios = ", ".join(
+            f"{ext} {t[ext] / t['source']:.0%}" for ext in compresseurs if t.get(ext)
+        )
+        log_func(f"  {suffixe:<6} {t['fichiers']:>5} fichier(s) {t['source'] / 1024:>9.1f} Ko → {ratios}")
+    return manifeste
+
+# Fin precompression.py v1.1
@@ -0,0 +1,174 @@
+# publication.py — Version 1.4
+# Construction dans un dossier de préparation puis bascule atomique vers html/
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+from lib1 import fs_utils
+
+SUFFIXE_PREPARATION = ".staging"
+SUFFIXE_PRECEDENT = ".precedent"
+SUFFIXE_EMPREINTE = ".empreinte"
+
+_verrou = threading.Lock()
+statistiques = {"liens": 0, "copies": 0, "pages_inchangees": 0, "pages_ecrites": 0}
+
+def dossier_preparation(dossier_html: Path) -> Path:
+    """html/ → html.staging/ (même disque : renommage et liens durs possibles)."""
+    dossier_html = Path(dossier_html)
+    return dossier_html.with_name(dossier_html.name + SUFFIXE_PREPARATION)
+
+def dossier_precedent(dossier_html: Path) -> Path:
+    """html/ → html.precedent/ (construction précédente, pour retour arrière)."""
+    dossier_html = Path(dossier_html)
+    return dossier_html.with_name(dossier_html.name + SUFFIXE_PRECEDENT)
+
+def fichier_empreinte(dossier_html: Path) -> Path:
+    """html/ → html.empreinte : empreinte des entrées de la construction en ligne."""
+    dossier_html = Path(dossier_html)
+    return dossier_html.with_name(dossier_html.name + SUFFIXE_EMPREINTE)
+
+def preparer(dossier_html: Path) -> Path:
+    """Crée un dossier de préparation vide (reste d'un run interrompu supprimé).
+
+    Returns:
+        Chemin du dossier de préparation
+    """
+    fs = fs_utils.actif()
+    preparation = dossier_preparation(dossier_html)
+    if fs.existe(preparation):
+        fs.supprimer_arbre(preparation)
+    fs.creer_dossier(preparation)
+    for cle in statistiques:
+        statistiques[cle] = 0
+    return preparation
+
+def reprendre(dossier_html: Path, preparation: Path, a_refaire: Callable[[Path], bool]) -> int:
+    """Lie en dur dans la préparation les fichiers du site en ligne gardés tels quels.
+
+    Construction partielle (genere_site --only) : tout ce que la
+    construction ne refait pas est repris de html/, la bascule reste
+    atomique et le retour arrière possible.
+
+    Args:
+        dossier_html: Site en ligne
+        preparation: Dossier de préparation (vide)
+        a_refaire: Chemin relatif à html/ → True si la construction l'écrit
+
+    Returns:
+        Nombre de fichiers repris
+    """
+    fs = fs_utils.actif()
+    dossier_html = Path(dossier_html)
+    nb = 0
+    for racine, _, fichiers in os.walk(dossier_html):
+        relatif = Path(racine).relative_to(dossier_html)
+        gardes = [f for f in fichiers if not a_refaire(relatif / f)]
+        if gardes:
+            fs.creer_dossier(preparation / relatif)
+        for nom in gardes:
+            fs.placer(Path(racine) / nom, preparation / relatif / nom)
+            nb += 1
+    return nb
+
+def lier_ou_copier(source: Path, destination: Path, ancien: Path) -> bool:
+    """Place source en destination en réutilisant la sortie précédente.
+
+    Si `ancien` (même fichier dans la construction en ligne) a la taille
+    et la date de source (copy2 conserve la date), il est lié en dur :
+    rien n'est recopié. Sinon copie classique.
+
+    Returns:
+        True si la sortie précédente a été réutilisée
+    """
+    fs = fs_utils.actif()
+    try:
+        st_src = fs.stat(source)
+        st_old = fs.stat(ancien)
+        if st_src.st_size == st_old.st_size and st_src.st_mtime_ns == st_old.st_mtime_ns:
+            # Construction sur place (ancien == destination) : déjà à jour
+            if ancien != destination:
+                fs.lier(ancien, destination)
+            with _verrou:
+                statistiques["liens"] += 1
+            return True
+    except OSError:
+        # Pas d'ancien fichier, ou liens durs non supportés : copie
+        pass
+
+    fs.copier(source, destination)
+    with _verrou:
+        statistiques["copies"] += 1
+    return False
+
+def ecrire_si_change(destination: Path, contenu: str, ancien: Path) -> bool:
+    """Écrit une page seulement si ses octets diffèrent de la sortie précédente.
+
+    Page identique : lien dur vers l'ancienne (ou rien si ancien ==
+    destination), la date du fichier reste celle de sa dernière vraie
+    modification. Sinon écriture atomique.
+
+    Returns:
+        True si la page a été (ré)écrite
+    """
+    fs = fs_utils.actif()
+    donnees = contenu.encode("utf-8")
+    try:
+        if fs.stat(ancien).st_size == len(donnees) and fs.lire_octets(ancien) == donnees:
+            if ancien != destination:
+                fs.creer_dossier(destination.parent)
+                fs.lier(ancien, destination)
+            with _verrou:
+                statistiques["pages_inchangees"] += 1
+            return False
+    except OSError:
+        pass
+
+    fs.ecrire_octets(destination, donnees)
+    with _verrou:
+        statistiques["pages_ecrites"] += 1
+    return True
+
+def basculer(dossier_html: Path) -> None:
+    """Met en ligne la préparation : html/ → html.precedent/, staging → html/.
+
+    Deux renommages de dossiers (instantanés sur un même disque) : le site
+    servi n'est jamais à moitié construit.
+    """
+    fs = fs_utils.actif()
+    dossier_html = Path(dossier_html)
+    preparation = dossier_preparation(dossier_html)
+    precedent = dossier_precedent(dossier_html)
+
+    if fs.existe(precedent):
+        fs.supprimer_arbre(precedent)
+    if fs.existe(dossier_html):
+        fs.renommer(dossier_html, precedent)
+    fs.renommer(preparation, dossier_html)
+
+def restaurer(dossier_html: Path) -> bool:
+    """Retour arrière d'une construction : échange html/ et html.precedent/.
+
+    Returns:
+        False si aucune construction précédente n'existe
+    """
+    fs = fs_utils.actif()
+    dossier_html = Path(dossier_html)
+    precedent = dossier_precedent(dossier_html)
+    if not fs.existe(precedent):
+        return False
+
+    # Le site restauré ne correspond plus aux entrées : prochaine construction complète
+    fs.supprimer(fichier_empreinte(dossier_html))
+
+    transit = dossier_html.with_name(dossier_html.name + ".transit")
+    if fs.existe(dossier_html):
+        fs.renommer(dossier_html, transit)
+    fs.renommer(precedent, dossier_html)
+    if fs.existe(transit):
+        fs.renommer(transit, precedent)
+    return True
+
+# Fin publication.py v1.4
@@ -0,0 +1,177 @@
+# reconciliation.py — Version 1.2
+# Réconciliation STRUCTURE.py ↔ contenu réel d'un dossier (ajouts, renommages, orphelins)
+
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lib1 import structure_utils as struct
+
+CATEGORIES = ("dossiers", "fichiers")
+TAILLE_BLOC = 1 << 20
+
+def empreinte_fichier(chemin: Path) -> str:
+    """Empreinte du contenu d'un fichier (sha256, 16 caractères).
+
+    "" pour un fichier vide : tous les fichiers vides se ressemblent,
+    leur empreinte ne permet pas de reconnaître un renommage.
+    """
+    digest = hashlib.sha256()
+    taille = 0
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(TAILLE_BLOC), b""):
+            digest.update(bloc)
+            taille += len(bloc)
+    return digest.hexdigest()[:16] if taille else ""
+
+def empreinte_dossier(noms: List[str]) -> str:
+    """Empreinte d'un dossier : noms de ses entrées (un dossier renommé
+    garde son contenu, donc son empreinte). "" pour un dossier vide."""
+    if not noms:
+        return ""
+    digest = hashlib.sha256("\n".join(sorted(noms)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+class Candidat:
+    """Entrée du dossier qui doit figurer dans STRUCTURE.py.
+
+    L'empreinte n'est calculée qu'à la demande (nouvel élément, élément
+    sans empreinte ou modifié depuis la dernière écriture de STRUCTURE.py
+    et depuis sa dernière vérification, "mtime_empreinte").
+
+    Args:
+        nom: nom_document
+        categorie: "dossiers" ou "fichiers"
+        nom_html: nom_html d'un nouvel élément
+        mtime: Date de modification de l'entrée
+        calcul: Callable() → empreinte
+    """
+
+    __slots__ = ("nom", "categorie", "nom_html", "mtime", "_calcul", "_empreinte")
+
+    def __init__(self, nom: str, categorie: str, nom_html: str, mtime: float,
+                 calcul: Callable[[], str]):
+        self.nom = nom
+        self.categorie = categorie
+        self.nom_html = nom_html
+        self.mtime = mtime
+        self._calcul = calcul
+        self._empreinte: Optional[str] = None
+
+    @property
+    def empreinte(self) -> str:
+        if self._empreinte is None:
+            self._empreinte = self._calcul()
+        return self._empreinte
+
+class Rapport:
+    """Résultat d'une réconciliation."""
+
+    __slots__ = ("ajoutes", "renommes", "orphelins", "modifie")
+
+    def __init__(self):
+        self.ajoutes: List[str] = []
+        self.renommes: List[Tuple[str, str]] = []
+        self.orphelins: List[str] = []
+        self.modifie = False
+
+def reconcilier(structure: dict, candidats: List[Candidat], reference: float,
+                log_func: Callable[[str], None] = print) -> Rapport:
+    """Aligne structure sur les candidats en une passe.
+
+    - Éléments indexés par nom : test d'appartenance en O(1)
+    - Candidat inconnu dont l'empreinte est celle d'un seul élément
+      disparu, et d'aucun autre candidat inconnu : renommage, l'élément
+      (nom_affiché, position, ...) est conservé sous le nouveau nom
+    - Candidat inconnu sinon (empreinte vide ou ambiguë comprise) :
+      nouvel élément en fin de liste
+    - Fichier touché mais de contenu inchangé : sa date est retenue
+      ("mtime_empreinte") pour ne pas le relire à chaque construction ;
+      pas pour un dossier, dont l'empreinte (noms listés) ne coûte rien
+      et dont la date change à chaque écriture de son STRUCTURE.py
+    - Élément sans entrée correspondante : orphelin, signalé et conservé
+      (filtrer_elements_existants le masque au rendu)
+
+    Args:
+        structure: STRUCTURE du dossier (modifiée sur place)
+        candidats: Entrées du dossier
+        reference: Date de la dernière écriture de STRUCTURE.py ; les
+                   empreintes des entrées plus récentes sont recalculées
+        log_func: Fonction de log
+
+    Returns:
+        Rapport (modifie=True si structure doit être sauvegardée)
+    """
+    rapport = Rapport()
+    index: Dict[str, Dict[str, dict]] = {
+        cat: {item.get("nom_document", ""): item for item in structure.get(cat, [])}
+        for cat in CATEGORIES
+    }
+
+    presents = {cat: set() for cat in CATEGORIES}
+    nouveaux: List[Candidat] = []
+
+    for candidat in candidats:
+        presents[candidat.categorie].add(candidat.nom)
+        item = index[candidat.categorie].get(candidat.nom)
+        if item is None:
+            nouveaux.append(candidat)
+            continue
+        # Empreinte tenue à jour pour détecter un renommage ultérieur
+        verifie = max(reference, item.get("mtime_empreinte", 0.0))
+        if "empreinte" in item and candidat.mtime <= verifie:
+            continue
+        if item.get("empreinte", "") != candidat.empreinte:
+            if candidat.empreinte:
+                item["empreinte"] = candidat.empreinte
+            else:
+                item.pop("empreinte", None)
+            rapport.modifie = True
+        elif candidat.mtime > verifie and candidat.categorie == "fichiers":
+            # Contenu inchangé (fichier touché, resynchronisé...)
+            item["mtime_empreinte"] = candidat.mtime
+            rapport.modifie = True
+
+    disparus: Dict[Tuple[str, str], dict] = {}
+    orphelins: Dict[int, dict] = {}
+    ambigus = Counter((c.categorie, c.empreinte) for c in nouveaux if c.empreinte)
+    for cat in CATEGORIES:
+        for nom, item in index[cat].items():
+            if nom not in presents[cat]:
+                orphelins[id(item)] = item
+                if item.get("empreinte"):
+                    ambigus[(cat, item["empreinte"])] += 1
+                    disparus[(cat, item["empreinte"])] = item
+    # Une empreinte partagée (deux disparus, deux nouveaux) ne désigne
+    # aucun renommage sûr : ajout, l'ancien élément reste orphelin
+    for cle in [cle for cle in disparus if ambigus[cle] > 2]:
+        del disparus[cle]
+
+    position = struct.calculer_position_suivante(structure)
+    for candidat in nouveaux:
+        ancien = disparus.pop((candidat.categorie, candidat.empreinte), None)
+        if ancien is not None:
+            log_func(f"  Renommé : {ancien['nom_document']} → {candidat.nom}")
+            rapport.renommes.append((ancien["nom_document"], candidat.nom))
+            ancien["nom_document"] = candidat.nom
+            ancien["nom_html"] = candidat.nom_html
+            del orphelins[id(ancien)]
+        else:
+            element = struct.ajouter_element_structure(
+                structure, candidat.nom, candidat.nom_html,
+                candidat.categorie, position, log_func
+            )
+            if candidat.empreinte:
+                element["empreinte"] = candidat.empreinte
+            rapport.ajoutes.append(candidat.nom)
+            position += 1
+        rapport.modifie = True
+
+    for item in orphelins.values():
+        rapport.orphelins.append(item.get("nom_document", "?"))
+        log_func(f"  Orphelin : {item.get('nom_document', '?')} (absent du dossier)")
+
+    return rapport
+
+# Fin reconciliation.py v1.2
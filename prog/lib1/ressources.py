@@ -0,0 +1,106 @@
+# ressources.py — Version 1.2
+# Ressources statiques du site (style.css, favicon) sous un nom dérivé de leur contenu
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict
+
+from lib1 import publication
+
+DOSSIER_RESSOURCES = Path(__file__).parent
+RACINE_DEPOT = DOSSIER_RESSOURCES.parent.parent
+# Nom logique → fichier source (ressource publiée si présente)
+RESSOURCES = {
+    "style.css": DOSSIER_RESSOURCES / "style.css",
+    "favicon.ico": RACINE_DEPOT / "favicon.ico",
+}
+MANIFESTE = "ressources.json"
+LONGUEUR_EMPREINTE = 10
+
+def nom_empreinte(chemin: Path) -> str:
+    """style.css → style.3f2a9c81d0.css (empreinte sha256 du contenu).
+
+    Le nom change dès que le contenu change : le fichier peut être mis en
+    cache indéfiniment par le navigateur.
+    """
+    empreinte = hashlib.sha256(Path(chemin).read_bytes()).hexdigest()[:LONGUEUR_EMPREINTE]
+    return f"{chemin.stem}.{empreinte}{chemin.suffix}"
+
+@lru_cache(maxsize=2)
+def manifeste(empreintes: bool = True) -> Dict[str, str]:
+    """{nom logique: nom publié} des ressources présentes.
+
+    Calculé une fois par processus (les processus du rendu retrouvent les
+    mêmes noms sans échange).
+
+    Args:
+        empreintes: False → noms publiés = noms logiques
+    """
+    resultat = {}
+    for nom, source in RESSOURCES.items():
+        if source.is_file():
+            resultat[nom] = nom_empreinte(source) if empreintes else nom
+    return resultat
+
+def reecrire_references(contenu: str, noms: Dict[str, str], base: str) -> str:
+    """Remplace dans href/src les noms logiques par les noms publiés.
+
+    Pour les entête/pied écrits à la main ({{BASE_PATH}}/style.css...).
+    Seuls les liens vers la racine du site sont réécrits : préfixés par
+    base ou {{BASE_PATH}}, ou relatifs ("style.css", "../../style.css") ;
+    une adresse externe (https://cdn.../style.css) reste telle quelle.
+
+    Args:
+        contenu: HTML
+        noms: manifeste()
+        base: Préfixe des liens de la page (html.chemin_base)
+
+    Returns:
+        HTML aux références réécrites
+    """
+    a_changer = {logique: publie for logique, publie in noms.items() if logique != publie}
+    if not a_changer:
+        return contenu
+    prefixes = [r"\{\{BASE_PATH\}\}/", r"(?:\.\.?/)*"]
+    if base not in (".", "..") and not base.startswith("../"):
+        prefixes.insert(0, re.escape(base.rstrip("/")) + "/")
+    motif = re.compile(
+        r"""(\b(?:href|src)\s*=\s*["'](?:""" + "|".join(prefixes) + r"""))("""
+        + "|".join(re.escape(nom) for nom in a_changer)
+        + r""")(?=["'#?])"""
+    )
+    return motif.sub(lambda m: m.group(1) + a_changer[m.group(2)], contenu)
+
+def publier(preparation: Path, ancien: Path, empreintes: bool = True,
+            log_func: Callable[[str], None] = print) -> Dict[str, str]:
+    """Place les ressources à la racine du site en préparation.
+
+    Chaque ressource est publiée sous son nom empreinté et sous son nom
+    logique (pages écrites à la main qui pointent encore vers style.css).
+    Le manifeste est écrit dans MANIFESTE (repris de ancien s'il est
+    inchangé : date conservée).
+
+    Args:
+        preparation: Site en construction (html.staging/)
+        ancien: Site en ligne (html/), source des liens durs
+        empreintes: Noms dérivés du contenu
+        log_func: Fonction de log
+
+    Returns:
+        manifeste(empreintes)
+    """
+    noms = manifeste(empreintes)
+    for logique, publie in noms.items():
+        source = RESSOURCES[logique]
+        for nom in {logique, publie}:
+            publication.lier_ou_copier(source, preparation / nom, ancien / nom)
+        if publie != logique:
+            log_func(f"Ressource : {logique} → {publie}")
+    publication.ecrire_si_change(preparation / MANIFESTE, json.dumps(noms, sort_keys=True, indent=2),
+                                 ancien / MANIFESTE)
+    return noms
+
+# Fin ressources.py v1.2
@@ -0,0 +1,171 @@
+# scan_utils.py — Version 1.2
+# Parcours de DOCUMENTS par os.scandir, concurrent, avec cache des métadonnées
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from lib1.noms_utils import IndexNoms
+
+class Entree:
+    """Entrée d'un dossier, construite depuis un os.DirEntry.
+
+    is_dir/is_file proviennent des données du scandir (aucun appel système
+    sous Windows, d_type sous Linux). taille/mtime ne déclenchent qu'un seul
+    stat, mis en cache par le DirEntry et compté par le scanner.
+    """
+
+    __slots__ = ("nom", "chemin", "est_dossier", "est_fichier", "_entry", "_scanner")
+
+    def __init__(self, entry: os.DirEntry, scanner: "Scanner"):
+        self.nom = entry.name
+        self.chemin = Path(entry.path)
+        self.est_dossier = entry.is_dir()
+        self.est_fichier = not self.est_dossier and entry.is_file()
+        self._entry = entry
+        self._scanner = scanner
+
+    def stat(self) -> os.stat_result:
+        if self._scanner is not None:
+            self._scanner._compter("stat")
+            self._scanner = None  # Les appels suivants sont servis par le cache du DirEntry
+        return self._entry.stat()
+
+    @property
+    def taille(self) -> int:
+        return self.stat().st_size
+
+    @property
+    def mtime(self) -> float:
+        return self.stat().st_mtime
+
+    @property
+    def suffixe(self) -> str:
+        return os.path.splitext(self.nom)[1]
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.nom)[0]
+
+    def __repr__(self) -> str:
+        return f"Entree({self.nom!r}, dossier={self.est_dossier})"
+
+class Scanner:
+    """Inventaire de l'arbre DOCUMENTS, chaque dossier lu une seule fois.
+
+    Les dossiers frères sont parcourus en parallèle (threads, `largeur`)
+    car sur un dossier synchronisé (OneDrive...) chaque appel système est
+    lent mais ne consomme pas de CPU.
+
+    Args:
+        racine: Dossier racine
+        ignorer: Noms de dossiers à ne pas parcourir
+        largeur: Nombre de threads de parcours
+    """
+
+    def __init__(self, racine: Path, ignorer: Iterable[str] = (), largeur: int = 8):
+        self.racine = Path(racine)
+        self.ignorer = set(ignorer)
+        self.largeur = max(1, largeur)
+        self._listes: Dict[Path, List[Entree]] = {}
+        self._noms: Dict[Path, Dict[str, Entree]] = {}
+        self._index: Dict[Path, IndexNoms] = {}
+        self._verrou = threading.Lock()
+        self.compteurs = {"scandir": 0, "stat": 0}
+        self.duree = 0.0
+
+    def _compter(self, nom: str) -> None:
+        with self._verrou:
+            self.compteurs[nom] += 1
+
+    def _lire(self, dossier: Path) -> List[Entree]:
+        t0 = time.perf_counter()
+        self._compter("scandir")
+        try:
+            with os.scandir(dossier) as it:
+                entrees = sorted((Entree(e, self) for e in it), key=lambda e: e.nom.lower())
+        except FileNotFoundError:
+            entrees = []
+        noms = {e.nom: e for e in entrees}
+        with self._verrou:
+            self._listes[dossier] = entrees
+            self._noms[dossier] = noms
+            self._index.pop(dossier, None)
+            self.duree += time.perf_counter() - t0
+        return entrees
+
+    def scanner(self) -> "Scanner":
+        """Parcourt tout l'arbre (dossiers frères en parallèle)."""
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.largeur) as pool:
+            en_attente = [pool.submit(self._lire, self.racine)]
+            while en_attente:
+                entrees = en_attente.pop().result()
+                for e in entrees:
+                    if e.est_dossier and e.nom not in self.ignorer:
+                        en_attente.append(pool.submit(self._lire, e.chemin))
+        self.duree = time.perf_counter() - t0
+        return self
+
+    def lister(self, dossier: Path) -> List[Entree]:
+        """Entrées d'un dossier (triées par nom, insensible à la casse)."""
+        dossier = Path(dossier)
+        entrees = self._listes.get(dossier)
+        if entrees is None:
+            entrees = self._lire(dossier)
+        return entrees
+
+    def rescanner(self, dossier: Path) -> List[Entree]:
+        """Relit un dossier modifié pendant le run (ex: PDF convertis)."""
+        return self._lire(Path(dossier))
+
+    def index_noms(self, dossier: Path) -> IndexNoms:
+        """Index des noms de fichiers d'un dossier (construit une fois par liste)."""
+        dossier = Path(dossier)
+        index = self._index.get(dossier)
+        if index is None:
+            index = IndexNoms(e.nom for e in self.lister(dossier) if e.est_fichier)
+            with self._verrou:
+                self._index[dossier] = index
+        return index
+
+    def entree(self, chemin: Path) -> Optional[Entree]:
+        """Entrée d'un chemin, via la liste (mise en cache) de son dossier parent.
+
+        Recherche par nom dans un dictionnaire construit à la lecture du
+        dossier : un appel par élément reste en O(1).
+        """
+        chemin = Path(chemin)
+        noms = self._noms.get(chemin.parent)
+        if noms is None:
+            self._lire(chemin.parent)
+            noms = self._noms[chemin.parent]
+        return noms.get(chemin.name)
+
+    def existe(self, chemin: Path) -> bool:
+        """Équivalent de chemin.exists() sans appel système par chemin."""
+        return self.entree(chemin) is not None
+
+    def dossiers(self) -> List[Path]:
+        """Dossiers parcourus, ordre préfixe déterministe (comme os.walk)."""
+        ordre = []
+        pile = [self.racine]
+        while pile:
+            dossier = pile.pop()
+            ordre.append(dossier)
+            enfants = [e.chemin for e in self.lister(dossier)
+                       if e.est_dossier and e.nom not in self.ignorer]
+            pile.extend(reversed(enfants))
+        return ordre
+
+    def rapport(self) -> str:
+        """Résumé : dossiers, entrées, appels système, durée."""
+        nb_entrees = sum(len(l) for l in self._listes.values())
+        return (f"Scan : {len(self._listes)} dossiers, {nb_entrees} entrées, "
+                f"{self.compteurs['scandir']} scandir, {self.compteurs['stat']} stat, "
+                f"{self.duree:.2f} s")
+
+# Fin scan_utils.py v1.2
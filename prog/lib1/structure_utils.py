@@ -1,4 +1,4 @@
-# structure_utils.py — Version 2.0
+# structure_utils.py — Version 2.3
 # Gestion STRUCTURE.py avec support templates {{variable}}
 
 from pathlib import Path
@@ -6,6 +6,8 @@ import json
 import re
 from typing import Dict, Any, List
 
+from lib1 import fs_utils
+
 def resoudre_templates_runtime(item: dict, variables: dict) -> dict:
     """Résout les templates {{variable}} à l'exécution.
     
@@ -82,13 +84,18 @@ def resoudre_templates_runtime(item: dict, variables: dict) -> dict:
 def charger_structure(dossier: Path) -> Dict[str, Any]:
     """Charge STRUCTURE.py d'un dossier."""
     fichier = dossier / "STRUCTURE.py"
-    if not fichier.exists():
+    try:
+        source = fs_utils.actif().lire_texte(fichier)
+    except FileNotFoundError:
         return {"dossiers": [], "fichiers": []}
     
+    # Exécution dans un espace de noms privé : pas de module "STRUCTURE"
+    # partagé dans sys.modules (chargements concurrents sans mélange)
     try:
-        from importlib.machinery import SourceFileLoader
-        module = SourceFileLoader("STRUCTURE", str(fichier)).load_module()
-        return module.STRUCTURE
+        espace = {}
+        code = compile(source, str(fichier), "exec")
+        exec(code, espace)
+        return espace["STRUCTURE"]
     except Exception as e:
         print(f"Erreur lecture STRUCTURE.py dans {dossier}: {e}")
         return {"dossiers": [], "fichiers": []}
@@ -122,12 +129,19 @@ def ajouter_defaults_structure(structure: dict, dossier: Path, titre_site: str)
     
     return structure
 
-def filtrer_elements_existants(dossier: Path, elements: List[dict], log_func) -> List[dict]:
-    """Filtre éléments dont fichier/dossier n'existe pas."""
+def filtrer_elements_existants(dossier: Path, elements: List[dict], log_func,
+                               existe=None) -> List[dict]:
+    """Filtre éléments dont fichier/dossier n'existe pas.
+    
+    Args:
+        existe: Test d'existence (défaut Path.exists), ex: Scanner.existe
+                pour éviter un appel système par élément
+    """
+    existe = existe or Path.exists
     filtres = []
     for elem in elements:
         chemin = dossier / elem.get("nom_document", "")
-        if chemin.exists():
+        if existe(chemin):
             filtres.append(elem)
         else:
             log_func(f"Élément ignoré (inexistant): {elem.get('nom_document', '?')}")
@@ -147,8 +161,8 @@ def element_existe(structure: dict, nom_document: str, categorie: str) -> bool:
     )
 
 def ajouter_element_structure(structure: dict, nom_document: str, nom_html: str, 
-                              categorie: str, position: int, log_func) -> None:
-    """Ajoute nouvel élément à structure."""
+                              categorie: str, position: int, log_func) -> dict:
+    """Ajoute nouvel élément à structure et le retourne."""
     element = {
         "nom_document": nom_document,
         "nom_html": nom_html,
@@ -165,11 +179,15 @@ def ajouter_element_structure(structure: dict, nom_document: str, nom_html: str,
     
     structure.setdefault(categorie, []).append(element)
     log_func(f"Nouvel élément ajouté: {nom_document}")
+    return element
 
-def sauvegarder_structure(dossier: Path, structure: dict) -> None:
+def sauvegarder_structure(dossier: Path, structure: dict) -> bool:
     """Sauvegarde structure dans STRUCTURE.py.
     
     IMPORTANT: Préserve les templates {{var}} tels quels.
+    
+    Returns:
+        False si le fichier avait déjà ce contenu (non réécrit)
     """
     # Trier par position
     if "dossiers" in structure:
@@ -186,8 +204,14 @@ def sauvegarder_structure(dossier: Path, structure: dict) -> None:
     
     contenu += f"STRUCTURE = {json_str}\n"
     
-    # Sauvegarder
+    # Sauvegarder seulement si différent (date de STRUCTURE.py inchangée)
     fichier = dossier / "STRUCTURE.py"
-    fichier.write_text(contenu, encoding="utf-8")
+    try:
+        if fs_utils.actif().lire_texte(fichier) == contenu:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    fs_utils.actif().ecrire_texte(fichier, contenu)
+    return True
 
-# Fin structure_utils.py v2.0
+# Fin structure_utils.py v2.3
@@ -0,0 +1,134 @@
+# taches.py — Version 1.0
+# Ordonnanceur de tâches avec dépendances (graphe orienté acyclique)
+
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import time
+
+class Tache:
+    """Unité de travail du graphe de construction.
+
+    Args:
+        nom: Identifiant unique (ex: "render:grammaire/verbes")
+        fonction: Callable exécuté par le pool de son genre
+        args: Arguments positionnels de fonction
+        dependances: Tâches qui doivent être terminées avant
+        genre: Pool d'exécution ("io", "cpu", "word"...)
+        suite: Callable(résultat) exécuté dans le processus principal
+               une fois la tâche terminée (ex: écriture d'une page rendue
+               par un processus du pool)
+    """
+
+    __slots__ = ("nom", "fonction", "args", "dependances", "genre", "suite",
+                 "_attente", "_suivantes", "resultat", "duree")
+
+    def __init__(self, nom: str, fonction: Callable, args: tuple = (),
+                 dependances: Iterable["Tache"] = (), genre: str = "io",
+                 suite: Optional[Callable[[Any], None]] = None):
+        self.nom = nom
+        self.fonction = fonction
+        self.args = args
+        self.dependances = [d for d in dependances if d is not None]
+        self.genre = genre
+        self.suite = suite
+        self._attente = 0
+        self._suivantes: List["Tache"] = []
+        self.resultat = None
+        self.duree = 0.0
+
+    def __repr__(self) -> str:
+        return f"Tache({self.nom!r}, {self.genre})"
+
+def _executer_chrono(fonction: Callable, args: tuple) -> tuple:
+    """Exécute fonction(*args) et retourne (résultat, durée)."""
+    t0 = time.perf_counter()
+    resultat = fonction(*args)
+    return resultat, time.perf_counter() - t0
+
+class Ordonnanceur:
+    """Exécute un graphe de tâches dès que leurs dépendances sont prêtes.
+
+    Chaque genre de tâche a son propre exécuteur (threads pour les E/S,
+    processus pour le calcul, thread unique pour Word...). Les tâches
+    prêtes sont soumises immédiatement : la durée totale tend vers celle
+    du chemin critique.
+
+    Args:
+        executeurs: {genre: Executor}
+        log_func: Fonction de log
+    """
+
+    def __init__(self, executeurs: Dict[str, Executor], log_func: Callable[[str], None] = print):
+        self.executeurs = executeurs
+        self.log = log_func
+        self.taches: List[Tache] = []
+
+    def ajouter(self, tache: Tache) -> Tache:
+        """Ajoute une tâche (ses dépendances doivent déjà être ajoutées)."""
+        if tache.genre not in self.executeurs:
+            raise ValueError(f"Genre de tâche inconnu : {tache.genre}")
+        self.taches.append(tache)
+        return tache
+
+    def executer(self) -> Dict[str, float]:
+        """Exécute toutes les tâches.
+
+        Une tâche en échec arrête la soumission de nouvelles tâches ;
+        les tâches en cours sont attendues puis l'exception est relevée.
+
+        Returns:
+            Durée cumulée par genre de tâche (secondes)
+        """
+        for tache in self.taches:
+            tache._attente = len(tache.dependances)
+            tache._suivantes = []
+        for tache in self.taches:
+            for dep in tache.dependances:
+                dep._suivantes.append(tache)
+
+        en_cours: Dict[Future, Tache] = {}
+        erreur: Optional[BaseException] = None
+        durees: Dict[str, float] = {}
+
+        def soumettre(tache: Tache) -> None:
+            executeur = self.executeurs[tache.genre]
+            en_cours[executeur.submit(_executer_chrono, tache.fonction, tache.args)] = tache
+
+        for tache in self.taches:
+            if tache._attente == 0:
+                soumettre(tache)
+
+        termine = 0
+        while en_cours:
+            faits, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+            for future in faits:
+                tache = en_cours.pop(future)
+                try:
+                    tache.resultat, tache.duree = future.result()
+                    if tache.suite is not None:
+                        tache.suite(tache.resultat)
+                except BaseException as e:
+                    if erreur is None:
+                        erreur = e
+                        self.log(f"✗ Échec tâche {tache.nom} : {e}")
+                    continue
+
+                termine += 1
+                durees[tache.genre] = durees.get(tache.genre, 0.0) + tache.duree
+
+                if erreur is not None:
+                    continue
+                for suivante in tache._suivantes:
+                    suivante._attente -= 1
+                    if suivante._attente == 0:
+                        soumettre(suivante)
+
+        if erreur is not None:
+            raise erreur
+
+        if termine != len(self.taches):
+            raise RuntimeError(f"Graphe incomplet : {len(self.taches) - termine} tâche(s) jamais prêtes (cycle ?)")
+
+        return durees
+
+# Fin taches.py v1.0
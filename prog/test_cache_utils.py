@@ -0,0 +1,119 @@
+# test_cache_utils.py — Tests lib1/cache_utils.py (python -m pytest -q)
+
+import os
+import time
+from pathlib import Path
+
+from lib1 import cache_utils
+from lib1.cache_utils import Cache
+
+def entree(cache: Cache, cle: str, octets: int, usage: float) -> None:
+    """Entrée cle de taille octets (+ métadonnées) utilisée à la date usage."""
+    temporaire = cache.temporaire(cle, ".pdf")
+    temporaire.write_bytes(b"x" * octets)
+    cache.ranger(cle, temporaire, ".pdf")
+    cache.ecrire_meta(cle, {})
+    for fichier in (cache.chemin(cle, ".pdf"), cache.chemin(cle, ".json")):
+        os.utime(fichier, (usage, usage))
+
+def cle(caractere: str) -> str:
+    return caractere * cache_utils.LONGUEUR_CLE
+
+def test_elaguer_supprime_les_moins_recemment_utilisees(tmp_path):
+    cache = Cache(tmp_path, "pdf")
+    entree(cache, cle("a"), 1000, 100.0)
+    entree(cache, cle("b"), 1000, 300.0)
+    entree(cache, cle("c"), 1000, 200.0)
+    taille = sum(e["octets"] for e in cache_utils.inventaire(tmp_path).values())
+
+    supprimees, liberes, restants = cache_utils.elaguer(tmp_path, taille - 1000)
+    assert supprimees == 1
+    assert cache.lire_meta(cle("a")) is None and cache.obtenir(cle("a"), ".pdf") is None
+    assert cache.obtenir(cle("b"), ".pdf") and cache.obtenir(cle("c"), ".pdf")
+    assert liberes + restants == taille
+
+def test_lire_meta_rafraichit_l_usage(tmp_path):
+    cache = Cache(tmp_path, "pdf")
+    entree(cache, cle("a"), 1000, 100.0)
+    entree(cache, cle("b"), 1000, 200.0)
+    assert cache.lire_meta(cle("a")) == {}
+
+    cache_utils.elaguer(tmp_path, 1500)
+    assert cache.obtenir(cle("a"), ".pdf") is not None
+    assert cache.obtenir(cle("b"), ".pdf") is None
+
+def test_elaguer_epargne_le_run_en_cours(tmp_path):
+    cache = Cache(tmp_path, "pdf")
+    debut_run = time.time() - 10
+    entree(cache, cle("a"), 1000, 100.0)
+    entree(cache, cle("b"), 1000, time.time())
+
+    supprimees, _, restants = cache_utils.elaguer(tmp_path, 0, debut_run)
+    assert supprimees == 1
+    assert cache.obtenir(cle("b"), ".pdf") is not None
+    assert restants > 0
+
+def test_elaguer_sous_le_plafond_ne_supprime_rien(tmp_path):
+    cache = Cache(tmp_path, "pdf")
+    entree(cache, cle("a"), 1000, 100.0)
+    assert cache_utils.elaguer(tmp_path, 10**9)[0] == 0
+    assert cache.obtenir(cle("a"), ".pdf") is not None
+
+def test_inventaire_par_espace(tmp_path):
+    entree(Cache(tmp_path, "pdf"), cle("a"), 1000, 100.0)
+    entree(Cache(tmp_path, "pdf"), cle("b"), 500, 300.0)
+    entree(Cache(tmp_path, "images"), cle("c"), 10, 200.0)
+    resultat = cache_utils.inventaire(tmp_path)
+    assert resultat["pdf"]["entrees"] == 2 and resultat["images"]["entrees"] == 1
+    assert resultat["pdf"]["plus_ancien"] == 100.0 and resultat["pdf"]["plus_recent"] == 300.0
+
+def test_temporaire_orphelin_supprime(tmp_path):
+    cache = Cache(tmp_path, "pdf")
+    orphelin = cache.temporaire(cle("a"), ".pdf")
+    orphelin.write_bytes(b"x")
+    ancien = time.time() - 2 * cache_utils.AGE_TEMPORAIRE_ORPHELIN
+    os.utime(orphelin, (ancien, ancien))
+    assert cache_utils.inventaire(tmp_path) == {}
+    assert not orphelin.exists()
+
+def test_releve_compte_consultations_et_productions(tmp_path):
+    cache_utils.releve()
+    cache = Cache(tmp_path, "pdf")
+    cache.lire_meta(cle("a"))
+    cache.ecrire_meta(cle("a"), {})
+    cache.lire_meta(cle("a"))
+    assert cache_utils.releve() == {"pdf": {"consultations": 2, "productions": 1}}
+    assert cache_utils.releve() == {}
+
+def test_empreinte_memorisee_sans_relecture(tmp_path, monkeypatch):
+    source = tmp_path / "lecon.pdf"
+    source.write_bytes(b"%PDF-1.4 contenu")
+    cache = Cache(tmp_path / "cache", "pdf")
+    cache_utils.releve()
+    assert cache.empreinte(source, calculer=False) is None
+    cle = cache.empreinte(source)
+    assert cle == cache_utils.empreinte_contenu(source)
+
+    lectures = []
+    monkeypatch.setattr(cache_utils, "empreinte_contenu", lambda chemin: lectures.append(chemin))
+    # Autre espace, même source : clé reprise sans lecture
+    assert Cache(tmp_path / "cache", "images").empreinte(source) == cle
+    assert cache.empreinte(source, calculer=False) == cle and lectures == []
+    assert cache_utils.releve()[cache_utils.ESPACE_EMPREINTES] == {"consultations": 4, "productions": 1}
+
+def test_empreinte_source_modifiee_relue(tmp_path):
+    source = tmp_path / "lecon.pdf"
+    source.write_bytes(b"%PDF-1.4 contenu")
+    cache = Cache(tmp_path / "cache", "pdf")
+    avant = cache.empreinte(source)
+    source.write_bytes(b"%PDF-1.4 autre contenu")
+    assert cache.empreinte(source, calculer=False) is None
+    assert cache.empreinte(source) == cache_utils.empreinte_contenu(source) != avant
+
+def test_empreinte_chemin_relatif_meme_cle(tmp_path, monkeypatch):
+    source = tmp_path / "potier.png"
+    source.write_bytes(b"image")
+    cache = Cache(tmp_path / "cache", "images")
+    cle = cache.empreinte(source)
+    monkeypatch.chdir(tmp_path)
+    assert cache.empreinte(Path("potier.png"), calculer=False) == cle
@@ -0,0 +1,78 @@
+# test_fs_utils.py — Tests lib1/fs_utils.py (python -m pytest -q)
+
+import os
+
+import pytest
+
+from lib1 import fs_utils, publication
+from lib1.fs_utils import Disque, Memoire
+
+def test_memoire_sans_base_entierement_virtuelle(tmp_path):
+    fs = Memoire()
+    page = tmp_path / "html" / "index.html"
+    fs.ecrire_texte(page, "<p>page</p>")
+    assert fs.lire_texte(page) == "<p>page</p>"
+    assert fs.existe(page) and fs.existe(page.parent)
+    assert fs.stat(page).st_size == len("<p>page</p>")
+    assert fs.operation(page) == "écrit" and fs.origine(page) is None
+    assert not page.exists()
+    with pytest.raises(FileNotFoundError):
+        fs.lire_octets(tmp_path / "absent")
+
+def test_memoire_sur_disque_lit_le_disque_sans_l_ecrire(tmp_path):
+    source = tmp_path / "source.pdf"
+    source.write_bytes(b"%PDF")
+    fs = Memoire(base=Disque())
+    copie = tmp_path / "html" / "source.pdf"
+    fs.copier(source, copie)
+    assert fs.lire_octets(copie) == b"%PDF"
+    assert fs.operation(copie) == "copié" and fs.origine(copie) == source
+    assert not copie.exists()
+
+    fs.supprimer(source)
+    assert not fs.existe(source) and source.exists()
+
+def test_memoire_renommer_et_supprimer_arbre(tmp_path):
+    fs = Memoire()
+    preparation, html = tmp_path / "html.staging", tmp_path / "html"
+    fs.ecrire_texte(preparation / "a" / "index.html", "a")
+    fs.ecrire_texte(preparation / "index.html", "racine")
+    fs.renommer(preparation, html)
+    assert list(fs.fichiers(html)) == [html / "a" / "index.html", html / "index.html"]
+    assert not fs.existe(preparation / "index.html")
+    fs.supprimer_arbre(html / "a")
+    assert list(fs.fichiers(html)) == [html / "index.html"]
+
+def test_publication_passe_par_le_systeme_actif(tmp_path):
+    ancien = tmp_path / "html" / "index.html"
+    ancien.parent.mkdir()
+    ancien.write_text("<p>page</p>", encoding="utf-8")
+    destination = tmp_path / "html.staging" / "index.html"
+    memoire = Memoire(base=Disque())
+    precedent = fs_utils.utiliser(memoire)
+    try:
+        assert not publication.ecrire_si_change(destination, "<p>page</p>", ancien)
+        assert publication.ecrire_si_change(tmp_path / "html.staging" / "b.html", "b", ancien)
+    finally:
+        fs_utils.utiliser(precedent)
+    assert fs_utils.actif() is precedent
+    assert memoire.operation(destination) == "lié"
+    assert memoire.operation(tmp_path / "html.staging" / "b.html") == "écrit"
+    assert not destination.parent.exists()
+
+def test_disque_copier_ne_modifie_pas_la_cible_d_un_lien(tmp_path):
+    en_ligne = tmp_path / "html" / "page.pdf"
+    en_ligne.parent.mkdir()
+    en_ligne.write_bytes(b"ancien")
+    lien = tmp_path / "page.pdf"
+    os.link(en_ligne, lien)
+    source = tmp_path / "source.pdf"
+    source.write_bytes(b"nouveau")
+    Disque().copier(source, lien)
+    assert lien.read_bytes() == b"nouveau" and en_ligne.read_bytes() == b"ancien"
+
+def test_disque_ecriture_atomique(tmp_path):
+    chemin = tmp_path / "a" / "b.txt"
+    Disque().ecrire_texte(chemin, "contenu")
+    assert chemin.read_text(encoding="utf-8") == "contenu"
+    assert [p.name for p in chemin.parent.iterdir()] == ["b.txt"]
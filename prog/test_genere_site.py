@@ -0,0 +1,66 @@
+# test_genere_site.py — Tests genere_site.py (python -m pytest -q)
+
+import pytest
+
+import genere_site as gs
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    """documents/{Cours A/{lecon.pdf, sub/b.pdf}, a.pdf} ; generation.log dans tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    racine = tmp_path / "documents"
+    (racine / "Cours A" / "sub").mkdir(parents=True)
+    for rel in ("a.pdf", "Cours A/lecon.pdf", "Cours A/sub/b.pdf"):
+        (racine / rel).write_bytes(b"%PDF-1.4 " + rel.encode("utf-8"))
+    html = tmp_path / "html"
+    for nom, valeur in (("DOSSIER_DOCUMENTS", str(racine)), ("DOSSIER_HTML", str(html)),
+                        ("DOSSIER_PUBLIE", str(html)), ("_scanner", None),
+                        ("_ecrits_documents", set())):
+        monkeypatch.setattr(gs, nom, valeur)
+    gs.initialiser_log()
+    return racine
+
+def reconcilier_tout() -> None:
+    """Tâches reconcile d'une construction (STRUCTURE.py écrits dans DOCUMENTS)."""
+    for dossier in gs.scanner().scanner().dossiers():
+        gs.mettre_a_jour_structure(dossier)
+
+def test_ecritures_du_run_reprises_dans_l_empreinte(documents):
+    initial = gs.etat_entrees()
+    reconcilier_tout()
+    assert (documents / "Cours A" / "sub" / "STRUCTURE.py").exists()
+    empreinte = gs.empreinte_apres_construction(initial)
+    assert empreinte != gs.empreinte_entrees(initial)
+    assert empreinte == gs.empreinte_entrees()
+
+def test_nouveau_fichier_une_seule_construction(documents):
+    reconcilier_tout()
+    (documents / "Cours A" / "nouveau.pdf").write_bytes(b"%PDF-1.4 nouveau")
+    gs._ecrits_documents.clear()
+    gs.configurer_chemins(str(documents), gs.DOSSIER_HTML)
+    initial = gs.etat_entrees()
+    reconcilier_tout()
+    assert gs._ecrits_documents == {documents / "STRUCTURE.py", documents / "Cours A" / "STRUCTURE.py"}
+    assert gs.empreinte_apres_construction(initial) == gs.empreinte_entrees()
+
+    # Construction suivante : aucun STRUCTURE.py réécrit
+    gs._ecrits_documents.clear()
+    gs.configurer_chemins(str(documents), gs.DOSSIER_HTML)
+    reconcilier_tout()
+    assert gs._ecrits_documents == set()
+
+def test_modification_pendant_le_run_non_masquee(documents):
+    initial = gs.etat_entrees()
+    reconcilier_tout()
+    (documents / "Cours A" / "lecon.pdf").write_bytes(b"%PDF-1.4 modifie pendant le run")
+    assert gs.empreinte_apres_construction(initial) == gs.empreinte_entrees(initial)
+    assert gs.empreinte_entrees(initial) != gs.empreinte_entrees()
+
+def test_seconde_construction_sans_objet(documents):
+    pytest.importorskip("bs4")
+    gs.main(1)
+    assert gs.construction_a_jour()
+    (documents / "Cours A" / "nouveau.pdf").write_bytes(b"%PDF-1.4 nouveau")
+    assert not gs.construction_a_jour()
+    gs.main(1)
+    assert gs.construction_a_jour()
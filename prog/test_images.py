@@ -0,0 +1,66 @@
+# test_images.py — Tests lib1/images.py (python -m pytest -q)
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from lib1 import cache_utils, images
+from lib1.cache_utils import Cache
+
+def silence(_message: str) -> None:
+    pass
+
+class Incident:
+    """Exécuteur dont chaque tâche échoue sur erreur (pool interrompu...)."""
+
+    def __init__(self, erreur: BaseException):
+        self.erreur = erreur
+        self.soumissions = 0
+
+    def submit(self, fonction, *args):
+        self.soumissions += 1
+        future = Future()
+        future.set_exception(self.erreur)
+        return future
+
+@pytest.fixture
+def image(tmp_path):
+    chemin = tmp_path / "documents" / "potier.png"
+    chemin.parent.mkdir()
+    Image.new("RGB", (800, 400), "teal").save(chemin)
+    return chemin
+
+def test_variantes_produites_sans_relire_l_image(tmp_path, image, monkeypatch):
+    cache = Cache(tmp_path / "cache", images.ESPACE)
+    with ThreadPoolExecutor(1) as pool:
+        assert images.VariantesImages(cache, pool, silence).placer(image, tmp_path / "potier.png")
+    assert (tmp_path / "potier-320w.png").is_file()
+    # Rendu des pages : clé mémorisée à la copie, image non relue
+    monkeypatch.setattr(cache_utils, "empreinte_contenu", lambda chemin: pytest.fail("relu"))
+    assert "-320w.png" in images.produites(cache, image)
+
+def test_image_jamais_placee_sans_variantes(tmp_path, image):
+    assert images.produites(Cache(tmp_path / "cache", images.ESPACE), image) == []
+
+def test_image_illisible_memorisee(tmp_path):
+    source = tmp_path / "casse.png"
+    source.write_bytes(b"\x89PNG\r\n\x1a\n tronque")
+    cache = Cache(tmp_path / "cache", images.ESPACE)
+    with ThreadPoolExecutor(1) as pool:
+        assert images.VariantesImages(cache, pool, silence).placer(source, tmp_path / "a.png") == 0
+    incident = Incident(AssertionError("ne doit pas être relancé"))
+    variantes = images.VariantesImages(cache, incident, silence)
+    assert variantes.placer(source, tmp_path / "a.png") == 0
+    assert incident.soumissions == 0 and variantes.statistiques["echecs"] == 1
+
+@pytest.mark.parametrize("erreur", [MemoryError(), OSError(28, "No space left on device")])
+def test_incident_d_execution_non_memorise(tmp_path, image, erreur):
+    cache = Cache(tmp_path / "cache", images.ESPACE)
+    variantes = images.VariantesImages(cache, Incident(erreur), silence)
+    assert variantes.placer(image, tmp_path / "potier.png") == 0
+    assert cache.lire_meta(cache.empreinte(image)) is None
+    assert variantes.statistiques["echecs"] == 1
+    with ThreadPoolExecutor(1) as pool:
+        assert images.VariantesImages(cache, pool, silence).placer(image, tmp_path / "potier.png")
@@ -0,0 +1,44 @@
+# test_modele.py — Tests lib1/modele.py (python -m pytest -q)
+
+from pathlib import Path
+
+from lib1.modele import Dossier
+
+STRUCTURE = {
+    "titre_dossier": "Grammaire",
+    "fichiers": [
+        {"position": 2, "nom_document": "B.pdf", "nom_html": "b.pdf", "nom_affiché": "",
+         "empreinte": "e2", "note": "à revoir"},
+        {"nom_document": "A.pdf", "nom_html": "a.pdf", "position": 1,
+         "nom_affiché": "{{nom_document_sans_ext}}", "affiché_TDM": False},
+    ],
+    "entete": True,
+    "dossiers": [{"nom_document": "Verbes", "nom_html": "verbes", "position": 1}],
+}
+
+def test_aller_retour_a_l_identique():
+    modele = Dossier(Path("/doc"), STRUCTURE)
+    structure = modele.vers_structure()
+    assert list(structure) == ["titre_dossier", "fichiers", "entete", "dossiers"]
+    # Fichiers réordonnés par position, clés de chaque élément dans l'ordre lu
+    assert structure["fichiers"] == [STRUCTURE["fichiers"][1], STRUCTURE["fichiers"][0]]
+    assert list(structure["fichiers"][1]) == list(STRUCTURE["fichiers"][0])
+    assert structure["dossiers"] == STRUCTURE["dossiers"]
+
+def test_chaine_vide_conservee_none_omis():
+    modele = Dossier(Path("/doc"), STRUCTURE)
+    b = modele.element("B.pdf", "fichier")
+    assert b.vers_dict()["nom_affiché"] == ""
+    assert b.nom_affiche == ""
+    a = modele.element("A.pdf", "fichier")
+    assert "ajout_affichage" not in a.vers_dict()
+    assert a.ajout_affichage is True and a.affiche_tdm is False
+
+def test_cles_ajoutees_apres_les_cles_lues():
+    modele = Dossier(Path("/doc"), STRUCTURE)
+    verbes = modele.element("Verbes")
+    verbes.empreinte = "e3"
+    verbes.definir("nom_affiché", "Les verbes")
+    assert list(verbes.vers_dict()) == ["nom_document", "nom_html", "position",
+                                        "nom_affiché", "empreinte"]
+    assert verbes.nom_affiche == "Les verbes"
@@ -0,0 +1,37 @@
+# test_noms_utils.py — Tests lib1/noms_utils.py (python -m pytest -q)
+
+from pathlib import Path, PurePosixPath
+
+from lib1.noms_utils import TableURL, normaliser_chemin, normaliser_nom
+
+def test_normaliser_nom():
+    assert normaliser_nom("Leçon d'Hébreu 1.PDF") == "lecon_d_hebreu_1.pdf"
+    assert normaliser_chemin(Path("Cours A") / "Été") == Path("cours_a") / "ete"
+
+def test_table_sans_collision():
+    table = TableURL()
+    assert table.enregistrer(Path("cours_a/lecon.pdf"), Path("/doc/Cours A/Leçon.pdf"))
+    # Même source enregistrée deux fois : pas une collision
+    assert table.enregistrer(Path("cours_a/lecon.pdf"), Path("/doc/Cours A/Leçon.pdf"))
+    assert len(table) == 1 and table.collisions() == []
+    assert table.source(PurePosixPath("cours_a/lecon.pdf")) == Path("/doc/Cours A/Leçon.pdf")
+
+def test_table_signale_les_sources_en_conflit():
+    table = TableURL()
+    cible = Path("cours_a/lecon.pdf")
+    table.enregistrer(cible, Path("/doc/Cours A/Leçon.pdf"))
+    assert not table.enregistrer(cible, Path("/doc/Cours A/lecon.pdf"))
+    assert not table.enregistrer(cible, Path("/doc/Cours A/Lecon.pdf"))
+    assert not table.enregistrer(cible, Path("/doc/Cours A/lecon.pdf"))
+    assert table.collisions() == [(cible, [Path("/doc/Cours A/Leçon.pdf"),
+                                           Path("/doc/Cours A/lecon.pdf"),
+                                           Path("/doc/Cours A/Lecon.pdf")])]
+    # La première source garde la cible
+    assert table.source(cible) == Path("/doc/Cours A/Leçon.pdf")
+
+def test_collisions_triees_par_cible():
+    table = TableURL()
+    for cible in ("b/x.png", "a/x.png"):
+        table.enregistrer(Path(cible), Path("/doc/1"))
+        table.enregistrer(Path(cible), Path("/doc/2"))
+    assert [c for c, _ in table.collisions()] == [Path("a/x.png"), Path("b/x.png")]
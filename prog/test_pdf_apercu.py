@@ -0,0 +1,48 @@
+# test_pdf_apercu.py — Tests lib1/pdf_apercu.py (python -m pytest -q)
+
+import subprocess
+
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+
+from lib1 import cache_utils, pdf_apercu
+from lib1.cache_utils import Cache
+
+@pytest.fixture
+def pdf(tmp_path):
+    chemin = tmp_path / "lecon.pdf"
+    document = pikepdf.new()
+    document.add_blank_page()
+    document.add_blank_page()
+    document.save(chemin)
+    return chemin
+
+def test_pdf_inchange_sans_relecture(tmp_path, pdf, monkeypatch):
+    cache = Cache(tmp_path / "cache", pdf_apercu.ESPACE)
+    apercu = pdf_apercu.analyser(pdf, cache, None)
+    assert apercu["pages"] == 2 and not apercu["vignette"]
+    monkeypatch.setattr(cache_utils, "empreinte_contenu", lambda chemin: pytest.fail("relu"))
+    monkeypatch.setattr(pdf_apercu, "compter_pages", lambda source: pytest.fail("recompté"))
+    assert pdf_apercu.analyser(pdf, cache, None, pdf.stat())["cle"] == apercu["cle"]
+
+def test_pdf_illisible_memorise(tmp_path, monkeypatch):
+    source = tmp_path / "casse.pdf"
+    source.write_bytes(b"%PDF-1.4 tronque")
+    cache = Cache(tmp_path / "cache", pdf_apercu.ESPACE)
+    assert pdf_apercu.analyser(source, cache, None)["echec"]
+    monkeypatch.setattr(pdf_apercu, "compter_pages", lambda source: pytest.fail("réessayé"))
+    assert pdf_apercu.analyser(source, cache, None)["echec"]
+
+@pytest.mark.parametrize("erreur", [MemoryError(), OSError(28, "No space left on device"),
+                                    subprocess.TimeoutExpired("pdftoppm", 120)])
+def test_incident_d_execution_non_memorise(tmp_path, pdf, monkeypatch, erreur):
+    cache = Cache(tmp_path / "cache", pdf_apercu.ESPACE)
+
+    def incident(source, destination, moteur):
+        raise erreur
+
+    monkeypatch.setattr(pdf_apercu, "rendre_vignette", incident)
+    apercu = pdf_apercu.analyser(pdf, cache, "pdftoppm")
+    assert apercu["echec"] and not apercu["vignette"]
+    assert cache.lire_meta(apercu["cle"]) is None
@@ -0,0 +1,67 @@
+# test_pdf_web.py — Tests lib1/pdf_web.py (python -m pytest -q)
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+
+from lib1 import cache_utils, pdf_web
+from lib1.cache_utils import Cache
+
+def silence(_message: str) -> None:
+    pass
+
+class Incident:
+    """Exécuteur dont chaque tâche échoue sur erreur (pool interrompu...)."""
+
+    def __init__(self, erreur: BaseException):
+        self.erreur = erreur
+        self.soumissions = 0
+
+    def submit(self, fonction, *args):
+        self.soumissions += 1
+        future = Future()
+        future.set_exception(self.erreur)
+        return future
+
+@pytest.fixture
+def pdf(tmp_path):
+    chemin = tmp_path / "lecon.pdf"
+    document = pikepdf.new()
+    document.add_blank_page()
+    document.save(chemin)
+    return chemin
+
+def test_optimise_une_fois_puis_sans_relire(tmp_path, pdf, monkeypatch):
+    cache = Cache(tmp_path / "cache", pdf_web.ESPACE)
+    with ThreadPoolExecutor(1) as pool:
+        optimiseur = pdf_web.OptimiseurPDF(cache, pool, silence)
+        assert optimiseur.placer(pdf, tmp_path / "a.pdf")
+        # Source inchangée : clé reprise de la mémoire, PDF non relu
+        monkeypatch.setattr(cache_utils, "empreinte_contenu", lambda chemin: pytest.fail("relu"))
+        assert optimiseur.placer(pdf, tmp_path / "b.pdf")
+    assert optimiseur.statistiques["optimises"] == 1 and optimiseur.statistiques["en_cache"] == 1
+    with pikepdf.open(tmp_path / "b.pdf") as document:
+        assert len(document.pages) == 1
+
+def test_pdf_illisible_memorise(tmp_path):
+    source = tmp_path / "casse.pdf"
+    source.write_bytes(b"%PDF-1.4 tronque")
+    cache = Cache(tmp_path / "cache", pdf_web.ESPACE)
+    with ThreadPoolExecutor(1) as pool:
+        assert not pdf_web.OptimiseurPDF(cache, pool, silence).placer(source, tmp_path / "a.pdf")
+    incident = Incident(AssertionError("ne doit pas être relancé"))
+    assert not pdf_web.OptimiseurPDF(cache, incident, silence).placer(source, tmp_path / "a.pdf")
+    assert incident.soumissions == 0
+
+@pytest.mark.parametrize("erreur", [MemoryError(), OSError(28, "No space left on device")])
+def test_incident_d_execution_non_memorise(tmp_path, pdf, erreur):
+    cache = Cache(tmp_path / "cache", pdf_web.ESPACE)
+    incident = Incident(erreur)
+    optimiseur = pdf_web.OptimiseurPDF(cache, incident, silence)
+    assert not optimiseur.placer(pdf, tmp_path / "a.pdf")
+    assert cache.lire_meta(cache.empreinte(pdf)) is None
+    assert optimiseur.statistiques["echecs"] == 1
+    with ThreadPoolExecutor(1) as pool:
+        assert pdf_web.OptimiseurPDF(cache, pool, silence).placer(pdf, tmp_path / "a.pdf")
@@ -0,0 +1,54 @@
+# test_precompression.py — Tests lib1/precompression.py (python -m pytest -q)
+
+import gzip
+
+from lib1 import fs_utils, precompression
+from lib1.fs_utils import Disque, Memoire
+
+PAGE = "<p>" + "shalom " * 100 + "</p>"
+
+def site(racine, pages):
+    for rel, contenu in pages.items():
+        (racine / rel).parent.mkdir(parents=True, exist_ok=True)
+        (racine / rel).write_text(contenu, encoding="utf-8")
+    return racine
+
+def silence(_message: str) -> None:
+    pass
+
+def test_ressources_compressees_et_reprises(tmp_path):
+    html = site(tmp_path / "html", {"index.html": PAGE, "a/index.html": PAGE + "a", "petit.css": "p{}"})
+    manifeste = precompression.precompresser(html, None, 2, silence)
+    assert sorted(manifeste) == ["a/index.html", "index.html"]
+    assert gzip.decompress((html / "index.html.gz").read_bytes()).decode("utf-8") == PAGE
+    assert not (html / "petit.css.gz").exists()
+
+    preparation = site(tmp_path / "html.staging", {"index.html": PAGE, "a/index.html": PAGE + "b"})
+    precompression.precompresser(preparation, html, 2, silence)
+    assert (preparation / "index.html.gz").samefile(html / "index.html.gz")
+    assert not (preparation / "a" / "index.html.gz").samefile(html / "a" / "index.html.gz")
+    assert gzip.decompress((preparation / "a" / "index.html.gz").read_bytes()).endswith(b"b")
+
+def test_manifeste_inchange_garde_son_fichier(tmp_path):
+    html = site(tmp_path / "html", {"index.html": PAGE})
+    precompression.precompresser(html, None, 2, silence)
+    preparation = site(tmp_path / "html.staging", {"index.html": PAGE})
+    precompression.precompresser(preparation, html, 2, silence)
+    assert (preparation / precompression.MANIFESTE).samefile(html / precompression.MANIFESTE)
+
+def test_simulation_sans_ecriture_sur_disque(tmp_path):
+    html = site(tmp_path / "html", {"index.html": PAGE})
+    precompression.precompresser(html, None, 2, silence)
+    preparation = tmp_path / "html.staging"
+    memoire = Memoire(base=Disque())
+    precedent = fs_utils.utiliser(memoire)
+    try:
+        memoire.ecrire_texte(preparation / "index.html", PAGE)
+        memoire.ecrire_texte(preparation / "nouveau.html", PAGE + "nouveau")
+        precompression.precompresser(preparation, html, 2, silence)
+    finally:
+        fs_utils.utiliser(precedent)
+    assert not preparation.exists()
+    assert memoire.operation(preparation / "index.html.gz") == "lié"
+    assert memoire.operation(preparation / "nouveau.html.gz") == "écrit"
+    assert memoire.operation(preparation / precompression.MANIFESTE) == "écrit"
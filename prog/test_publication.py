@@ -0,0 +1,59 @@
+# test_publication.py — Tests lib1/publication.py (python -m pytest -q)
+
+import os
+
+from lib1 import publication
+
+def test_page_identique_liee_a_l_ancienne(tmp_path):
+    ancien = tmp_path / "html" / "index.html"
+    ancien.parent.mkdir()
+    ancien.write_text("<p>page</p>", encoding="utf-8")
+    os.utime(ancien, ns=(1_000_000_000, 1_000_000_000))
+    destination = tmp_path / "html.staging" / "index.html"
+
+    assert publication.ecrire_si_change(destination, "<p>page</p>", ancien) is False
+    assert destination.read_text(encoding="utf-8") == "<p>page</p>"
+    # Même fichier (lien dur) : date de la dernière vraie modification conservée
+    assert os.path.samefile(destination, ancien)
+    assert destination.stat().st_mtime_ns == 1_000_000_000
+
+def test_page_modifiee_ecrite_sans_toucher_l_ancienne(tmp_path):
+    ancien = tmp_path / "html" / "index.html"
+    ancien.parent.mkdir()
+    ancien.write_text("<p>avant</p>", encoding="utf-8")
+    destination = tmp_path / "html.staging" / "index.html"
+
+    assert publication.ecrire_si_change(destination, "<p>après</p>", ancien) is True
+    assert destination.read_text(encoding="utf-8") == "<p>après</p>"
+    assert ancien.read_text(encoding="utf-8") == "<p>avant</p>"
+    assert not os.path.samefile(destination, ancien)
+
+def test_page_de_meme_taille_mais_differente_ecrite(tmp_path):
+    ancien = tmp_path / "ancien.json"
+    ancien.write_text('{"a": 1}', encoding="utf-8")
+    destination = tmp_path / "staging" / "nouveau.json"
+
+    assert publication.ecrire_si_change(destination, '{"a": 2}', ancien) is True
+    assert destination.read_text(encoding="utf-8") == '{"a": 2}'
+
+def test_page_sans_ancienne_ecrite(tmp_path):
+    destination = tmp_path / "staging" / "index.html"
+    assert publication.ecrire_si_change(destination, "<p>neuve</p>", tmp_path / "absent.html") is True
+    assert destination.read_text(encoding="utf-8") == "<p>neuve</p>"
+
+def test_construction_sur_place_inchangee_non_reecrite(tmp_path):
+    page = tmp_path / "index.html"
+    page.write_text("<p>page</p>", encoding="utf-8")
+    os.utime(page, ns=(1_000_000_000, 1_000_000_000))
+
+    assert publication.ecrire_si_change(page, "<p>page</p>", page) is False
+    assert page.stat().st_mtime_ns == 1_000_000_000
+
+def test_statistiques_des_pages(tmp_path):
+    publication.preparer(tmp_path / "html")
+    ancien = tmp_path / "ancien.html"
+    ancien.write_text("x", encoding="utf-8")
+    publication.ecrire_si_change(tmp_path / "a.html", "x", ancien)
+    publication.ecrire_si_change(tmp_path / "b.html", "y", ancien)
+    assert publication.statistiques["pages_inchangees"] == 1
+    assert publication.statistiques["pages_ecrites"] == 1
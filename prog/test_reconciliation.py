@@ -0,0 +1,109 @@
+# test_reconciliation.py — Tests lib1/reconciliation.py (python -m pytest -q)
+
+from lib1 import reconciliation as rec
+from lib1.reconciliation import Candidat
+
+def silence(_message: str) -> None:
+    pass
+
+def candidat(nom: str, empreinte: str, mtime: float = 0.0, categorie: str = "fichiers",
+             appels: list = None) -> Candidat:
+    """Candidat d'empreinte fixe ; appels reçoit nom à chaque calcul."""
+    def calcul():
+        if appels is not None:
+            appels.append(nom)
+        return empreinte
+    return Candidat(nom, categorie, nom.lower(), mtime, calcul)
+
+def item(nom: str, empreinte: str, position: int, **autres) -> dict:
+    return dict({"nom_document": nom, "nom_html": nom.lower(), "position": position,
+                 "empreinte": empreinte}, **autres)
+
+def test_renommage_conserve_l_element():
+    structure = {"fichiers": [item("Ancien.pdf", "e1", 1, nom_affiché="Leçon 1")]}
+    rapport = rec.reconcilier(structure, [candidat("Nouveau.pdf", "e1")], 10.0, silence)
+    assert rapport.renommes == [("Ancien.pdf", "Nouveau.pdf")]
+    assert rapport.ajoutes == [] and rapport.orphelins == []
+    assert rapport.modifie
+    element, = structure["fichiers"]
+    assert element["nom_document"] == "Nouveau.pdf"
+    assert element["nom_html"] == "nouveau.pdf"
+    assert element["nom_affiché"] == "Leçon 1" and element["position"] == 1
+
+def test_renommage_limite_a_la_categorie():
+    structure = {"dossiers": [item("Ancien", "e1", 1)], "fichiers": []}
+    rapport = rec.reconcilier(structure, [candidat("Nouveau.pdf", "e1")], 10.0, silence)
+    assert rapport.renommes == []
+    assert rapport.ajoutes == ["Nouveau.pdf"] and rapport.orphelins == ["Ancien"]
+
+def test_empreinte_partagee_par_deux_disparus_n_est_pas_un_renommage():
+    structure = {"fichiers": [item("A.pdf", "e1", 1), item("B.pdf", "e1", 2)]}
+    rapport = rec.reconcilier(structure, [candidat("C.pdf", "e1")], 10.0, silence)
+    assert rapport.renommes == []
+    assert rapport.ajoutes == ["C.pdf"]
+    assert sorted(rapport.orphelins) == ["A.pdf", "B.pdf"]
+
+def test_empreinte_partagee_par_deux_nouveaux_n_est_pas_un_renommage():
+    structure = {"fichiers": [item("A.pdf", "e1", 1)]}
+    rapport = rec.reconcilier(structure, [candidat("B.pdf", "e1"), candidat("C.pdf", "e1")],
+                              10.0, silence)
+    assert rapport.renommes == []
+    assert rapport.ajoutes == ["B.pdf", "C.pdf"] and rapport.orphelins == ["A.pdf"]
+
+def test_nouvel_element_en_fin_de_liste():
+    structure = {"fichiers": [item("A.pdf", "e1", 3)]}
+    rapport = rec.reconcilier(structure, [candidat("A.pdf", "e1"), candidat("B.pdf", "e2")],
+                              10.0, silence)
+    assert rapport.ajoutes == ["B.pdf"]
+    nouveau = structure["fichiers"][-1]
+    assert nouveau["nom_document"] == "B.pdf" and nouveau["position"] == 4
+    assert nouveau["empreinte"] == "e2"
+
+def test_fichiers_et_dossiers_vides_sans_empreinte(tmp_path):
+    vide = tmp_path / "vide.txt"
+    vide.write_bytes(b"")
+    plein = tmp_path / "plein.txt"
+    plein.write_bytes(b"contenu")
+    assert rec.empreinte_fichier(vide) == ""
+    assert len(rec.empreinte_fichier(plein)) == 16
+    assert rec.empreinte_dossier([]) == ""
+    assert rec.empreinte_dossier(["b", "a"]) == rec.empreinte_dossier(["a", "b"])
+
+def test_empreinte_vide_jamais_prise_pour_un_renommage():
+    structure = {"fichiers": [{"nom_document": "A.txt", "nom_html": "a.txt", "position": 1}]}
+    rapport = rec.reconcilier(structure, [candidat("B.txt", "")], 10.0, silence)
+    assert rapport.renommes == [] and rapport.ajoutes == ["B.txt"]
+    assert "empreinte" not in structure["fichiers"][-1]
+
+def test_element_inchange_non_relu():
+    appels = []
+    structure = {"fichiers": [item("A.pdf", "e1", 1)]}
+    rapport = rec.reconcilier(structure, [candidat("A.pdf", "e1", 5.0, appels=appels)],
+                              10.0, silence)
+    assert appels == [] and not rapport.modifie
+
+def test_element_touche_de_contenu_inchange_relu_une_fois():
+    appels = []
+    structure = {"fichiers": [item("A.pdf", "e1", 1)]}
+    rapport = rec.reconcilier(structure, [candidat("A.pdf", "e1", 20.0, appels=appels)],
+                              10.0, silence)
+    assert appels == ["A.pdf"]
+    assert rapport.modifie
+    assert structure["fichiers"][0]["mtime_empreinte"] == 20.0
+    # STRUCTURE.py non réécrit (référence inchangée) : date retenue, pas de nouvelle lecture
+    rapport = rec.reconcilier(structure, [candidat("A.pdf", "e1", 20.0, appels=appels)],
+                              10.0, silence)
+    assert appels == ["A.pdf"] and not rapport.modifie
+
+def test_dossier_touche_de_contenu_inchange_sans_reecriture():
+    # Date du dossier changée par l'écriture de son propre STRUCTURE.py
+    structure = {"dossiers": [item("Cours A", "e1", 1)]}
+    rapport = rec.reconcilier(structure, [candidat("Cours A", "e1", 20.0, "dossiers")],
+                              10.0, silence)
+    assert not rapport.modifie and "mtime_empreinte" not in structure["dossiers"][0]
+
+def test_element_modifie_empreinte_mise_a_jour():
+    structure = {"fichiers": [item("A.pdf", "e1", 1)]}
+    rapport = rec.reconcilier(structure, [candidat("A.pdf", "e2", 20.0)], 10.0, silence)
+    assert rapport.modifie
+    assert structure["fichiers"][0]["empreinte"] == "e2"
@@ -0,0 +1,41 @@
+# test_ressources.py — Tests lib1/ressources.py (python -m pytest -q)
+
+import json
+
+from lib1 import ressources
+
+NOMS = {"style.css": "style.0123456789.css", "favicon.ico": "favicon.ico"}
+
+def test_liens_du_site_renommes():
+    contenu = ('<link href="/Hebreu4.0/html/style.css" rel="stylesheet"/>'
+               '<link href="{{BASE_PATH}}/style.css?v=2"/>')
+    assert ressources.reecrire_references(contenu, NOMS, "/Hebreu4.0/html") == (
+        '<link href="/Hebreu4.0/html/style.0123456789.css" rel="stylesheet"/>'
+        '<link href="{{BASE_PATH}}/style.0123456789.css?v=2"/>')
+
+def test_liens_relatifs_renommes():
+    contenu = '<link href="../../style.css"/><link href=\'style.css\'/>'
+    assert ressources.reecrire_references(contenu, NOMS, "../..") == (
+        '<link href="../../style.0123456789.css"/><link href=\'style.0123456789.css\'/>')
+
+def test_adresses_externes_intactes():
+    contenu = ('<link href="https://cdn.example.org/style.css"/>'
+               '<link href="/autre/site/style.css"/><a href="theme/style.css">')
+    assert ressources.reecrire_references(contenu, NOMS, "/Hebreu4.0/html") == contenu
+
+def test_ressources_trouvees_a_leur_place():
+    assert ressources.RESSOURCES["style.css"].parent == ressources.DOSSIER_RESSOURCES
+    assert ressources.RESSOURCES["favicon.ico"].parent == ressources.RACINE_DEPOT
+    noms = ressources.manifeste(False)
+    assert {nom for nom, source in ressources.RESSOURCES.items() if source.is_file()} == set(noms)
+
+def test_manifeste_inchange_garde_sa_date(tmp_path):
+    ancien, preparation = tmp_path / "html", tmp_path / "html.staging"
+    ancien.mkdir()
+    preparation.mkdir()
+    noms = ressources.publier(ancien, tmp_path / "absent", False, print)
+    avant = (ancien / ressources.MANIFESTE).stat().st_mtime_ns
+    assert json.loads((ancien / ressources.MANIFESTE).read_text(encoding="utf-8")) == noms
+
+    ressources.publier(preparation, ancien, False, print)
+    assert (preparation / ressources.MANIFESTE).stat().st_mtime_ns == avant
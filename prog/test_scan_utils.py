@@ -0,0 +1,64 @@
+# test_scan_utils.py — Tests lib1/scan_utils.py (python -m pytest -q)
+
+import pytest
+
+from lib1.scan_utils import Scanner
+
+@pytest.fixture
+def documents(tmp_path):
+    """documents/{Cours B/, cours A/{sub/}, __pycache__/, a.pdf, B.docx}"""
+    (tmp_path / "cours A" / "sub").mkdir(parents=True)
+    (tmp_path / "Cours B").mkdir()
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "a.pdf").write_bytes(b"%PDF")
+    (tmp_path / "B.docx").write_bytes(b"PK")
+    (tmp_path / "cours A" / "lecon.pdf").write_bytes(b"%PDF-1.4")
+    return tmp_path
+
+def test_dossiers_en_ordre_prefixe(documents):
+    scanner = Scanner(documents, ["__pycache__"], 4).scanner()
+    assert scanner.dossiers() == [
+        documents, documents / "cours A", documents / "cours A" / "sub", documents / "Cours B",
+    ]
+
+def test_chaque_dossier_lu_une_fois(documents):
+    scanner = Scanner(documents, ["__pycache__"], 4).scanner()
+    lus = scanner.compteurs["scandir"]
+    for dossier in scanner.dossiers():
+        scanner.lister(dossier)
+    assert scanner.existe(documents / "cours A" / "lecon.pdf")
+    assert not scanner.existe(documents / "cours A" / "absent.pdf")
+    assert scanner.compteurs["scandir"] == lus == 4
+
+def test_entrees_triees_sans_casse(documents):
+    scanner = Scanner(documents, ["__pycache__"])
+    noms = [e.nom for e in scanner.lister(documents)]
+    assert noms == ["__pycache__", "a.pdf", "B.docx", "cours A", "Cours B"]
+
+def test_stat_compte_une_fois(documents):
+    scanner = Scanner(documents)
+    entree = scanner.entree(documents / "cours A" / "lecon.pdf")
+    assert entree.est_fichier and entree.taille == 8
+    assert entree.mtime > 0 and entree.suffixe == ".pdf" and entree.stem == "lecon"
+    assert scanner.compteurs["stat"] == 1
+
+def test_rescanner_voit_les_nouveaux_fichiers(documents):
+    scanner = Scanner(documents).scanner()
+    assert not scanner.existe(documents / "B.pdf")
+    (documents / "B.pdf").write_bytes(b"%PDF")
+    assert not scanner.existe(documents / "B.pdf")
+    scanner.rescanner(documents)
+    assert scanner.existe(documents / "B.pdf")
+    assert scanner.index_noms(documents).source_docx("B.pdf") == "B.docx"
+
+def test_dossier_absent_vide(tmp_path):
+    assert Scanner(tmp_path / "absent").lister(tmp_path / "absent") == []
+
+def test_entree_par_nom_sans_relire(documents):
+    scanner = Scanner(documents)
+    for i in range(200):
+        (documents / "cours A" / f"f{i:03}.pdf").write_bytes(b"")
+    noms = [f"f{i:03}.pdf" for i in range(200)] + ["lecon.pdf"]
+    assert all(scanner.entree(documents / "cours A" / nom).nom == nom for nom in noms)
+    assert scanner.entree(documents / "cours A" / "LECON.pdf") is None
+    assert scanner.compteurs["scandir"] == 1
@@ -0,0 +1,165 @@
+# test_synchro_site.py — Tests Synchro_site.py (python -m pytest -q)
+
+import logging
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import Synchro_site as synchro
+
+LOG = logging.getLogger("test")
+
+def ecrire(racine, fichiers):
+    for rel, contenu in fichiers.items():
+        chemin = racine / rel
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        chemin.write_text(contenu, encoding="utf-8")
+
+def contenus(racine):
+    return {rel: (racine / rel).read_text(encoding="utf-8") for rel in synchro.scan_stats(racine)}
+
+@pytest.fixture
+def base(tmp_path):
+    racine = tmp_path / "base"
+    ecrire(racine, {"index.html": "accueil", "html/a/index.html": "a", "html/b.pdf": "b"})
+    return racine
+
+def synchroniser(base, overlays, dest):
+    """Un run complet sans git : synchronisation puis manifeste enregistré."""
+    (dest / ".git").mkdir(parents=True, exist_ok=True)
+    resultat = synchro.synchronize((base, synchro.scan_tree(base)), overlays, dest, 2, False, LOG)
+    synchro.save_manifest(dest, resultat[3])
+    return resultat[:3]
+
+def test_diff_trees():
+    source = {"a": {"hash": "1"}, "b": {"hash": "2"}, "c": {"hash": "3"}}
+    dest = {"b": {"hash": "2"}, "c": {"hash": "x"}, "d": {"hash": "4"}}
+    assert synchro.diff_trees(source, dest) == (["a"], ["c"], ["d"])
+
+def test_apply_diff_supprime_les_dossiers_vides(tmp_path, base):
+    dest = tmp_path / "dest"
+    ecrire(dest, {"html/vieux/page.html": "x", "html/b.pdf": "ancien"})
+    source = synchro.merge_sources([(base, synchro.scan_tree(base))])
+    synchro.apply_diff(source, dest, ["html/b.pdf"], ["html/vieux/page.html"], 2)
+    assert (dest / "html" / "b.pdf").read_text(encoding="utf-8") == "b"
+    assert not (dest / "html" / "vieux").exists()
+
+def test_modification_et_suppression_touchent_un_seul_fichier(tmp_path, base):
+    dest = tmp_path / "dest"
+    assert synchroniser(base, [], dest) == (["html/a/index.html", "html/b.pdf", "index.html"], [], [])
+    assert contenus(dest) == contenus(base)
+    avant = {rel: info["mtime_ns"] for rel, info in synchro.scan_stats(dest).items()}
+
+    ecrire(base, {"html/a/index.html": "a modifié"})
+    assert synchroniser(base, [], dest) == ([], ["html/a/index.html"], [])
+    (base / "html" / "b.pdf").unlink()
+    assert synchroniser(base, [], dest) == ([], [], ["html/b.pdf"])
+
+    assert contenus(dest) == contenus(base)
+    apres = synchro.scan_stats(dest)
+    assert apres["index.html"]["mtime_ns"] == avant["index.html"]
+    assert synchroniser(base, [], dest) == ([], [], [])
+
+def test_ajouts_l_emportent_sur_la_base(tmp_path, base):
+    ajouts, dest = tmp_path / "ajouts", tmp_path / "dest"
+    ecrire(ajouts, {"index.html": "accueil de l'ami", "html/ami.pdf": "ami"})
+    assert synchroniser(base, [ajouts], dest)[0] == [
+        "html/a/index.html", "html/ami.pdf", "html/b.pdf", "index.html"]
+    assert contenus(dest)["index.html"] == "accueil de l'ami"
+
+    # Ajout retiré : le fichier de la base revient
+    (ajouts / "index.html").unlink()
+    assert synchroniser(base, [ajouts], dest) == ([], ["index.html"], [])
+    assert contenus(dest)["index.html"] == "accueil"
+
+def test_dossiers_de_genere_site_exclus(tmp_path, base):
+    ecrire(base, {"html.cache/ab/cd.cache": "x", "html.staging/index.html": "y", "html.empreinte": "z"})
+    assert set(synchro.scan_stats(base)) == {"index.html", "html/a/index.html", "html/b.pdf"}
+
+def test_echec_avant_publication_repris(tmp_path, base):
+    dest = tmp_path / "dest"
+    synchroniser(base, [], dest)
+    ecrire(base, {"index.html": "nouvel accueil"})
+    # Copie faite mais manifeste non enregistré (commit ou push en échec)
+    synchro.synchronize((base, synchro.scan_tree(base)), [], dest, 2, False, LOG)
+    assert synchroniser(base, [], dest) == ([], ["index.html"], [])
+
+def test_sauvegarde_restauration_a_l_identique(tmp_path, base):
+    sauvegardes = tmp_path / "backup"
+    (base / ".git").mkdir()
+    ecrire(base, {".git/HEAD": "ref"})
+    instantane = synchro.create_backup(base, sauvegardes, 2, LOG)
+    attendu = contenus(base)
+
+    ecrire(base, {"index.html": "modifié", "html/nouveau/page.html": "ajouté après"})
+    (base / "html" / "b.pdf").unlink()
+    assert synchro.restore_backup(sauvegardes, instantane.stem, base) == 3
+    assert contenus(base) == attendu
+    assert not (base / "html" / "nouveau").exists()
+    assert (base / ".git" / "HEAD").read_text(encoding="utf-8") == "ref"
+
+def test_purge_garde_les_morceaux_references(tmp_path, base):
+    sauvegardes = tmp_path / "backup"
+    ancien = synchro.create_backup(base, sauvegardes, 2, LOG)
+    ancien = ancien.rename(ancien.with_name("backup_ami_20000101_000000.json"))
+    os.utime(ancien, (0, 0))
+    ecrire(base, {"index.html": "accueil v2"})
+    recent = synchro.create_backup(base, sauvegardes, 2, LOG)
+
+    assert synchro.prune_backups(sauvegardes, 0) == (1, 1)
+    assert synchro.list_snapshots(sauvegardes) == [recent]
+    cible = tmp_path / "restauré"
+    synchro.restore_backup(sauvegardes, recent.stem, cible)
+    assert contenus(cible) == contenus(base)
+    # Le plus récent est toujours gardé
+    assert synchro.prune_backups(sauvegardes, 0) == (0, 0)
+
+def git(depot, *args):
+    return subprocess.run(["git", *args], cwd=depot, check=True, capture_output=True,
+                          text=True).stdout.strip()
+
+@pytest.fixture
+def ami(tmp_path):
+    """Dépôt bare local (le « GitHub » du test) et le clone de l'ami."""
+    distant, clone = tmp_path / "distant.git", tmp_path / "ami"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(distant))
+    git(tmp_path, "clone", "-q", str(distant), str(clone))
+    git(clone, "config", "user.name", "test")
+    git(clone, "config", "user.email", "test@example.org")
+    ecrire(clone, {"README.md": "ami"})
+    git(clone, "add", "README.md")
+    git(clone, "commit", "-q", "-m", "init")
+    git(clone, "push", "-q", "-u", "origin", "main")
+    return synchro.Target("ami", clone, Path(""), str(distant), "main", tmp_path / "backup")
+
+REGLAGES = {"backup_enabled": False, "backup_keep_days": 0, "workers": 2,
+            "plumbing": True, "max_push_mb": 0}
+
+def publier(base, cible, **reglages):
+    return synchro.sync_target(cible, (base, synchro.scan_tree(base)),
+                               {**REGLAGES, **reglages}, False)
+
+@pytest.mark.parametrize("plumbing", [True, False])
+def test_second_run_sans_commit(base, ami, plumbing):
+    assert publier(base, ami, plumbing=plumbing)["status"] == "ok"
+    head = git(ami.repo, "rev-parse", "HEAD")
+    assert git(ami.repo, "rev-parse", "origin/main") == head
+    # Miroir de la base : README.md (absent de la base) est retiré
+    assert git(ami.repo, "ls-files") == "html/a/index.html\nhtml/b.pdf\nindex.html"
+
+    assert publier(base, ami, plumbing=plumbing)["status"] == "inchangé"
+    assert git(ami.repo, "rev-parse", "HEAD") == head
+
+def test_fichier_crlf_inchange_sans_commit(base, ami):
+    # Windows : core.autocrlf=true, l'index garde LF, l'arbre de travail CRLF
+    git(ami.repo, "config", "core.autocrlf", "true")
+    (base / "p.html").write_bytes(b"<p>a</p>\r\n<p>b</p>\r\n")
+    assert publier(base, ami)["status"] == "ok"
+    head = git(ami.repo, "rev-parse", "HEAD")
+
+    # Clone sans manifeste (autre poste) : tout est à revérifier contre l'index
+    (ami.repo / ".git" / synchro.MANIFEST_NAME).unlink()
+    assert publier(base, ami)["status"] == "inchangé"
+    assert git(ami.repo, "rev-parse", "HEAD") == head
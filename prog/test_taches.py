@@ -0,0 +1,69 @@
+# test_taches.py — Tests lib1/taches.py (python -m pytest -q)
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lib1.taches import Ordonnanceur, Tache
+
+def silence(_message: str) -> None:
+    pass
+
+@pytest.fixture
+def executeurs():
+    pools = {"io": ThreadPoolExecutor(4), "cpu": ThreadPoolExecutor(2)}
+    yield pools
+    for pool in pools.values():
+        pool.shutdown()
+
+def test_dependances_respectees(executeurs):
+    ordre = []
+    verrou = threading.Lock()
+
+    def noter(nom):
+        with verrou:
+            ordre.append(nom)
+        return nom
+
+    ordonnanceur = Ordonnanceur(executeurs, silence)
+    convert = ordonnanceur.ajouter(Tache("convert", noter, ("convert",)))
+    reconcile = ordonnanceur.ajouter(Tache("reconcile", noter, ("reconcile",), [convert]))
+    copie = ordonnanceur.ajouter(Tache("copy", noter, ("copy",), [convert]))
+    ordonnanceur.ajouter(Tache("render", noter, ("render",), [reconcile, copie, None], genre="cpu"))
+    durees = ordonnanceur.executer()
+
+    assert ordre[0] == "convert" and ordre[-1] == "render"
+    assert set(ordre) == {"convert", "reconcile", "copy", "render"}
+    assert set(durees) == {"io", "cpu"}
+
+def test_suite_recoit_le_resultat(executeurs):
+    recus = []
+    ordonnanceur = Ordonnanceur(executeurs, silence)
+    tache = ordonnanceur.ajouter(Tache("calcul", pow, (2, 10), genre="cpu", suite=recus.append))
+    ordonnanceur.executer()
+    assert recus == [1024] and tache.resultat == 1024
+
+def test_echec_arrete_les_suivantes(executeurs):
+    executees = []
+
+    def echouer():
+        raise ValueError("conversion impossible")
+
+    ordonnanceur = Ordonnanceur(executeurs, silence)
+    premiere = ordonnanceur.ajouter(Tache("convert", echouer))
+    ordonnanceur.ajouter(Tache("render", executees.append, ("render",), [premiere]))
+    with pytest.raises(ValueError, match="conversion impossible"):
+        ordonnanceur.executer()
+    assert executees == []
+
+def test_genre_inconnu_refuse(executeurs):
+    with pytest.raises(ValueError):
+        Ordonnanceur(executeurs, silence).ajouter(Tache("word", print, genre="word"))
+
+def test_dependance_hors_graphe_signalee(executeurs):
+    ordonnanceur = Ordonnanceur(executeurs, silence)
+    absente = Tache("absente", print)
+    ordonnanceur.ajouter(Tache("render", print, (), [absente]))
+    with pytest.raises(RuntimeError, match="Graphe incomplet"):
+        ordonnanceur.executer()